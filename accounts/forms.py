@@ -5,12 +5,12 @@ from django import forms
 from django.contrib.auth import get_user_model
 from django.contrib.auth.forms import (AuthenticationForm, PasswordResetForm,
                                        SetPasswordForm)
-from django.contrib.auth.models import Group
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.urls import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 from onlinemaid.constants import AG_OWNERS, EMPLOYERS, FDW
+from onlinemaid.registry import groups
 
 from .models import FDWAccount, PotentialEmployer
 
@@ -393,9 +393,7 @@ class EmployerCreationForm(forms.ModelForm):
         except Exception:
             pass
         else:
-            potential_employer_group = Group.objects.get(
-                name=EMPLOYERS
-            )
+            potential_employer_group = groups.get(EMPLOYERS)
             potential_employer_group.user_set.add(
                 new_user
             )
@@ -523,9 +521,7 @@ class FDWAccountCreationForm(forms.ModelForm):
         except Exception:
             pass
         else:
-            potential_employer_group = Group.objects.get(
-                name=FDW
-            )
+            potential_employer_group = groups.get(FDW)
             potential_employer_group.user_set.add(
                 new_user
             )
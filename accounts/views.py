@@ -1,5 +1,6 @@
 from typing import Any, Dict, Optional
 
+from agency.authority import get_request_authority
 from django.contrib import messages
 from django.contrib.auth import get_user_model, logout
 from django.contrib.auth.mixins import LoginRequiredMixin
@@ -14,7 +15,7 @@ from django.views.generic.edit import CreateView, DeleteView, UpdateView
 from enquiry.constants import EnquiryStatusChoices
 from enquiry.models import MaidShortlistedEnquiryIM
 from maid.models import Maid
-from onlinemaid.constants import AG_OWNERS, AUTHORITY_GROUPS
+from onlinemaid.constants import AG_OWNERS
 from onlinemaid.mixins import SuccessMessageMixin
 from onlinemaid.types import T
 
@@ -78,15 +79,13 @@ class AgencySignInView(BaseLoginView):
     success_url = reverse_lazy('dashboard_home')
 
     def get_success_url(self) -> str:
-        for auth_name in AUTHORITY_GROUPS:
-            if self.request.user.groups.filter(name=auth_name).exists():
-                authority = auth_name
-                if (
-                    authority == AG_OWNERS
-                    and self.request.user.agency_owner.is_test_email()
-                ):
-                    success_url = reverse_lazy('user_email_update')
-                    return success_url
+        authority = get_request_authority(self.request)['authority']
+        if (
+            authority == AG_OWNERS
+            and self.request.user.agency_owner.is_test_email()
+        ):
+            success_url = reverse_lazy('user_email_update')
+            return success_url
         return super().get_success_url()
 
     def get_form_kwargs(self) -> Dict[str, Any]:
@@ -260,11 +259,9 @@ class UserEmailUpdate(LoginRequiredMixin, UpdateView):
         )
 
     def form_valid(self, form) -> res:
-        for auth_name in AUTHORITY_GROUPS:
-            if self.request.user.groups.filter(name=auth_name).exists():
-                authority = auth_name
-                if authority == AG_OWNERS:
-                    self.request.user.agency_owner.unset_test_email()
+        authority = get_request_authority(self.request)['authority']
+        if authority == AG_OWNERS:
+            self.request.user.agency_owner.unset_test_email()
 
         if form.cleaned_data.get('remember_email'):
             new_email = form.cleaned_data.get('email')
@@ -3,3 +3,6 @@ from django.apps import AppConfig
 
 class AdvertisementConfig(AppConfig):
     name = 'advertisement'
+
+    def ready(self):
+        import advertisement.signals
@@ -5,6 +5,7 @@ from agency.models import Agency
 from django.db import models
 from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
+from maid.featured import invalidate_featured_feed
 # from onlinemaid.storage_backends import PublicMediaStorage
 
 
@@ -408,6 +409,7 @@ class Advertisement(models.Model):
     def provision_feat_maid_ad(self):
         if self.location.name == 'featured_maids_ad':
             self.agency.increment_featured_fdw(1)
+            invalidate_featured_feed()
 
     # photo = models.FileField(
     #     verbose_name=_('Advertisement Photo'),
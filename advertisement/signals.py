@@ -0,0 +1,11 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from onlinemaid.cache import bump_namespaces
+
+from .models import Advertisement
+
+
+@receiver(post_save, sender=Advertisement)
+@receiver(post_delete, sender=Advertisement)
+def advertisement_cache_namespace_update(sender, instance, **kwargs):
+    bump_namespaces('advertisement', instance.agency_id)
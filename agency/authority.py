@@ -0,0 +1,116 @@
+from django.conf import settings
+from django.contrib.auth import get_user_model
+from onlinemaid.cache import cache_ns
+from onlinemaid.constants import AG_OWNERS, AUTHORITY_GROUPS, EMPLOYERS, FDW
+
+SESSION_KEY = '_authority'
+
+
+def get_user_namespace(user_id):
+    return cache_ns('authority_user', user_id)
+
+
+def get_agency_namespace(agency_id):
+    return cache_ns('authority_agency', agency_id)
+
+
+def get_empty_authority():
+    return {
+        'user_id': None,
+        'groups': [],
+        'authority': '',
+        'agency_id': '',
+        'agency_name': '',
+        'branch_id': None
+    }
+
+
+def resolve_authority(user):
+    """
+    Returns the groups, authority, agency and branch of the user, read
+    with a single query. Like GetAuthorityMixin always has, the authority is
+    the last of AUTHORITY_GROUPS which the user belongs to.
+    """
+    resolved = get_empty_authority()
+    if not user.is_authenticated:
+        return resolved
+
+    resolved['user_id'] = user.pk
+    # One row per group, the owner and employee columns repeat on each
+    rows = list(
+        get_user_model().objects.filter(pk=user.pk).values(
+            'groups__name',
+            'agency_owner__agency_id',
+            'agency_owner__agency__name',
+            'agency_employee__agency_id',
+            'agency_employee__agency__name',
+            'agency_employee__branch_id'
+        )
+    )
+    resolved['groups'] = [i['groups__name'] for i in rows if i['groups__name']]
+    for auth_name in AUTHORITY_GROUPS:
+        if auth_name in resolved['groups']:
+            resolved['authority'] = auth_name
+
+    authority = resolved['authority']
+    if authority == AG_OWNERS:
+        resolved['agency_id'] = rows[0]['agency_owner__agency_id']
+        resolved['agency_name'] = rows[0]['agency_owner__agency__name']
+    elif authority and authority != EMPLOYERS and authority != FDW:
+        resolved['agency_id'] = rows[0]['agency_employee__agency_id']
+        resolved['agency_name'] = rows[0]['agency_employee__agency__name']
+        resolved['branch_id'] = rows[0]['agency_employee__branch_id']
+    return resolved
+
+
+def get_versions(user_id, agency_id):
+    namespaces = [get_user_namespace(user_id)]
+    if agency_id:
+        namespaces.append(get_agency_namespace(agency_id))
+    return [namespace.get_version() for namespace in namespaces]
+
+
+def invalidate_user_authority(user_id):
+    get_user_namespace(user_id).bump()
+
+
+def invalidate_agency_authority(agency_id):
+    get_agency_namespace(agency_id).bump()
+
+
+def get_request_authority(request):
+    """
+    Resolves the authority of the request's user once per request. With
+    AUTHORITY_SESSION_CACHE the result is also kept in the session until
+    the user's groups, owner or employee row, or their agency, change.
+    """
+    user = request.user
+    resolved = getattr(request, '_authority', None)
+    if resolved is not None and resolved['user_id'] == user.pk:
+        return resolved
+
+    session = getattr(request, 'session', None)
+    use_session = (
+        settings.AUTHORITY_SESSION_CACHE
+        and session is not None
+        and user.is_authenticated
+    )
+    if use_session:
+        cached = session.get(SESSION_KEY)
+        if cached and cached['authority']['user_id'] == user.pk:
+            if cached['versions'] == get_versions(
+                user.pk,
+                cached['authority']['agency_id']
+            ):
+                resolved = cached['authority']
+
+    if resolved is None or resolved['user_id'] != user.pk:
+        resolved = resolve_authority(user)
+        if use_session:
+            session[SESSION_KEY] = {
+                'authority': resolved,
+                'versions': get_versions(user.pk, resolved['agency_id'])
+            }
+
+    request._authority = resolved
+    return resolved
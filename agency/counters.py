@@ -0,0 +1,43 @@
+from django.db.models import F
+from django.db.models.functions import Greatest
+from maid.constants import MaidStatusChoices
+
+from .models import Agency
+
+
+def apply_counter_deltas(agency_id, **deltas):
+    """
+    Adds the given deltas to an agency's counters in a single UPDATE, as
+    part of whatever transaction the caller is in. F() expressions keep
+    concurrent changes from overwriting each other and the counters never
+    drop below zero.
+    """
+    deltas = {field: delta for field, delta in deltas.items() if delta}
+    if deltas:
+        Agency.objects.filter(pk=agency_id).update(**{
+            field: Greatest(F(field) + delta, 0)
+            for field, delta in deltas.items()
+        })
+
+
+def get_maid_deltas(status, original_status=None, created=False,
+                    deleted=False):
+    # Only creating, deleting and moving a maid in or out of the featured
+    # status changes the counters
+    is_featured = status == MaidStatusChoices.FEATURED
+    was_featured = original_status == MaidStatusChoices.FEATURED
+    if created:
+        return {
+            'amount_of_biodata': 1,
+            'amount_of_featured_biodata': int(is_featured)
+        }
+    if deleted:
+        return {
+            'amount_of_biodata': -1,
+            'amount_of_featured_biodata': -int(is_featured)
+        }
+    if original_status is None:
+        return {}
+    return {
+        'amount_of_featured_biodata': int(is_featured) - int(was_featured)
+    }
@@ -4,6 +4,7 @@ from django.utils.translation import ugettext_lazy as _
 from django_filters import CharFilter as DjangoFiltersCharFilter
 from django_filters import ChoiceFilter as DjangoFiltersChoiceFilter
 from django_filters import FilterSet as DjangoFiltersFilterSet
+from onlinemaid.search import is_postgres, ranked_search
 
 from .constants import AreaChoices
 from .models import Agency
@@ -31,6 +32,13 @@ class AgencyFilter(DjangoFiltersFilterSet):
         }
 
     def custom_agency_filter(self, queryset, name, value):
+        if is_postgres():
+            return ranked_search(
+                queryset,
+                value,
+                'search_vector',
+                'search_document'
+            )
         return queryset.filter(
             Q(name__icontains=value)
             | Q(branches__address_1__icontains=value)
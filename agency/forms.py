@@ -4,7 +4,6 @@ from crispy_forms.layout import HTML, Column, Div, Layout, Row, Submit
 from django import forms
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
 from django.contrib.auth.password_validation import validate_password
 from django.core.exceptions import ValidationError
 from django.core.mail import BadHeaderError, send_mail
@@ -12,6 +11,7 @@ from django.urls.base import reverse_lazy
 from django.utils.translation import ugettext_lazy as _
 from employer_documentation.models import EmployerDoc
 from onlinemaid.helper_functions import slugify_text
+from onlinemaid.registry import groups
 
 from .constants import AgencyEmployeeRoleChoices, OpeningHoursTypeChoices
 from .models import (Agency, AgencyBranch, AgencyEmployee, AgencyOpeningHours,
@@ -520,9 +520,7 @@ class AgencyOwnerCreationForm(forms.ModelForm):
         except Exception:
             pass
         else:
-            agency_owner_group = Group.objects.get(
-                name='Agency Owners'
-            )
+            agency_owner_group = groups.get('Agency Owners')
             agency_owner_group.user_set.add(
                 new_user
             )
@@ -701,12 +699,12 @@ class AgencyEmployeeForm(forms.ModelForm):
                 pk=self.pk
             )
 
-            old_agency_employee_group = Group.objects.get(
-                name=role_name_dict[employee.role]
+            old_agency_employee_group = groups.get(
+                role_name_dict[employee.role]
             )
 
-            new_agency_employee_group = Group.objects.get(
-                name=role_name_dict[role]
+            new_agency_employee_group = groups.get(
+                role_name_dict[role]
             )
 
             if self.instance.user.email != cleaned_data.get('email'):
@@ -741,8 +739,8 @@ class AgencyEmployeeForm(forms.ModelForm):
             except Exception:
                 pass
             else:
-                agency_employee_group = Group.objects.get(
-                    name=role_name_dict[role]
+                agency_employee_group = groups.get(
+                    role_name_dict[role]
                 )
                 agency_employee_group.user_set.add(
                     new_user
@@ -0,0 +1,16 @@
+from django.core.management.base import BaseCommand
+
+from agency.models import Agency
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the free text search columns of every agency'
+
+    def handle(self, *args, **options):
+        count = 0
+        for agency in Agency.objects.all().iterator():
+            agency.update_search_document()
+            count += 1
+        self.stdout.write(
+            self.style.SUCCESS(f'Updated {count} agencies')
+        )
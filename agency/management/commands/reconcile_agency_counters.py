@@ -0,0 +1,58 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+from django.db.models import Count, Q
+
+from agency.models import Agency, AgencyEmployee
+from maid.constants import MaidStatusChoices
+from maid.models import Maid
+
+COUNTER_FIELDS = [
+    'amount_of_biodata',
+    'amount_of_featured_biodata',
+    'amount_of_employees'
+]
+
+
+class Command(BaseCommand):
+    help = 'Recomputes the biodata and employee counters of every agency'
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            # Locking the agencies first holds back incremental updates
+            # until the recomputed values are written
+            agencies = list(
+                Agency.objects.select_for_update().only('pk', *COUNTER_FIELDS)
+            )
+            maid_counts = {
+                i['agency']: i
+                for i in Maid.objects.values('agency').annotate(
+                    biodata=Count('pk'),
+                    featured=Count(
+                        'pk',
+                        filter=Q(status=MaidStatusChoices.FEATURED)
+                    )
+                ).order_by()
+            }
+            employee_counts = dict(
+                AgencyEmployee.objects.values('agency').annotate(
+                    employees=Count('pk')
+                ).order_by().values_list('agency', 'employees')
+            )
+
+            changed = []
+            for agency in agencies:
+                counts = maid_counts.get(agency.pk, {})
+                values = {
+                    'amount_of_biodata': counts.get('biodata', 0),
+                    'amount_of_featured_biodata': counts.get('featured', 0),
+                    'amount_of_employees': employee_counts.get(agency.pk, 0)
+                }
+                if any(getattr(agency, k) != v for k, v in values.items()):
+                    for k, v in values.items():
+                        setattr(agency, k, v)
+                    changed.append(agency)
+            Agency.objects.bulk_update(changed, COUNTER_FIELDS, batch_size=500)
+
+        self.stdout.write(
+            self.style.SUCCESS(f'Corrected {len(changed)} agencies')
+        )
@@ -0,0 +1,80 @@
+from django.apps import apps
+from django.db import models
+from django.db.models.functions import Coalesce
+from employer_documentation.constants import CaseStatusChoices
+from maid.constants import MaidStatusChoices
+
+# Statuses counted by Maid.is_published
+PUBLISHED_MAID_STATUSES = [
+    MaidStatusChoices.PUBLISHED,
+    MaidStatusChoices.FEATURED
+]
+
+
+def get_count_subquery(queryset, agency_field):
+    # Counts the rows of the queryset which belong to the outer agency. A
+    # subquery per statistic keeps the joins from multiplying each other.
+    return Coalesce(
+        models.Subquery(
+            queryset.filter(**{
+                agency_field: models.OuterRef('pk')
+            }).order_by().values(agency_field).annotate(
+                count=models.Count('pk')
+            ).values('count')
+        ),
+        0
+    )
+
+
+class AgencyQuerySet(models.QuerySet):
+    def with_main_branch(self):
+        # Read by Agency.main_branch instead of one query per agency
+        from .models import AgencyBranch
+
+        return self.prefetch_related(
+            models.Prefetch(
+                'branches',
+                queryset=AgencyBranch.objects.filter(main_branch=True),
+                to_attr='prefetched_main_branches'
+            )
+        )
+
+    def with_stats(self):
+        # Read by the Agency.get_number_of_* methods
+        Maid = apps.get_model('maid', 'Maid')
+        AgencyEmployee = apps.get_model('agency', 'AgencyEmployee')
+        EmployerDoc = apps.get_model('employer_documentation', 'EmployerDoc')
+        Advertisement = apps.get_model('advertisement', 'Advertisement')
+
+        return self.annotate(
+            published_maid_count=get_count_subquery(
+                Maid.objects.filter(status__in=PUBLISHED_MAID_STATUSES),
+                'agency'
+            ),
+            unpublished_maid_count=get_count_subquery(
+                Maid.objects.exclude(status__in=PUBLISHED_MAID_STATUSES),
+                'agency'
+            ),
+            featured_maid_count=get_count_subquery(
+                Maid.objects.filter(status=MaidStatusChoices.FEATURED),
+                'agency'
+            ),
+            employee_count=get_count_subquery(
+                AgencyEmployee.objects.all(),
+                'agency'
+            ),
+            # Cases stay open until the maid is deployed or the case is
+            # archived
+            open_case_count=get_count_subquery(
+                EmployerDoc.objects.filter(
+                    rn_casestatus_ed__fdw_work_commencement_date__isnull=True
+                ).exclude(
+                    status=CaseStatusChoices.ARCHIVED
+                ),
+                'employer__agency_employee__agency'
+            ),
+            active_advertisement_count=get_count_subquery(
+                Advertisement.objects.filter(approved=True, paid=True),
+                'agency'
+            )
+        )
@@ -1,17 +1,23 @@
 import stripe
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import RegexValidator, URLValidator
 from django.db import models
+from django.utils.functional import cached_property
 from django.utils.translation import ugettext_lazy as _
+from maid.constants import MaidStatusChoices
 from onlinemaid.fields import NullableCharField
 from onlinemaid.helper_functions import get_sg_region, r_string
+from onlinemaid.search import get_search_vector, is_postgres
 from onlinemaid.storage_backends import PublicMediaStorage
 from onlinemaid.validators import validate_ea_personnel_number
 
 from .constants import (AgencyEmployeeRoleChoices, AreaChoices,
                         OpeningHoursTypeChoices)
 from .fields import OpeningHoursField
+from .managers import PUBLISHED_MAID_STATUSES, AgencyQuerySet
 from .validators import validate_postcode
 
 
@@ -104,27 +110,69 @@ class Agency(models.Model):
         max_length=10
     )
 
-    __original_branch_address_line_1 = None
-    __original_branch_address_line_2 = None
-    __original_branch_postal_code = None
+    search_document = models.TextField(
+        blank=True,
+        default='',
+        editable=False
+    )
 
-    def __init__(self, *args, **kwargs):
-        super().__init__(*args, **kwargs)
-        main_branch = self.get_main_branch()
-        if main_branch:
-            self.__original_branch_address_line_1 = main_branch.address_1
-            self.__original_branch_address_line_2 = main_branch.address_2
-            self.__original_branch_postal_code = main_branch.postal_code
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
+
+    objects = AgencyQuerySet.as_manager()
 
     def __str__(self) -> str:
         return self.name
 
-    def get_main_branch(self):
-        main_branches_qs = self.branches.filter(main_branch=True)
-        if main_branches_qs.count():
-            return main_branches_qs[0]
+    @cached_property
+    def main_branch(self):
+        # Uses the branches from AgencyQuerySet.with_main_branch() when they
+        # were prefetched. The address it had when first read is kept so a
+        # later save can tell whether it changed.
+        if hasattr(self, 'prefetched_main_branches'):
+            branches = self.prefetched_main_branches
+        elif self.has_prefetched_branches():
+            branches = [i for i in self.branches.all() if i.main_branch]
         else:
+            branches = self.branches.filter(main_branch=True)[:1]
+        main_branch = branches[0] if branches else None
+        self._original_main_branch_address = self.get_branch_address(
+            main_branch
+        )
+        return main_branch
+
+    def get_branch_address(self, branch):
+        if not branch:
             return None
+        return {
+            'line1': branch.address_1,
+            'line2': branch.address_2,
+            'postal_code': branch.postal_code
+        }
+
+    def main_branch_address_changed(self):
+        # Nothing is resolved unless the main branch was already read
+        if 'main_branch' not in self.__dict__:
+            return False
+        return (
+            self.get_branch_address(self.main_branch)
+            != self._original_main_branch_address
+        )
+
+    def get_stripe_address(self):
+        return {
+            'city': 'Singapore',
+            'country': 'Singapore',
+            'line1': self.main_branch.address_1,
+            'line2': self.main_branch.address_2,
+            'postal_code': self.main_branch.postal_code,
+            'state': 'Singapore',
+        }
+
+    def get_main_branch(self):
+        return self.main_branch
 
     def get_main_branch_number(self):
         main_branch = self.get_main_branch()
@@ -133,7 +181,12 @@ class Agency(models.Model):
         else:
             return None
 
+    def has_prefetched_branches(self):
+        return 'branches' in getattr(self, '_prefetched_objects_cache', {})
+
     def get_branches(self):
+        if self.has_prefetched_branches():
+            return [i for i in self.branches.all() if not i.main_branch]
         return self.branches.filter(main_branch=False)
 
     def get_biodata_limit_status(self):
@@ -146,17 +199,19 @@ class Agency(models.Model):
         return self.agency_owner.user.email
 
     def get_number_of_featured_fdw(self):
-        return self.amount_of_featured_biodata
+        if hasattr(self, 'featured_maid_count'):
+            return self.featured_maid_count
+        return self.maid.filter(status=MaidStatusChoices.FEATURED).count()
 
     def get_number_of_unpublished_fdw(self):
-        return len(
-            list(maid for maid in self.maid.all() if not maid.is_published)
-        )
+        if hasattr(self, 'unpublished_maid_count'):
+            return self.unpublished_maid_count
+        return self.maid.exclude(status__in=PUBLISHED_MAID_STATUSES).count()
 
     def get_number_of_published_fdw(self):
-        return len(
-            list(maid for maid in self.maid.all() if maid.is_published)
-        )
+        if hasattr(self, 'published_maid_count'):
+            return self.published_maid_count
+        return self.maid.filter(status__in=PUBLISHED_MAID_STATUSES).count()
 
     def set_api_auth_id(self):
         self.api_auth_id = r_string(10)
@@ -168,14 +223,7 @@ class Agency(models.Model):
         stripe.api_key = settings.STRIPE_SECRET_KEY
         if not self.has_customer_relation():
             stripe_customer = stripe.Customer.create(
-                address={
-                    'city': 'Singapore',
-                    'country': 'Singapore',
-                    'line1': self.get_main_branch().address_1,
-                    'line2': self.get_main_branch().address_2,
-                    'postal_code': self.get_main_branch().postal_code,
-                    'state': 'Singapore',
-                },
+                address=self.get_stripe_address(),
                 description=f'Customer account for {self.name}',
                 email=self.get_agency_owner_email(),
                 name=self.name
@@ -188,9 +236,14 @@ class Agency(models.Model):
             return new_customer
         else:
             stripe_customer_pk = self.customer_account
-            stripe.Customer.modify(
-                stripe_customer_pk,
-                email=self.get_agency_owner_email()
+            kwargs = {
+                'email': self.get_agency_owner_email()
+            }
+            if self.main_branch_address_changed():
+                kwargs['address'] = self.get_stripe_address()
+            stripe.Customer.modify(stripe_customer_pk, **kwargs)
+            self._original_main_branch_address = self.get_branch_address(
+                self.main_branch
             )
 
     def has_customer_relation(self):
@@ -200,6 +253,27 @@ class Agency(models.Model):
         self.amount_of_featured_biodata_allowed += n
         self.save()
 
+    def update_search_document(self):
+        # The agency name and the address and phone numbers of every branch
+        # are flattened into one column so that free text search needs no
+        # join through the branches
+        values = [self.name]
+        for branch in self.branches.values_list(
+            'address_1',
+            'address_2',
+            'postal_code',
+            'office_number',
+            'mobile_number'
+        ):
+            values += branch
+        self.search_document = ' '.join(i for i in values if i).lower()
+        kwargs = {
+            'search_document': self.search_document
+        }
+        if is_postgres():
+            kwargs['search_vector'] = get_search_vector('search_document')
+        Agency.objects.filter(pk=self.pk).update(**kwargs)
+
     def fix_branch_bug(self):
         main_branches = self.branches.filter(main_branch=True)
         new_main_branch = main_branches.first()
@@ -213,6 +287,14 @@ class Agency(models.Model):
     class Meta:
         verbose_name = 'Agency'
         verbose_name_plural = 'Agencies'
+        indexes = [
+            GinIndex(fields=['search_vector']),
+            GinIndex(
+                name='agency_search_document_trgm',
+                fields=['search_document'],
+                opclasses=['gin_trgm_ops']
+            )
+        ]
 
 # Models which are one to one with Agency
 
@@ -485,7 +567,8 @@ class AgencyBranch(models.Model):
         super().save(*args, **kwargs)
 
     def get_employees(self):
-        return self.employees.filter(branch=self)
+        # all() so that prefetched employees are used
+        return self.employees.all()
 
     def set_main(self):
         self.main_branch = True
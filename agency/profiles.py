@@ -0,0 +1,87 @@
+from django.conf import settings
+from onlinemaid.cache import cache_ns
+
+from .managers import PUBLISHED_MAID_STATUSES
+from .models import Agency
+
+# Bumped when any agency is saved or deleted, as name_url may have changed
+name_url_cache = cache_ns('agency_name_url')
+profile_cache = cache_ns('agency_profile')
+
+
+def get_name_url_map():
+    name_urls = name_url_cache.get('map')
+    if name_urls is None:
+        name_urls = dict(
+            Agency.objects.filter(
+                name_url__isnull=False
+            ).values_list('name_url', 'pk')
+        )
+        name_url_cache.set(
+            'map',
+            name_urls,
+            settings.AGENCY_PROFILE_CACHE_TIMEOUT
+        )
+    return name_urls
+
+
+def get_agency_pk(pk_or_name_url):
+    # Agency detail URLs take either the pk or the name_url
+    try:
+        return int(pk_or_name_url)
+    except (TypeError, ValueError):
+        return get_name_url_map().get(pk_or_name_url)
+
+
+def get_profile_cache_key(pk):
+    # The agency namespace is bumped by changes to the agency, its branches,
+    # employees and opening hours and the maid namespace by its maids
+    return '{}:{}:{}'.format(
+        pk,
+        cache_ns('agency', pk).get_version(),
+        cache_ns('maid', pk).get_version()
+    )
+
+
+def build_agency_profile(pk):
+    agency = Agency.objects.select_related(
+        'opening_hours'
+    ).prefetch_related(
+        'branches__employees'
+    ).with_stats().filter(pk=pk).first()
+    if agency is None:
+        return None
+
+    # Resolved before the agency is pickled so that it is cached with it
+    agency.main_branch
+    return {
+        'agency': agency,
+        'maids': list(
+            agency.maid.filter(status__in=PUBLISHED_MAID_STATUSES)
+        )
+    }
+
+
+def get_agency_profile(pk):
+    """
+    Returns the agency with its branches, employees, opening hours and
+    statistics loaded and its published maids, or None when there is no
+    such agency. Maid cards are not part of the profile, see
+    maid.fragments.attach_maid_cards.
+    """
+    key = get_profile_cache_key(pk)
+    profile = profile_cache.get(key)
+    if profile is None:
+        profile = build_agency_profile(pk)
+        if profile is None:
+            return None
+        profile_cache.set(
+            key,
+            profile,
+            settings.AGENCY_PROFILE_CACHE_TIMEOUT
+        )
+    return profile
+
+
+def invalidate_name_url_map():
+    name_url_cache.bump()
@@ -1,12 +1,20 @@
 import stripe
 from advertisement.models import Advertisement
 from django.conf import settings
-from django.db.models.signals import post_save, pre_save
+from django.contrib.auth import get_user_model
+from django.db.models.signals import (m2m_changed, post_delete, post_save,
+                                      pre_save)
 from django.dispatch import receiver
 from maid.models import Maid
+from onlinemaid.cache import bump_namespaces
 from payment.models import Customer
+from website.sitemaps import invalidate_sitemap
 
-from .models import Agency, AgencyEmployee, PotentialAgency
+from .authority import invalidate_agency_authority, invalidate_user_authority
+from .counters import apply_counter_deltas
+from .models import (Agency, AgencyBranch, AgencyEmployee,
+                     AgencyOpeningHours, AgencyOwner, PotentialAgency)
+from .profiles import invalidate_name_url_map
 
 
 @receiver(post_save, sender=Agency)
@@ -29,14 +37,7 @@ def stripe_customer_created_or_update(sender, instance, created, **kwargs):
         stripe.api_key = settings.STRIPE_SECRET_KEY
         try:
             stripe_customer = stripe.Customer.create(
-                address={
-                    'city': 'Singapore',
-                    'country': 'Singapore',
-                    'line1': agency.get_main_branch().address_1,
-                    'line2': agency.get_main_branch().address_2,
-                    'postal_code': agency.get_main_branch().postal_code,
-                    'state': 'Singapore',
-                },
+                address=agency.get_stripe_address(),
                 description=f'Customer account for {agency.name}',
                 email=None,
                 name=agency.name,
@@ -60,11 +61,13 @@ def stripe_customer_created_or_update(sender, instance, created, **kwargs):
 
 @receiver(post_save, sender=AgencyEmployee)
 def agency_employee_counter(sender, instance, created, **kwargs):
-    agency = instance.agency
-    agency.amount_of_employees = AgencyEmployee.objects.filter(
-        agency=agency
-    ).count()
-    agency.save()
+    if created:
+        apply_counter_deltas(instance.agency_id, amount_of_employees=1)
+
+
+@receiver(post_delete, sender=AgencyEmployee)
+def agency_employee_counter_delete(sender, instance, **kwargs):
+    apply_counter_deltas(instance.agency_id, amount_of_employees=-1)
 
 
 @receiver(post_save, sender=Agency)
@@ -76,6 +79,7 @@ def deactivate_agency(sender, instance, created, **kwargs):
         ).update(
             frozen=True
         )
+        bump_namespaces('maid', agency.pk)
         Advertisement.objects.filter(
             agency=agency
         ).update(
@@ -96,8 +100,86 @@ def reactivate_agency(sender, instance, **kwargs):
             ).update(
                 frozen=False
             )
+            bump_namespaces('maid', agency.pk)
             Advertisement.objects.filter(
                 agency=agency
             ).update(
                 frozen=False
             )
+
+
+@receiver(post_save, sender=Agency)
+def agency_search_document_update(sender, instance, **kwargs):
+    instance.update_search_document()
+
+
+@receiver(post_save, sender=AgencyBranch)
+@receiver(post_delete, sender=AgencyBranch)
+def agency_branch_search_document_update(sender, instance, **kwargs):
+    agency = Agency.objects.filter(pk=instance.agency_id).first()
+    if agency:
+        agency.update_search_document()
+
+
+@receiver(post_save, sender=AgencyBranch)
+@receiver(post_delete, sender=AgencyBranch)
+def agency_main_branch_reset(sender, instance, **kwargs):
+    # An agency which already read its main branch, e.g. the one a new
+    # branch was created with, reads it again if it is no longer the same
+    agency = instance._state.fields_cache.get('agency')
+    if not agency or 'main_branch' not in agency.__dict__:
+        return
+    main_branch = agency.main_branch
+    if (
+        main_branch is None and instance.main_branch
+        or main_branch is not None and main_branch.pk == instance.pk
+        and not instance.main_branch
+    ):
+        del agency.main_branch
+
+
+@receiver(post_save, sender=AgencyOwner)
+@receiver(post_delete, sender=AgencyOwner)
+@receiver(post_save, sender=AgencyEmployee)
+@receiver(post_delete, sender=AgencyEmployee)
+def agency_user_authority_update(sender, instance, **kwargs):
+    invalidate_user_authority(instance.user_id)
+
+
+@receiver(post_save, sender=Agency)
+def agency_authority_update(sender, instance, created, **kwargs):
+    if not created:
+        invalidate_agency_authority(instance.pk)
+
+
+@receiver(m2m_changed, sender=get_user_model().groups.through)
+def user_groups_authority_update(sender, instance, action, reverse, pk_set,
+                                 **kwargs):
+    if not reverse:
+        if action in ['post_add', 'post_remove', 'post_clear']:
+            invalidate_user_authority(instance.pk)
+    elif action in ['post_add', 'post_remove']:
+        for user_id in pk_set:
+            invalidate_user_authority(user_id)
+    elif action == 'pre_clear':
+        # The users of a cleared group are only known before the clear
+        for user_id in instance.user_set.values_list('pk', flat=True):
+            invalidate_user_authority(user_id)
+
+
+@receiver(post_save, sender=Agency)
+@receiver(post_delete, sender=Agency)
+def agency_cache_namespace_update(sender, instance, **kwargs):
+    bump_namespaces('agency', instance.pk)
+    invalidate_name_url_map()
+    invalidate_sitemap('agencies', instance.pk, pages_changed=True)
+
+
+@receiver(post_save, sender=AgencyBranch)
+@receiver(post_delete, sender=AgencyBranch)
+@receiver(post_save, sender=AgencyEmployee)
+@receiver(post_delete, sender=AgencyEmployee)
+@receiver(post_save, sender=AgencyOpeningHours)
+@receiver(post_delete, sender=AgencyOpeningHours)
+def agency_related_cache_namespace_update(sender, instance, **kwargs):
+    bump_namespaces('agency', instance.agency_id)
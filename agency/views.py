@@ -1,60 +1,61 @@
-from typing import Optional
+from typing import Any, Dict, Optional
 
 from django.conf import settings
 from django.db.models.query import QuerySet as QS
+from django.http import Http404
 from django.http.response import HttpResponse as res
-from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
 from django.views.generic import ListView
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import CreateView
-from onlinemaid.mixins import ListFilteredMixin, SuccessMessageMixin
+from maid.fragments import attach_maid_cards
+from onlinemaid.mixins import (AnonymousPageCacheMixin, ListFilteredMixin,
+                               SuccessMessageMixin)
 from onlinemaid.types import T
 
 from .filters import AgencyFilter
 from .forms import AgencyForm, AgencyOwnerCreationForm, PotentialAgencyForm
 from .mixins import GetAuthorityMixin, OMStaffRequiredMixin
 from .models import Agency, AgencyOwner, PotentialAgency
+from .profiles import get_agency_pk, get_agency_profile
 
 
-class AgencyList(GetAuthorityMixin, ListFilteredMixin, ListView):
+class AgencyList(AnonymousPageCacheMixin, GetAuthorityMixin,
+                 ListFilteredMixin, ListView):
     context_object_name = 'agencies'
     http_method_names = ['get']
     model = Agency
     template_name = 'list/agency-list.html'
-    queryset = Agency.objects.filter(active=True)
+    queryset = Agency.objects.filter(active=True).with_main_branch()
     filter_set = AgencyFilter
     paginate_by = settings.AGENCY_PAGINATE_BY
+    page_cache_namespaces = ['agency']
     ordering = ['name']
     authority = ''
     agency_id = ''
 
 
-class AgencyDetail(DetailView):
+class AgencyDetail(AnonymousPageCacheMixin, DetailView):
     context_object_name = 'agency'
     http_method_names = ['get']
     model = Agency
     template_name = 'detail/agency-detail.html'
+    page_cache_namespaces = ['agency', 'maid']
 
     def get_object(self, queryset: Optional[QS] = ...) -> T:
-        try:
-            pk = int(
-                self.kwargs.get(
-                    self.pk_url_kwarg
-                )
-            )
-        except Exception:
-            return get_object_or_404(
-                Agency,
-                name_url=self.kwargs.get(
-                    self.pk_url_kwarg
-                )
-            )
-        else:
-            return get_object_or_404(
-                Agency,
-                pk=pk
-            )
+        pk = get_agency_pk(self.kwargs.get(self.pk_url_kwarg))
+        self.profile = get_agency_profile(pk) if pk else None
+        if self.profile is None:
+            raise Http404
+        return self.profile['agency']
+
+    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        kwargs = super().get_context_data(**kwargs)
+        # Maid cards are only shown to signed in users
+        if self.request.user.is_authenticated:
+            kwargs['maids'] = attach_maid_cards(self.profile['maids'])
+        kwargs['maids_count'] = len(self.profile['maids'])
+        return kwargs
 
 
 class AgencyCreate(OMStaffRequiredMixin, SuccessMessageMixin, CreateView):
@@ -0,0 +1,63 @@
+from django.conf import settings
+from onlinemaid.pagination import CursorPaginator, InvalidCursor
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import BasePagination
+from rest_framework.response import Response
+from rest_framework.utils.urls import replace_query_param
+
+
+class CursorPagination(BasePagination):
+    """
+    DRF counterpart of onlinemaid.pagination.CursorPaginationMixin sharing
+    the same paginator and cursor format.
+    """
+
+    ordering = ['-pk']
+    cursor_query_param = 'cursor'
+    page_size = settings.API_PAGINATE_BY
+    page_size_query_param = 'page_size'
+    max_page_size = settings.API_MAX_PAGINATE_BY
+    total_query_param = 'with_total'
+
+    def get_page_size(self, request):
+        try:
+            page_size = int(request.query_params[self.page_size_query_param])
+        except (KeyError, ValueError):
+            return self.page_size
+        return max(1, min(page_size, self.max_page_size))
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.request = request
+        paginator = CursorPaginator(
+            queryset,
+            self.get_page_size(request),
+            self.ordering,
+            with_total=bool(request.query_params.get(self.total_query_param))
+        )
+        try:
+            self.page = paginator.page(
+                request.query_params.get(self.cursor_query_param)
+            )
+        except InvalidCursor as e:
+            raise NotFound(str(e))
+        return list(self.page)
+
+    def get_link(self, cursor):
+        if cursor is None:
+            return None
+        url = self.request.build_absolute_uri()
+        return replace_query_param(url, self.cursor_query_param, cursor)
+
+    def get_paginated_response(self, data):
+        response = {
+            'next': self.get_link(self.page.next_cursor),
+            'previous': self.get_link(self.page.previous_cursor),
+            'results': data
+        }
+        if self.page.paginator.with_total:
+            response['approximate_total'] = self.page.approximate_total
+        return Response(response)
+
+
+class MaidCursorPagination(CursorPagination):
+    ordering = ['-created_on', '-pk']
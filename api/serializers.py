@@ -3,7 +3,6 @@ import uuid
 from accounts.models import PotentialEmployer
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.contrib.auth.models import Group
 from enquiry.models import GeneralEnquiry, ShortlistedEnquiry
 from maid.models import (Maid, MaidCooking, MaidDietaryRestriction,
                          MaidDisabledCare, MaidElderlyCare,
@@ -12,6 +11,7 @@ from maid.models import (Maid, MaidCooking, MaidDietaryRestriction,
                          MaidLanguage, MaidLanguageProficiency,
                          MaidLoanTransaction, MaidResponsibility)
 from onlinemaid.constants import EMPLOYERS
+from onlinemaid.registry import groups, maid_languages, maid_responsibilities
 from rest_framework.fields import IntegerField, ListField, UUIDField
 from rest_framework.serializers import CharField, ModelSerializer
 
@@ -205,7 +205,7 @@ class GeneralEnquiryModelSerializer(ModelSerializer):
         fields = '__all__'
 
     def create(self, validated_data):
-        maid_responsibilities = validated_data.pop('maid_responsibility')
+        responsibilities_data = validated_data.pop('maid_responsibility')
         languages_spoken = validated_data.pop('languages_spoken')
         potential_employer = validated_data.pop('potential_employer')
 
@@ -231,16 +231,14 @@ class GeneralEnquiryModelSerializer(ModelSerializer):
 
         instance = GeneralEnquiry.objects.create(**validated_data)
 
-        for i in maid_responsibilities:
-            selected_maid_responsibilities = MaidResponsibility.objects.get(
-                name=i['name']
+        for i in responsibilities_data:
+            selected_maid_responsibilities = maid_responsibilities.get(
+                i['name']
             )
             instance.maid_responsibility.add(selected_maid_responsibilities)
 
         for i in languages_spoken:
-            selected_maid_language = MaidLanguage.objects.get(
-                language=i['language']
-            )
+            selected_maid_language = maid_languages.get(i['language'])
             instance.languages_spoken.add(selected_maid_language)
 
         return instance
@@ -313,9 +311,7 @@ class PotentialEmployerModelSerializer(ModelSerializer):
         except Exception:
             pass
         else:
-            potential_employer_group = Group.objects.get(
-                name=EMPLOYERS
-            )
+            potential_employer_group = groups.get(EMPLOYERS)
             potential_employer_group.user_set.add(
                 new_user
             )
@@ -1,4 +1,3 @@
-import random
 from datetime import timedelta
 
 from accounts.models import PotentialEmployer
@@ -6,14 +5,17 @@ from django.utils import timezone
 from enquiry.models import GeneralEnquiry, ShortlistedEnquiry
 from maid.constants import (MaidLanguageChoices, MaidNationalityChoices,
                             MaidResponsibilityChoices, TypeOfMaidChoices)
-from maid.models import Maid, MaidLanguage, MaidResponsibility
+from maid.models import Maid
+from maid.recommendations import get_similar_maids
 from onlinemaid.constants import MaritalStatusChoices
+from onlinemaid.registry import maid_languages, maid_responsibilities
 from rest_framework.generics import (GenericAPIView, ListAPIView,
                                      ListCreateAPIView, RetrieveAPIView,
                                      get_object_or_404)
 from rest_framework.response import Response
 from rest_framework_api_key.permissions import HasAPIKey
 
+from .pagination import MaidCursorPagination
 from .serializers import (GeneralEnquiryModelSerializer, MaidSerializer,
                           PotentialEmployerModelSerializer,
                           ShortlistedEnquiryModelSerializer,
@@ -22,7 +24,7 @@ from .serializers import (GeneralEnquiryModelSerializer, MaidSerializer,
 
 class MaidRetrieveAPIView(RetrieveAPIView):
     permission_classes = [HasAPIKey]
-    queryset = Maid.objects.all()
+    queryset = Maid.objects.with_detail_data()
     serializer_class = MaidSerializer
 
 
@@ -48,32 +50,27 @@ class SimilarMaidListAPIView(ListAPIView):
                 print(e)
                 return qs
             else:
-                languages = target_maid.languages.all()
-                country_of_origin = target_maid.country_of_origin
-                qs = qs.filter(
-                    country_of_origin=country_of_origin,
-                    languages__in=languages
-                ).exclude(
-                    pk=self.maid_id
-                ).distinct()
-                if qs.count() <= 4:
-                    return qs
-                else:
-                    return random.choices(qs, k=4)
+                return get_similar_maids(
+                    target_maid,
+                    same_agency=True,
+                    queryset=qs
+                )
         else:
-            return None
+            return self.queryset.none()
 
 
 class MaidListAPIView(ListAPIView):
     permission_classes = [HasAPIKey]
     queryset = Maid.objects.all()
     serializer_class = SlimMaidSerializer
+    pagination_class = MaidCursorPagination
 
     def get_queryset(self):
         api_auth_id = self.request.META.get('HTTP_AGENCY_AUTH_ID', None)
         if api_auth_id:
             qs = self.queryset.filter(agency__api_auth_id=api_auth_id)
-            if self.request.query_params:
+            # Pagination parameters alone do not carry the search form
+            if 'type' in self.request.query_params:
                 query_params = self.request.query_params
                 # NP
                 maid_type = query_params.get("type")
@@ -139,63 +136,83 @@ class MaidListAPIView(ListAPIView):
                 language_list = []
                 maid_sl_english = query_params.get("sl_english")
                 if maid_sl_english:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.ENGLISH))
+                    language_list.append(
+                        maid_languages.get(MaidLanguageChoices.ENGLISH)
+                    )
                 maid_sl_mandarin = query_params.get("sl_mandarin")
                 if maid_sl_mandarin:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.MANDARIN))
+                    language_list.append(
+                        maid_languages.get(MaidLanguageChoices.MANDARIN)
+                    )
                 maid_sl_chinese_dialect = query_params.get(
                     "sl_chinese_dialect")
                 if maid_sl_chinese_dialect:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.CHINESE_DIALECT))
+                    language_list.append(
+                        maid_languages.get(MaidLanguageChoices.CHINESE_DIALECT)
+                    )
                 maid_sl_malay = query_params.get("sl_malay")
                 if maid_sl_malay:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.MALAY))
+                    language_list.append(
+                        maid_languages.get(MaidLanguageChoices.MALAY)
+                    )
                 maid_sl_tamil_hindi = query_params.get("sl_tamil_hindi")
                 if maid_sl_tamil_hindi:
-                    language_list.append(MaidLanguage.objects.get(
-                        language=MaidLanguageChoices.HINDI_TAMIL))
+                    language_list.append(
+                        maid_languages.get(MaidLanguageChoices.HINDI_TAMIL)
+                    )
 
                 if language_list:
                     qs = qs.filter(
                         languages__in=language_list
-                    )
+                    ).distinct()
                 responsibility_list = []
                 maid_resp_GEH = query_params.get("resp_GEH")
                 if maid_resp_GEH:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_GENERAL_HOUSEWORK))
+                    responsibility_list.append(
+                        maid_responsibilities.get(
+                            MaidResponsibilityChoices.MAID_RESP_GENERAL_HOUSEWORK
+                        )
+                    )
 
                 maid_resp_COK = query_params.get("resp_COK")
                 if maid_resp_COK:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_COOKING))
+                    responsibility_list.append(
+                        maid_responsibilities.get(
+                            MaidResponsibilityChoices.MAID_RESP_COOKING
+                        )
+                    )
 
                 maid_resp_CFI = query_params.get("resp_CFI")
                 if maid_resp_CFI:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_CARE_FOR_INFANTS_CHILDREN))
+                    responsibility_list.append(
+                        maid_responsibilities.get(
+                            MaidResponsibilityChoices.MAID_RESP_CARE_FOR_INFANTS_CHILDREN
+                        )
+                    )
 
                 maid_resp_CFE = query_params.get("resp_CFE")
                 if maid_resp_CFE:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_CARE_FOR_ELDERLY))
+                    responsibility_list.append(
+                        maid_responsibilities.get(
+                            MaidResponsibilityChoices.MAID_RESP_CARE_FOR_ELDERLY
+                        )
+                    )
 
                 maid_resp_CFD = query_params.get("resp_CFD")
                 if maid_resp_CFD:
-                    responsibility_list.append(MaidResponsibility.objects.get(
-                        name=MaidResponsibilityChoices.MAID_RESP_CARE_FOR_DISABLED))
+                    responsibility_list.append(
+                        maid_responsibilities.get(
+                            MaidResponsibilityChoices.MAID_RESP_CARE_FOR_DISABLED
+                        )
+                    )
 
                 if responsibility_list:
                     qs = qs.filter(
                         responsibilities__in=responsibility_list
-                    )
+                    ).distinct()
             return qs
         else:
-            return None
+            return self.queryset.none()
 
 
 class GeneralEnquiryListCreateAPIView(ListCreateAPIView):
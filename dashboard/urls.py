@@ -8,9 +8,10 @@ from .views import (AccountList, AgencyBranchList, AgencyDetail,
                     DataProviderView, EmployerList, GeneralEnquiriesList,
                     HomePage, MaidAboutFDWFormView, MaidDetail,
                     MaidEmploymentHistoryFormView, MaidExperienceFormView,
-                    MaidInformationCreate, MaidInformationUpdate,
-                    MaidLanguagesAndFHPDRFormView, MaidList, MaidLoanFormView,
-                    SalesList, ShortlistedEnquiriesList, StatusList)
+                    MaidImportFormView, MaidInformationCreate,
+                    MaidInformationUpdate, MaidLanguagesAndFHPDRFormView,
+                    MaidList, MaidLoanFormView, SalesList,
+                    ShortlistedEnquiriesList, StatusList)
 
 urlpatterns = [
     path(
@@ -96,6 +97,11 @@ urlpatterns = [
                 MaidInformationCreate.as_view(),
                 name='dashboard_maid_information_create'
             ),
+            path(
+                'maid-import/',
+                MaidImportFormView.as_view(),
+                name='dashboard_maid_import'
+            ),
             path(
                 'employee/',
                 AgencyEmployeeCreate.as_view(),
@@ -27,21 +27,24 @@ from django.views.generic.detail import DetailView
 from django.views.generic.edit import (CreateView, DeleteView, FormView,
                                        UpdateView)
 from employer_documentation.models import CaseStatus, Employer, EmployerDoc
+from employer_documentation.repayment import get_loan_forecast
 from enquiry.models import GeneralEnquiry, ShortlistedEnquiry
 from maid.constants import (MaidDietaryRestrictionChoices,
                             MaidFoodPreferenceChoices)
 from maid.forms import (MaidAboutFDWForm, MaidExperienceForm, MaidForm,
-                        MaidLanguagesAndFHPDRForm)
+                        MaidImportForm, MaidLanguagesAndFHPDRForm)
 from maid.formsets import (MaidEmploymentHistoryFormSet,
                            MaidEmploymentHistoryFormSetHelper,
                            MaidLoanTransactionFormSet,
                            MaidLoanTransactionFormSetHelper)
+from maid.importer import MaidImporter, read_rows
 from maid.models import (Maid, MaidCooking, MaidDietaryRestriction,
                          MaidDisabledCare, MaidElderlyCare,
                          MaidFoodHandlingPreference, MaidGeneralHousework,
                          MaidInfantChildCare, MaidLanguageProficiency)
 from onlinemaid.constants import AG_ADMINS, AG_MANAGERS, AG_OWNERS, AG_SALES
 from onlinemaid.mixins import ListFilteredMixin, SuccessMessageMixin
+from onlinemaid.pagination import CursorPaginationMixin
 from onlinemaid.types import T
 
 from .filters import (DashboardCaseFilter, DashboardEmployerFilter,
@@ -55,7 +58,8 @@ class BaseDashboardView(AgencyLoginRequiredMixin, GetAuthorityMixin):
 
 
 class BaseFilteredListView(AgencyLoginRequiredMixin, GetAuthorityMixin,
-                           ListFilteredMixin, ListView):
+                           ListFilteredMixin, CursorPaginationMixin,
+                           ListView):
     http_method_names = ['get']
     authority = ''
     agency_id = ''
@@ -736,6 +740,30 @@ class BaseFormView(BaseDashboardView, SuccessMessageMixin, FormView):
     agency_id = ''
 
 
+class MaidImportFormView(BaseFormView):
+    form_class = MaidImportForm
+    template_name = 'form/maid-import-form.html'
+
+    def form_valid(self, form):
+        uploaded_file = form.cleaned_data.get('file')
+        try:
+            rows = read_rows(
+                uploaded_file,
+                uploaded_file.name.rsplit('.', 1)[-1].lower()
+            )
+        except ValueError:
+            form.add_error('file', 'Could not read the uploaded file')
+            return self.form_invalid(form)
+        report = MaidImporter(self.agency_id).run(rows)
+        messages.success(
+            self.request,
+            f'{report["created"]} of {report["total"]} maids imported'
+        )
+        return self.render_to_response(
+            self.get_context_data(form=form, report=report)
+        )
+
+
 class BaseFormsetView(BaseFormView):
     form_class_helper = None
 
@@ -1564,12 +1592,16 @@ class HomePage(BaseDashboardView, TemplateView):
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         kwargs = super().get_context_data()
-        agency = Agency.objects.get(
+        agency = Agency.objects.with_stats().get(
             pk=self.agency_id
         )
         kwargs.update({
             'agency': agency
         })
+        if self.authority == AG_OWNERS:
+            kwargs.update({
+                'loan_forecast': get_loan_forecast(self.agency_id)
+            })
         return kwargs
 
 
@@ -0,0 +1,92 @@
+import io
+import zipfile
+
+from django.template.loader import render_to_string
+from pypdf import PdfWriter
+from weasyprint import HTML
+
+from .pdf_assets import (get_pdf_font_config, get_pdf_stylesheet,
+                         pdf_url_fetcher)
+
+# The documents of a case in the order they are signed, see the pdf URLs
+CASE_BUNDLE_DOCUMENTS = [
+    ('pdf/01-service-fee-schedule.html', 'service_fee_schedule.pdf'),
+    ('pdf/03-service-agreement.html', 'service_agreement.pdf'),
+    ('pdf/04-employment-contract.html', 'employment-contract.pdf'),
+    ('pdf/05-repayment-schedule.html', 'repayment-schedule.pdf'),
+    ('pdf/06-rest-day-agreement.html', 'rest-day-agreement.pdf'),
+    ('pdf/09-transfer-consent.html', 'transfer-consent.pdf'),
+    ('pdf/10-work-pass-authorisation.html', 'work-pass-authorisation.pdf'),
+    ('pdf/13-income-tax-declaration.html', 'income-tax-declaration.pdf'),
+    ('pdf/14-safety-agreement.html', 'safety-agreement.pdf'),
+    ('pdf/08-handover-checklist.html', 'handover-checklist.pdf')
+]
+
+CASE_BUNDLE_UPLOADS = [
+    ('job_order_pdf', 'job_order.pdf'),
+    ('ipa_pdf', 'ipa.pdf'),
+    ('medical_report_pdf', 'medical_report.pdf')
+]
+
+
+def render_case_documents(context, base_url):
+    """
+    Lays out every case document from the same context with the shared
+    stylesheet and font configuration. Returns (filename, document) pairs
+    of WeasyPrint documents which are not written to PDF yet.
+    """
+    return [
+        (
+            filename,
+            HTML(
+                string=render_to_string(template_name, context),
+                base_url=base_url,
+                url_fetcher=pdf_url_fetcher
+            ).render(
+                stylesheets=[get_pdf_stylesheet()],
+                font_config=get_pdf_font_config()
+            )
+        )
+        for template_name, filename in CASE_BUNDLE_DOCUMENTS
+    ]
+
+
+def get_case_uploads(employer_doc):
+    doc_upload = getattr(employer_doc, 'rn_docupload_ed', None)
+    if doc_upload is None:
+        return []
+    return [
+        (filename, getattr(doc_upload, field_name))
+        for field_name, filename in CASE_BUNDLE_UPLOADS
+        if getattr(doc_upload, field_name)
+    ]
+
+
+def read_upload(field_file):
+    with field_file.open('rb') as upload:
+        return upload.read()
+
+
+def write_case_bundle_pdf(documents, uploads):
+    # The pages of every document written as one PDF, followed by the
+    # pages of the uploaded PDFs
+    pages = [page for _, document in documents for page in document.pages]
+    rendered = documents[0][1].copy(pages).write_pdf()
+    if not uploads:
+        return rendered
+
+    writer = PdfWriter()
+    writer.append(io.BytesIO(rendered))
+    for _, field_file in uploads:
+        writer.append(io.BytesIO(read_upload(field_file)))
+    bundle = io.BytesIO()
+    writer.write(bundle)
+    return bundle.getvalue()
+
+
+def write_case_bundle_zip(documents, uploads, file):
+    with zipfile.ZipFile(file, 'w', zipfile.ZIP_DEFLATED) as bundle:
+        for filename, document in documents:
+            bundle.writestr(filename, document.write_pdf())
+        for filename, field_file in uploads:
+            bundle.writestr(filename, read_upload(field_file))
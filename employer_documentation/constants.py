@@ -176,6 +176,13 @@ class CaseStatusChoices(models.TextChoices):
     ARCHIVED = 'ARCHIV', _('Archived')
 
 
+class PdfRenderJobStatusChoices(models.TextChoices):
+    PENDING = 'PEND', _('Pending')
+    RUNNING = 'RUN', _('Running')
+    DONE = 'DONE', _('Done')
+    FAILED = 'FAIL', _('Failed')
+
+
 NUMBER_OF_WORK_DAYS_IN_MONTH = 26
 
 ERROR_MESSAGES_VERBOSE_NAME_MAP = {
@@ -0,0 +1,81 @@
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from concurrent.futures.process import BrokenProcessPool
+
+from django.conf import settings
+from django.core.management.base import BaseCommand
+from django.db import connections
+
+from employer_documentation.pdf_cache import write_cached_pdf
+from employer_documentation.pdf_jobs import (claim_pdf_render_jobs,
+                                             delete_expired_pdf_render_jobs,
+                                             render_pdf,
+                                             requeue_stale_pdf_render_jobs)
+
+
+class Command(BaseCommand):
+    help = 'Renders queued PDFs in a pool of worker processes'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=settings.PDF_RENDER_WORKERS
+        )
+        parser.add_argument(
+            '--once',
+            action='store_true',
+            help='Exit once the queue is empty'
+        )
+
+    def render_jobs(self, executor, jobs):
+        futures = {
+            executor.submit(render_pdf, job.html, job.base_url): job
+            for job in jobs
+        }
+        broken = False
+        for future in as_completed(futures):
+            job = futures[future]
+            try:
+                write_cached_pdf(job.path, future.result())
+            except BrokenProcessPool as e:
+                # Any job of the batch may have killed the worker, they are
+                # all retried up to PDF_RENDER_MAX_ATTEMPTS times
+                if job.can_retry:
+                    job.set_pending()
+                else:
+                    job.set_failed(str(e))
+                broken = True
+            except Exception as e:
+                job.set_failed(str(e))
+                self.stderr.write(f'Job {job.pk}: {e}')
+            else:
+                job.set_done()
+        if broken:
+            raise BrokenProcessPool('A worker process died')
+
+    def run_workers(self, options):
+        # The worker processes are forked without the database connections
+        connections.close_all()
+        with ProcessPoolExecutor(max_workers=options['workers']) as executor:
+            while True:
+                requeue_stale_pdf_render_jobs()
+                jobs = claim_pdf_render_jobs(options['workers'])
+                if jobs:
+                    self.render_jobs(executor, jobs)
+                    continue
+
+                delete_expired_pdf_render_jobs()
+                if options['once']:
+                    break
+                time.sleep(settings.PDF_RENDER_POLL_INTERVAL)
+
+    def handle(self, *args, **options):
+        while True:
+            try:
+                self.run_workers(options)
+            except BrokenProcessPool as e:
+                # Start a new pool, the broken one accepts no more jobs
+                self.stderr.write(str(e))
+            else:
+                break
@@ -1,23 +1,28 @@
-import calendar
-import datetime
+import io
+import tempfile
 import uuid
 from typing import Any, Dict
 
 from agency.mixins import AgencyLoginRequiredMixin
 from django.conf import settings
 from django.contrib.auth import get_user_model
-from django.http import HttpResponse
+from django.http import FileResponse, HttpResponse, JsonResponse
 from django.http.request import HttpRequest as req
 from django.http.response import HttpResponseBase as RESBASE
 from django.template.loader import render_to_string
 from django.urls.base import reverse_lazy
 from maid.constants import COUNTRY_LANGUAGE_MAP
 from onlinemaid.constants import AG_ADMINS, AG_MANAGERS, AG_OWNERS, AG_SALES
-from onlinemaid.helper_functions import intervening_weekdays
 from onlinemaid.mixins import GroupRequiredMixin
-from weasyprint import CSS, HTML
 
+from .bundles import (get_case_uploads, render_case_documents,
+                      write_case_bundle_pdf, write_case_bundle_zip)
 from .models import EmployerDoc
+from .pdf_cache import (get_employer_doc_key_parts, get_pdf_cache_path,
+                        read_cached_pdf, write_cached_pdf)
+from .pdf_jobs import (create_pdf_render_job, get_pdf_render_job_payload,
+                       render_pdf)
+from .repayment import get_repayment_schedule
 
 
 class PdfHtmlViewMixin:
@@ -54,172 +59,130 @@ class PdfHtmlViewMixin:
 
         return context
 
-    def generate_pdf_response(self, request, context):
-        # Render PDF
-        html_template = render_to_string(self.template_name, context)
-        pdf_file = HTML(
-            string=html_template,
-            base_url=request.build_absolute_uri()
-        ).write_pdf(
-            # Load separate CSS stylesheet from static folder
-            stylesheets=[CSS(settings.STATIC_URL + 'css/pdf.css')]
-        )
-        response = HttpResponse(pdf_file, content_type='application/pdf')
-        if self.content_disposition:
-            response['Content-Disposition'] = self.content_disposition
-        else:
-            response['Content-Disposition'] = (
-                'inline; filename=' + self.DEFAULT_DOWNLOAD_FILENAME
+    def get_pdf_cache_key_parts(self):
+        # The values the PDF depends on besides its template, or None when
+        # the PDF is not cached
+        if isinstance(self.object, EmployerDoc):
+            return get_employer_doc_key_parts(self.object)
+        return None
+
+    def get_pdf_cache_path(self):
+        # Worked out once, before get_context_data() formats the version
+        if not hasattr(self, '_pdf_cache_path'):
+            key_parts = self.get_pdf_cache_key_parts()
+            self._pdf_cache_path = None if key_parts is None else (
+                get_pdf_cache_path(self.object, self.template_name, key_parts)
             )
-        return response
+        return self._pdf_cache_path
 
-    def generate_pdf_file(self, request, context, template_name):
-        # Render PDF
-        html_template = render_to_string(template_name, context)
-        return HTML(
-            string=html_template,
-            base_url=request.build_absolute_uri()
-        ).write_pdf(
-            # Load separate CSS stylesheet from static folder
-            stylesheets=[CSS(settings.STATIC_URL + 'css/pdf.css')]
+    def get_pdf_context(self, request):
+        context = self.get_context_data()
+
+        if self.use_repayment_table:
+            context.update({
+                'repayment_table': self.calc_repayment_schedule()
+            })
+
+        context.update({
+            'url_name': request.resolver_match.url_name
+        })
+        return context
+
+    def get(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
+        self.object = self.get_object()
+        cached_response = self.get_cached_pdf_response()
+        if cached_response:
+            return cached_response
+        return self.generate_pdf_response(
+            request,
+            self.get_pdf_context(request)
         )
 
-    def calc_repayment_schedule(self):
-        repayment_table = {}
-
-        # Salary constant
-        BASIC_SALARY = self.object.fdw_salary
-
-        # Off day constants
-        PER_OFF_DAY_COMPENSATION = self.object.get_per_off_day_compensation()
-        FDW_OFF_DAYS_PER_MONTH = self.object.fdw_off_days
-        OFF_DAY_OF_WEEK = int(self.object.fdw_off_day_of_week)
-
-        # Initialise loan amounts
-        MONTHLY_LOAN_REPAYMENT = self.object.fdw_monthly_loan_repayment
-        fdw_loan_balance = self.object.fdw_loan
-
-        if (
-            hasattr(self.object, 'rn_casestatus_ed')
-            and self.object.rn_casestatus_ed.fdw_work_commencement_date
-        ):
-            DEPLOYMENT_DATE = (
-                self.object.rn_casestatus_ed.fdw_work_commencement_date
-            )
-        else:
-            DEPLOYMENT_DATE = None
-
-        if DEPLOYMENT_DATE:
-            # Initialise dates
-            payment_year = DEPLOYMENT_DATE.year
-            payment_month = DEPLOYMENT_DATE.month
-            payment_day = min(
-                DEPLOYMENT_DATE.day,
-                calendar.monthrange(
-                    payment_year,
-                    payment_month
-                )[1]
+    def post(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
+        # Queues the PDF for the render_pdf_jobs worker instead of rendering
+        # it in the request, the status URL returned is polled until the
+        # PDF can be downloaded
+        self.object = self.get_object()
+        job = create_pdf_render_job(
+            request.user,
+            request.build_absolute_uri(),
+            self.get_content_disposition(),
+            self.get_pdf_cache_path(),
+            lambda: render_to_string(
+                self.template_name,
+                self.get_pdf_context(request)
             )
+        )
+        return JsonResponse(get_pdf_render_job_payload(job), status=202)
 
-            for i in range(1, 25):
-                # Set start_date for calculation of potential_off_days_in_month
-                payment_date = datetime.date(
-                    payment_year,
-                    payment_month,
-                    payment_day
-                )
-                start_date = payment_date + datetime.timedelta(days=1)
+    def get_cached_pdf_response(self):
+        path = self.get_pdf_cache_path()
+        pdf_file = read_cached_pdf(path) if path else None
+        if pdf_file is None:
+            return None
+        return self.build_pdf_response(pdf_file)
 
-                # Set payment date
-                payment_month += 1
-                if payment_month % 12 == 0:
-                    payment_month = 12
-                else:
-                    payment_month = payment_month % 12
-                payment_year += 1 if payment_month % 12 == 1 else 0
-                payment_day = min(
-                    DEPLOYMENT_DATE.day,
-                    calendar.monthrange(payment_year, payment_month)[1]
-                )
+    def generate_pdf_response(self, request, context):
+        pdf_file = self.generate_pdf_file(request, context, self.template_name)
+        path = self.get_pdf_cache_path()
+        if path:
+            write_cached_pdf(path, pdf_file)
+        return self.build_pdf_response(pdf_file)
 
-                # Calculate potential_off_days_in_month
-                end_date = datetime.date(
-                    payment_year,
-                    payment_month,
-                    payment_day
-                )
-                potential_off_days_in_month = intervening_weekdays(
-                    start_date, end_date,
-                    inclusive=True,
-                    weekdays=[OFF_DAY_OF_WEEK]
-                )
+    def get_content_disposition(self):
+        if self.content_disposition:
+            return self.content_disposition
+        return 'inline; filename=' + self.DEFAULT_DOWNLOAD_FILENAME
 
-                # Calculate salary and loan payments in month
-                fdw_off_days_remaining = (
-                    potential_off_days_in_month - FDW_OFF_DAYS_PER_MONTH
-                )
-                balance_off_day_compensation = (
-                    PER_OFF_DAY_COMPENSATION * fdw_off_days_remaining
-                )
-                total_salary = BASIC_SALARY + balance_off_day_compensation
-                loan_repaid = min(
-                    MONTHLY_LOAN_REPAYMENT,
-                    BASIC_SALARY,
-                    fdw_loan_balance
-                )
+    def build_pdf_response(self, pdf_file):
+        response = HttpResponse(pdf_file, content_type='application/pdf')
+        response['Content-Disposition'] = self.get_content_disposition()
+        return response
 
-                # Each row of repayment table
-                repayment_table[i] = {
-                    'salary_date': '{day}/{month}/{year}'.format(
-                        day=str(payment_day).zfill(2),
-                        month=str(payment_month).zfill(2),
-                        year=str(payment_year).zfill(4),
-                    ),
-                    'basic_salary': BASIC_SALARY,
-                    'off_day_compensation': balance_off_day_compensation,
-                    'total_salary': total_salary,
-                    'loan_repaid': loan_repaid,
-                    'salary_received': total_salary - loan_repaid,
-                }
-
-                # Update remaining loan balance
-                if fdw_loan_balance - loan_repaid >= 0:
-                    fdw_loan_balance = fdw_loan_balance - loan_repaid
-                else:
-                    fdw_loan_balance = 0
+    def generate_pdf_file(self, request, context, template_name):
+        # Render PDF
+        html_template = render_to_string(template_name, context)
+        return render_pdf(html_template, request.build_absolute_uri())
 
-        else:
-            # if work commencement date not set, then generate table without
-            # dates
-            for i in range(1, 25):
-                # Calculate salary and loan payments in month
-                fdw_off_days_remaining = 4 - FDW_OFF_DAYS_PER_MONTH
-                balance_off_day_compensation = (
-                    PER_OFF_DAY_COMPENSATION * fdw_off_days_remaining
-                )
-                total_salary = BASIC_SALARY + balance_off_day_compensation
-                loan_repaid = min(
-                    MONTHLY_LOAN_REPAYMENT,
-                    BASIC_SALARY,
-                    fdw_loan_balance
-                )
+    def calc_repayment_schedule(self):
+        return get_repayment_schedule(self.object)
+
+
+class CaseBundleViewMixin(PdfHtmlViewMixin):
+    """
+    Returns every document of a case, rendered from a single context, and
+    the uploaded job order, IPA and medical report as one PDF or, with
+    ?format=zip, as a ZIP of the separate PDFs.
+    """
+    http_method_names = ['get']
+    # Every document is rendered from the same context
+    use_repayment_table = True
+
+    def get(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
+        self.object = self.get_object()
+        documents = render_case_documents(
+            self.get_pdf_context(request),
+            request.build_absolute_uri()
+        )
+        uploads = get_case_uploads(self.object)
+        filename = f'case-{self.object.case_ref_no}'
+
+        if request.GET.get('format') == 'zip':
+            bundle = tempfile.SpooledTemporaryFile()
+            write_case_bundle_zip(documents, uploads, bundle)
+            bundle.seek(0)
+            return FileResponse(
+                bundle,
+                as_attachment=True,
+                filename=f'{filename}.zip',
+                content_type='application/zip'
+            )
 
-                # Each row of repayment table
-                repayment_table[i] = {
-                    'salary_date': '',
-                    'basic_salary': BASIC_SALARY,
-                    'off_day_compensation': balance_off_day_compensation,
-                    'total_salary': total_salary,
-                    'loan_repaid': loan_repaid,
-                    'salary_received': total_salary - loan_repaid,
-                }
-
-                # Update remaining loan balance
-                if fdw_loan_balance - loan_repaid >= 0:
-                    fdw_loan_balance = fdw_loan_balance - loan_repaid
-                else:
-                    fdw_loan_balance = 0
-        return repayment_table
+        return FileResponse(
+            io.BytesIO(write_case_bundle_pdf(documents, uploads)),
+            filename=f'{filename}.pdf',
+            content_type='application/pdf'
+        )
 
 
 class EmployerRequiredMixin(GroupRequiredMixin):
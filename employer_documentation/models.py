@@ -27,7 +27,8 @@ from onlinemaid.storage_backends import EmployerDocumentationStorage
 from .constants import (NUMBER_OF_WORK_DAYS_IN_MONTH, CaseStatusChoices,
                         DayChoices, DayOfWeekChoices,
                         EmployerTypeOfApplicantChoices, HouseholdIdTypeChoices,
-                        IncomeChoices, MonthChoices, RelationshipChoices,
+                        IncomeChoices, MonthChoices,
+                        PdfRenderJobStatusChoices, RelationshipChoices,
                         ResidentialStatusPartialChoices, WeekChoices)
 from .fields import (CustomMoneyDecimalField,
                      NullableResidentialStatusCharField,
@@ -1166,6 +1167,12 @@ class EmployerDoc(models.Model):
         editable=False,
         default=0
     )
+    # Incremented whenever anything shown on the case documents changes,
+    # see invalidate_case_pdfs
+    pdf_revision = models.PositiveIntegerField(
+        editable=False,
+        default=0
+    )
 
     # User input fields
     case_ref_no = models.CharField(
@@ -1361,12 +1368,14 @@ class EmployerDoc(models.Model):
 
     def set_archive(self):
         if not self.is_archived_doc():
+            # The address is left blank when the agency has no main branch
+            main_branch = self.employer.agency_employee.agency.get_main_branch()
             archived_agency_details = ArchivedAgencyDetails.objects.create(
                 agency_name=self.employer.agency_employee.agency.name,
                 agency_license_no=self.employer.agency_employee.agency.license_number,
-                agency_address_line_1=self.employer.agency_employee.agency.get_main_branch().address_1,
-                agency_address_line_2=self.employer.agency_employee.agency.get_main_branch().address_2,
-                agency_postal_code=self.employer.agency_employee.agency.get_main_branch().postal_code,
+                agency_address_line_1=getattr(main_branch, 'address_1', ''),
+                agency_address_line_2=getattr(main_branch, 'address_2', ''),
+                agency_postal_code=getattr(main_branch, 'postal_code', ''),
                 agency_employee_name=self.employer.agency_employee.name,
                 agency_employee_ea_personnel_number=self.employer.agency_employee.ea_personnel_number,
                 agency_employee_branch=self.employer.agency_employee.branch.name
@@ -2108,3 +2117,94 @@ class ArchivedMaid(models.Model):
         editable=True,
         blank=True
     )
+
+
+class PdfRenderJob(models.Model):
+    id = models.UUIDField(
+        primary_key=True,
+        default=uuid.uuid4,
+        editable=False
+    )
+    user = models.ForeignKey(
+        settings.AUTH_USER_MODEL,
+        on_delete=models.CASCADE,
+        related_name='pdf_render_jobs'
+    )
+    status = models.CharField(
+        verbose_name=_('Status'),
+        max_length=4,
+        choices=PdfRenderJobStatusChoices.choices,
+        default=PdfRenderJobStatusChoices.PENDING
+    )
+
+    # The page is rendered to HTML when the job is created, so that the
+    # worker only needs to run WeasyPrint
+    html = models.TextField(
+        blank=True
+    )
+    base_url = models.CharField(
+        max_length=2048
+    )
+    path = models.CharField(
+        verbose_name=_('Storage path of the PDF'),
+        max_length=255
+    )
+    content_disposition = models.CharField(
+        max_length=255
+    )
+    error = models.TextField(
+        blank=True
+    )
+    attempts = models.PositiveSmallIntegerField(
+        default=0
+    )
+    created_on = models.DateTimeField(
+        auto_now_add=True
+    )
+    started_on = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+    finished_on = models.DateTimeField(
+        null=True,
+        blank=True
+    )
+
+    class Meta:
+        ordering = ['created_on']
+
+    @property
+    def is_done(self):
+        return self.status == PdfRenderJobStatusChoices.DONE
+
+    @property
+    def is_finished(self):
+        return self.status in [
+            PdfRenderJobStatusChoices.DONE,
+            PdfRenderJobStatusChoices.FAILED
+        ]
+
+    def set_running(self):
+        self.status = PdfRenderJobStatusChoices.RUNNING
+        self.save()
+
+    @property
+    def can_retry(self):
+        return self.attempts < settings.PDF_RENDER_MAX_ATTEMPTS
+
+    def set_pending(self):
+        self.status = PdfRenderJobStatusChoices.PENDING
+        self.started_on = None
+        self.save()
+
+    def set_done(self):
+        self.status = PdfRenderJobStatusChoices.DONE
+        self.html = ''
+        self.finished_on = timezone.now()
+        self.save()
+
+    def set_failed(self, error):
+        self.status = PdfRenderJobStatusChoices.FAILED
+        self.error = error
+        self.finished_on = timezone.now()
+        self.save()
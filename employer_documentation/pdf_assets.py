@@ -0,0 +1,96 @@
+import mimetypes
+from functools import lru_cache
+from urllib.parse import unquote, urljoin, urlparse
+
+from django.conf import settings
+from django.contrib.staticfiles import finders
+from django.contrib.staticfiles.storage import staticfiles_storage
+from django.core.files.storage import default_storage
+from weasyprint import CSS, default_url_fetcher
+from weasyprint.fonts import FontConfiguration
+
+# WeasyPrint only resolves absolute URLs, relative STATIC_URL and MEDIA_URL
+# are given this origin and then read locally by pdf_url_fetcher
+LOCAL_ORIGIN = 'http://localhost/'
+
+PDF_STYLESHEET = 'css/pdf.css'
+
+
+def get_absolute_url(url):
+    return urljoin(LOCAL_ORIGIN, url)
+
+
+def get_storage_name(url, prefix):
+    # The name of the file below the prefix URL, or None when the URL is
+    # not below it. Relative prefixes match the path of any host.
+    if urlparse(prefix).netloc:
+        if not url.startswith(prefix):
+            return None
+        return unquote(url[len(prefix):])
+    path = urlparse(url).path
+    if not path.startswith(prefix):
+        return None
+    return unquote(path[len(prefix):])
+
+
+def read_static_file(name):
+    # Read from the project's static folders first, as collected static
+    # files may be on S3
+    path = finders.find(name)
+    if path:
+        with open(path, 'rb') as static_file:
+            return static_file.read()
+    with staticfiles_storage.open(name) as static_file:
+        return static_file.read()
+
+
+def read_media_file(name):
+    with default_storage.open(name) as media_file:
+        return media_file.read()
+
+
+@lru_cache(maxsize=settings.PDF_ASSET_CACHE_SIZE)
+def fetch_local_asset(url):
+    # Returns None for URLs which are not static or media files
+    name = get_storage_name(url, settings.STATIC_URL)
+    if name is not None:
+        content = read_static_file(name)
+    else:
+        name = get_storage_name(url, settings.MEDIA_URL)
+        if name is None:
+            return None
+        content = read_media_file(name)
+    return content, mimetypes.guess_type(name)[0]
+
+
+def pdf_url_fetcher(url, *args, **kwargs):
+    """
+    WeasyPrint url_fetcher which reads static and media files from the
+    storage backends instead of requesting them over HTTP. Files are kept
+    in process, see PDF_ASSET_CACHE_SIZE.
+    """
+    if url.startswith(('http://', 'https://')):
+        asset = fetch_local_asset(url)
+        if asset is not None:
+            content, mime_type = asset
+            return {
+                'string': content,
+                'mime_type': mime_type,
+                'redirected_url': url
+            }
+    return default_url_fetcher(url, *args, **kwargs)
+
+
+@lru_cache(maxsize=None)
+def get_pdf_font_config():
+    return FontConfiguration()
+
+
+@lru_cache(maxsize=None)
+def get_pdf_stylesheet():
+    # Parsed once per process and shared by every render
+    return CSS(
+        url=get_absolute_url(settings.STATIC_URL + PDF_STYLESHEET),
+        url_fetcher=pdf_url_fetcher,
+        font_config=get_pdf_font_config()
+    )
@@ -0,0 +1,152 @@
+import glob
+import hashlib
+import os
+from functools import lru_cache
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.db import models
+from django.template import engines
+from django.template.loader import get_template
+from onlinemaid.storage_backends import EmployerDocumentationStorage
+
+from .models import CaseSignature, EmployerDoc, OverwriteStorage
+from .pdf_assets import PDF_STYLESHEET, read_static_file
+
+PDF_CACHE_LOCATION = 'pdf_cache'
+
+SIGNATURE_FIELDS = [
+    field.attname for field in CaseSignature._meta.concrete_fields
+    if isinstance(field, models.TextField)
+]
+
+
+def get_pdf_cache_storage():
+    # Rendered case documents are kept with the uploaded ones
+    if settings.USE_S3:
+        return EmployerDocumentationStorage()
+    return OverwriteStorage()
+
+
+def get_pdf_template_paths():
+    # The bases, headers, signatures and snippets shared by the documents
+    paths = set()
+    for engine in engines.all():
+        for template_dir in engine.template_dirs:
+            paths.update(glob.glob(
+                os.path.join(template_dir, 'pdf', '**', '*.html'),
+                recursive=True
+            ))
+    return sorted(paths)
+
+
+@lru_cache(maxsize=None)
+def get_pdf_assets_hash():
+    """
+    Hash of everything a rendered PDF depends on besides its own template
+    and data: PDF_CACHE_VERSION, the shared templates under pdf/ and the
+    stylesheet. Cached PDFs outlive the process, so a deploy changing any
+    of these moves every document on to new paths.
+    """
+    digest = hashlib.md5(str(settings.PDF_CACHE_VERSION).encode())
+    for path in get_pdf_template_paths():
+        with open(path, 'rb') as template_file:
+            digest.update(template_file.read())
+    try:
+        digest.update(read_static_file(PDF_STYLESHEET))
+    except OSError:
+        # Rendering fails without it anyway
+        pass
+    return digest.hexdigest()
+
+
+@lru_cache(maxsize=None)
+def get_template_hash(template_name):
+    # Templates only change on deploy, so this is worked out once a process
+    source = get_template(template_name).template.source
+    return hashlib.md5(
+        (get_pdf_assets_hash() + source).encode()
+    ).hexdigest()
+
+
+def get_signature_hash(employer_doc):
+    signatures = getattr(employer_doc, 'rn_signatures_ed', None)
+    values = [
+        getattr(signatures, field, None) or '' for field in SIGNATURE_FIELDS
+    ]
+    return hashlib.md5('|'.join(values).encode()).hexdigest()
+
+
+def get_agency_key_parts(agency_employee):
+    # The agency details printed on the case documents
+    agency = agency_employee.agency
+    main_branch = agency.get_main_branch()
+    return [
+        agency_employee.name,
+        agency_employee.ea_personnel_number,
+        agency.name,
+        agency.license_number,
+        getattr(main_branch, 'address_1', ''),
+        getattr(main_branch, 'address_2', ''),
+        getattr(main_branch, 'postal_code', '')
+    ]
+
+
+def get_employer_doc_key_parts(employer_doc):
+    # Everything shown on a case document besides the template. Cached PDFs
+    # are shared by every host, so the key is only built from the database:
+    # pdf_revision covers the case and employer rows which can change
+    # without the version being incremented.
+    return [
+        employer_doc.version,
+        employer_doc.pdf_revision,
+        get_signature_hash(employer_doc),
+        employer_doc.fdw.updated_on.timestamp(),
+        *get_agency_key_parts(employer_doc.employer.agency_employee)
+    ]
+
+
+def get_pdf_cache_path(obj, template_name, key_parts):
+    template_slug = os.path.splitext(os.path.basename(template_name))[0]
+    digest = hashlib.md5(
+        '|'.join(map(str, [get_template_hash(template_name), *key_parts]))
+        .encode()
+    ).hexdigest()
+    return '/'.join([
+        PDF_CACHE_LOCATION,
+        obj._meta.label_lower,
+        str(obj.pk),
+        f'{template_slug}-{digest}.pdf'
+    ])
+
+
+def read_cached_pdf(path):
+    storage = get_pdf_cache_storage()
+    if not storage.exists(path):
+        return None
+    with storage.open(path) as pdf_file:
+        return pdf_file.read()
+
+
+def write_cached_pdf(path, pdf_file):
+    storage = get_pdf_cache_storage()
+    storage.save(path, ContentFile(pdf_file))
+
+    # Renders of older versions of the same document are never read again
+    directory, name = path.rsplit('/', 1)
+    template_slug = name.rsplit('-', 1)[0]
+    for stale_name in storage.listdir(directory)[1]:
+        if (
+            stale_name != name
+            and stale_name.rsplit('-', 1)[0] == template_slug
+        ):
+            storage.delete(f'{directory}/{stale_name}')
+
+
+def invalidate_case_pdfs(*employer_doc_ids):
+    # An update, so that no save signals are sent again
+    EmployerDoc.objects.filter(
+        pk__in=employer_doc_ids
+    ).update(
+        pdf_revision=models.F('pdf_revision') + 1
+    )
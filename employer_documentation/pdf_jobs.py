@@ -0,0 +1,133 @@
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import models, transaction
+from django.urls import reverse
+from django.utils import timezone
+from weasyprint import HTML
+
+from .constants import PdfRenderJobStatusChoices
+from .models import PdfRenderJob
+from .pdf_assets import (get_pdf_font_config, get_pdf_stylesheet,
+                         pdf_url_fetcher)
+from .pdf_cache import PDF_CACHE_LOCATION, get_pdf_cache_storage
+
+JOB_LOCATION = f'{PDF_CACHE_LOCATION}/jobs'
+
+
+def render_pdf(html, base_url):
+    # Module level so that it can be run in a worker process
+    return HTML(
+        string=html,
+        base_url=base_url,
+        url_fetcher=pdf_url_fetcher
+    ).write_pdf(
+        stylesheets=[get_pdf_stylesheet()],
+        font_config=get_pdf_font_config()
+    )
+
+
+def create_pdf_render_job(user, base_url, content_disposition, cache_path,
+                          render_html):
+    """
+    Creates a job rendering the HTML returned by render_html() to a PDF.
+    When the PDF is already in the render cache the job is created done,
+    without calling render_html().
+    """
+    job = PdfRenderJob(
+        user=user,
+        base_url=base_url,
+        content_disposition=content_disposition
+    )
+    if cache_path and get_pdf_cache_storage().exists(cache_path):
+        job.path = cache_path
+        job.status = PdfRenderJobStatusChoices.DONE
+        job.finished_on = timezone.now()
+    else:
+        job.path = cache_path or f'{JOB_LOCATION}/{job.pk.hex}.pdf'
+        job.html = render_html()
+    job.save()
+    return job
+
+
+def get_pdf_render_job_payload(job):
+    return {
+        'id': str(job.pk),
+        'status': job.status,
+        'status_url': reverse(
+            'pdf_render_job_status',
+            kwargs={'pk': job.pk}
+        ),
+        'download_url': reverse(
+            'pdf_render_job_download',
+            kwargs={'pk': job.pk}
+        ) if job.is_done else None,
+        'error': job.error
+    }
+
+
+def claim_pdf_render_jobs(limit):
+    # Locked rows are skipped so that several workers can share the queue
+    with transaction.atomic():
+        jobs = list(
+            PdfRenderJob.objects.select_for_update(
+                skip_locked=True
+            ).filter(
+                status=PdfRenderJobStatusChoices.PENDING
+            )[:limit]
+        )
+        started_on = timezone.now()
+        PdfRenderJob.objects.filter(
+            pk__in=[job.pk for job in jobs]
+        ).update(
+            status=PdfRenderJobStatusChoices.RUNNING,
+            started_on=started_on,
+            attempts=models.F('attempts') + 1
+        )
+    for job in jobs:
+        job.status = PdfRenderJobStatusChoices.RUNNING
+        job.started_on = started_on
+        job.attempts += 1
+    return jobs
+
+
+def requeue_stale_pdf_render_jobs():
+    """
+    Returns jobs left running by a worker which was killed to the queue,
+    or fails them once they were claimed PDF_RENDER_MAX_ATTEMPTS times so
+    that a PDF which kills its worker is not retried forever.
+    """
+    now = timezone.now()
+    stale = PdfRenderJob.objects.filter(
+        models.Q(started_on__isnull=True)
+        | models.Q(started_on__lt=now - timedelta(
+            seconds=settings.PDF_RENDER_JOB_TIMEOUT
+        )),
+        status=PdfRenderJobStatusChoices.RUNNING
+    )
+    stale.filter(
+        attempts__gte=settings.PDF_RENDER_MAX_ATTEMPTS
+    ).update(
+        status=PdfRenderJobStatusChoices.FAILED,
+        error='Rendering did not finish',
+        finished_on=now
+    )
+    stale.update(
+        status=PdfRenderJobStatusChoices.PENDING,
+        started_on=None
+    )
+
+
+def delete_expired_pdf_render_jobs():
+    expired = PdfRenderJob.objects.filter(
+        finished_on__lt=timezone.now() - timedelta(
+            seconds=settings.PDF_RENDER_JOB_RETENTION
+        )
+    )
+    storage = get_pdf_cache_storage()
+    # PDFs in the render cache are left to it
+    for path in expired.filter(
+        path__startswith=JOB_LOCATION
+    ).values_list('path', flat=True):
+        storage.delete(path)
+    expired.delete()
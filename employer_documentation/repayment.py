@@ -0,0 +1,228 @@
+from decimal import Decimal
+
+import numpy as np
+from django.conf import settings
+from django.utils import timezone
+from onlinemaid.cache import cache_ns
+
+from .constants import CaseStatusChoices
+from .models import EmployerDoc
+
+REPAYMENT_MONTHS = 24
+
+# Off days assumed in a month while the deployment date is not known
+DEFAULT_OFF_DAYS_IN_MONTH = 4
+
+schedule_cache = cache_ns('repayment_schedule')
+forecast_cache = cache_ns('repayment_forecast')
+
+
+def get_salary_dates(deployment_date, months=REPAYMENT_MONTHS):
+    """
+    Returns the deployment date followed by the salary date of each of the
+    next months: the day of the month the FDW was deployed, or the last day
+    of months which are shorter.
+    """
+    first_month = np.datetime64(deployment_date, 'M')
+    month_starts = first_month + np.arange(months + 1)
+    days_in_month = (
+        (month_starts + 1).astype('datetime64[D]')
+        - month_starts.astype('datetime64[D]')
+    ).astype(int)
+    return (
+        month_starts.astype('datetime64[D]')
+        + np.minimum(deployment_date.day, days_in_month) - 1
+    )
+
+
+def count_off_days(salary_dates, off_day_of_week):
+    # The off days of the week from the day after each salary date up to
+    # and including the next one
+    weekmask = [int(weekday == off_day_of_week) for weekday in range(7)]
+    return np.busday_count(
+        salary_dates[:-1] + 1,
+        salary_dates[1:] + 1,
+        weekmask=weekmask
+    )
+
+
+def compute_repayment_schedule(salary, loan, monthly_loan_repayment,
+                               off_days, off_day_of_week,
+                               per_off_day_compensation,
+                               deployment_date=None):
+    if deployment_date:
+        salary_dates = get_salary_dates(deployment_date)
+        off_days_in_month = count_off_days(salary_dates, off_day_of_week)
+        salary_dates = [
+            salary_date.strftime('%d/%m/%Y')
+            for salary_date in salary_dates[1:].tolist()
+        ]
+    else:
+        # if work commencement date not set, then generate table without
+        # dates
+        off_days_in_month = np.full(
+            REPAYMENT_MONTHS,
+            DEFAULT_OFF_DAYS_IN_MONTH
+        )
+        salary_dates = [''] * REPAYMENT_MONTHS
+
+    # The same amount is repaid every month until the loan is paid off, so
+    # the amount of each month follows from the number of the month
+    loan_repayment = min(monthly_loan_repayment, salary)
+    repayment_table = {}
+    for i, (salary_date, potential_off_days) in enumerate(
+        zip(salary_dates, off_days_in_month.tolist()),
+        start=1
+    ):
+        balance_off_day_compensation = (
+            per_off_day_compensation * (potential_off_days - off_days)
+        )
+        total_salary = salary + balance_off_day_compensation
+        loan_repaid = max(
+            min(loan_repayment, loan - loan_repayment * (i - 1)),
+            Decimal('0.00')
+        )
+        repayment_table[i] = {
+            'salary_date': salary_date,
+            'basic_salary': salary,
+            'off_day_compensation': balance_off_day_compensation,
+            'total_salary': total_salary,
+            'loan_repaid': loan_repaid,
+            'salary_received': total_salary - loan_repaid,
+        }
+    return repayment_table
+
+
+def get_deployment_date(employer_doc):
+    case_status = getattr(employer_doc, 'rn_casestatus_ed', None)
+    return getattr(case_status, 'fdw_work_commencement_date', None)
+
+
+def get_repayment_schedule(employer_doc):
+    """
+    Returns the salary and loan repayment of each of the first 24 months of
+    the case, memoized per case, version, deployment date and the salary,
+    loan and off day terms it is computed from.
+    """
+    deployment_date = get_deployment_date(employer_doc)
+    terms = [
+        employer_doc.fdw_salary,
+        employer_doc.fdw_loan,
+        employer_doc.fdw_monthly_loan_repayment,
+        employer_doc.fdw_off_days,
+        int(employer_doc.fdw_off_day_of_week)
+    ]
+    key = ':'.join(map(str, [
+        employer_doc.pk,
+        employer_doc.version,
+        deployment_date,
+        *terms
+    ]))
+    return schedule_cache.get_or_set(
+        key,
+        lambda: compute_repayment_schedule(
+            *terms,
+            employer_doc.get_per_off_day_compensation(),
+            deployment_date
+        ),
+        settings.REPAYMENT_SCHEDULE_CACHE_TIMEOUT
+    )
+
+
+def to_cents(amounts):
+    return np.array([int(amount * 100) for amount in amounts], dtype=np.int64)
+
+
+def compute_loan_forecast(cases, start_date, months):
+    """
+    Returns the FDW loans outstanding at the end of each month from the
+    month of start_date, and the amount repaid in it, over all the cases.
+    Cases are (loan, monthly loan repayment, salary, deployment date)
+    tuples. Repayments start the month after deployment, so loans of cases
+    without a deployment date are outstanding in full.
+    """
+    month_starts = np.datetime64(start_date, 'M') + np.arange(months + 1)
+    if not cases:
+        outstanding = np.zeros(months + 1, dtype=np.int64)
+    else:
+        loans, monthly_loan_repayments, salaries, deployment_dates = zip(
+            *cases
+        )
+        loans = to_cents(loans)
+        loan_repayments = np.minimum(
+            to_cents(monthly_loan_repayments),
+            to_cents(salaries)
+        )
+        deployed = np.array([bool(i) for i in deployment_dates])
+        deployment_months = np.array(
+            [i or start_date for i in deployment_dates],
+            dtype='datetime64[M]'
+        )
+
+        # Salary dates never fall after the end of their month, so by the
+        # end of a month one repayment was made for each month since the
+        # deployment month. Row per case, column per month end.
+        repayments_made = np.clip(
+            (month_starts[None, :] - 1 - deployment_months[:, None])
+            .astype(int),
+            0,
+            REPAYMENT_MONTHS
+        ) * deployed[:, None]
+        outstanding = np.maximum(
+            loans[:, None] - loan_repayments[:, None] * repayments_made,
+            0
+        ).sum(axis=0)
+
+    # The first column is the end of the month before start_date
+    repaid = outstanding[:-1] - outstanding[1:]
+    return [
+        {
+            'month': month.item(),
+            'outstanding': Decimal(int(month_outstanding)).scaleb(-2),
+            'repaid': Decimal(int(month_repaid)).scaleb(-2)
+        }
+        for month, month_outstanding, month_repaid in zip(
+            month_starts[:-1],
+            outstanding[1:],
+            repaid
+        )
+    ]
+
+
+def get_live_cases(agency_id=None):
+    queryset = EmployerDoc.objects.exclude(
+        status=CaseStatusChoices.ARCHIVED
+    )
+    if agency_id:
+        queryset = queryset.filter(
+            employer__agency_employee__agency_id=agency_id
+        )
+    return list(
+        queryset.values_list(
+            'fdw_loan',
+            'fdw_monthly_loan_repayment',
+            'fdw_salary',
+            'rn_casestatus_ed__fdw_work_commencement_date'
+        )
+    )
+
+
+def get_loan_forecast(agency_id=None, months=None):
+    # Cached until a case of the agency changes or the day changes
+    months = months or settings.REPAYMENT_FORECAST_MONTHS
+    today = timezone.localdate()
+    key = ':'.join(map(str, [
+        agency_id,
+        cache_ns('employer_doc', agency_id).get_version(),
+        today,
+        months
+    ]))
+    return forecast_cache.get_or_set(
+        key,
+        lambda: compute_loan_forecast(
+            get_live_cases(agency_id),
+            today.replace(day=1),
+            months
+        ),
+        settings.REPAYMENT_SCHEDULE_CACHE_TIMEOUT
+    )
@@ -0,0 +1,64 @@
+from django.db.models.signals import post_delete, post_save
+from django.dispatch import receiver
+from onlinemaid.cache import bump_namespaces
+
+from .models import (CaseSignature, CaseStatus, DocServAgmtEmpCtr,
+                     DocServiceFeeSchedule, DocSafetyAgreement, DocUpload,
+                     Employer, EmployerDoc, EmployerHousehold,
+                     EmployerIncome, EmployerJointApplicant, EmployerSponsor,
+                     MaidInventory)
+from .pdf_cache import invalidate_case_pdfs
+
+
+@receiver(post_save, sender=EmployerDoc)
+@receiver(post_delete, sender=EmployerDoc)
+def employer_doc_cache_namespace_update(sender, instance, **kwargs):
+    agency_id = Employer.objects.filter(
+        pk=instance.employer_id
+    ).values_list(
+        'agency_employee__agency_id',
+        flat=True
+    ).first()
+    bump_namespaces('employer_doc', agency_id)
+
+
+@receiver(post_save, sender=CaseStatus)
+def case_status_cache_namespace_update(sender, instance, **kwargs):
+    # The deployment date starts the FDW's loan repayments
+    agency_id = EmployerDoc.objects.filter(
+        pk=instance.employer_doc_id
+    ).values_list(
+        'employer__agency_employee__agency_id',
+        flat=True
+    ).first()
+    bump_namespaces('employer_doc', agency_id)
+
+
+@receiver(post_save, sender=EmployerDoc)
+def employer_doc_pdf_update(sender, instance, **kwargs):
+    invalidate_case_pdfs(instance.pk)
+
+
+@receiver(post_save, sender=CaseSignature)
+@receiver(post_save, sender=CaseStatus)
+@receiver(post_save, sender=DocServAgmtEmpCtr)
+@receiver(post_save, sender=DocServiceFeeSchedule)
+@receiver(post_save, sender=DocSafetyAgreement)
+@receiver(post_save, sender=DocUpload)
+@receiver(post_save, sender=MaidInventory)
+@receiver(post_delete, sender=MaidInventory)
+def case_pdf_update(sender, instance, **kwargs):
+    invalidate_case_pdfs(instance.employer_doc_id)
+
+
+@receiver(post_save, sender=Employer)
+@receiver(post_save, sender=EmployerHousehold)
+@receiver(post_delete, sender=EmployerHousehold)
+@receiver(post_save, sender=EmployerIncome)
+@receiver(post_save, sender=EmployerJointApplicant)
+@receiver(post_save, sender=EmployerSponsor)
+def employer_pdf_update(sender, instance, **kwargs):
+    employer_id = instance.pk if sender is Employer else instance.employer_id
+    invalidate_case_pdfs(*EmployerDoc.objects.filter(
+        employer_id=employer_id
+    ).values_list('pk', flat=True))
@@ -1,6 +1,7 @@
 from django.urls import include, path
 
-from .views import (CaseStatusAPIView, CaseStatusUpdateView, ChallengeFormView,
+from .views import (CaseBundleAgencyView, CaseBundleEmployerView,
+                    CaseStatusAPIView, CaseStatusUpdateView, ChallengeFormView,
                     DocSafetyAgreementCreateView, DocSafetyAgreementUpdateView,
                     DocServAgmtEmpCtrCreateView, DocServAgmtEmpCtrUpdateView,
                     DocServiceFeeScheduleCreateView,
@@ -18,6 +19,7 @@ from .views import (CaseStatusAPIView, CaseStatusUpdateView, ChallengeFormView,
                     EmployerUpdateView, GenerateRemainingAmountDepositReceipt,
                     HandoverFormView, HtmlToRenderPdfAgencyView,
                     HtmlToRenderPdfEmployerView, MaidInventoryFormView,
+                    PdfRenderJobDownloadView, PdfRenderJobStatusView,
                     SignatureFormView, SignatureUpdateByAgentView,
                     UploadedPdfAgencyView)
 
@@ -295,6 +297,12 @@ urlpatterns = [
                                         ),
                                         name='pdf_agency_deposit_invoice'
                                     ),
+                                    # All documents of the case
+                                    path(
+                                        'bundle/',
+                                        CaseBundleAgencyView.as_view(),
+                                        name='pdf_agency_case_bundle'
+                                    ),
                                 ])
                             ),
                             path(
@@ -416,6 +424,12 @@ urlpatterns = [
                                         ),
                                         name='pdf_employer_deposit_invoice'
                                     ),
+                                    # All documents of the case
+                                    path(
+                                        'bundle/',
+                                        CaseBundleEmployerView.as_view(),
+                                        name='pdf_employer_case_bundle'
+                                    ),
                                 ])
                             )
                         ])
@@ -458,6 +472,21 @@ urlpatterns = [
             ),
         ])
     ),
+    path(
+        'pdf-jobs/<uuid:pk>/',
+        include([
+            path(
+                '',
+                PdfRenderJobStatusView.as_view(),
+                name='pdf_render_job_status'
+            ),
+            path(
+                'download/',
+                PdfRenderJobDownloadView.as_view(),
+                name='pdf_render_job_download'
+            ),
+        ])
+    ),
     path(
         'status/',
         include([
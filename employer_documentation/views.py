@@ -5,11 +5,13 @@ from agency.mixins import GetAuthorityMixin
 from agency.models import Agency
 from django.conf import settings
 from django.contrib import messages
+from django.contrib.auth.mixins import LoginRequiredMixin
 from django.contrib.messages.views import SuccessMessageMixin
 from django.core.exceptions import ObjectDoesNotExist
 from django.db.models.query import QuerySet as QS
 from django.forms.forms import BaseForm
-from django.http import FileResponse, HttpResponseRedirect, JsonResponse
+from django.http import (FileResponse, Http404, HttpResponseRedirect,
+                         JsonResponse)
 from django.http.request import HttpRequest as req
 from django.http.response import HttpResponse as res
 from django.shortcuts import get_object_or_404, redirect
@@ -24,7 +26,7 @@ from onlinemaid.constants import AG_SALES
 from onlinemaid.types import T, _FormT
 
 from .constants import (ERROR_MESSAGES_VERBOSE_NAME_MAP,
-                        monthly_income_label_map)
+                        PdfRenderJobStatusChoices, monthly_income_label_map)
 from .forms import (CaseStatusForm, ChallengeForm, DocSafetyAgreementForm,
                     DocServAgmtEmpCtrForm, DocServiceFeeScheduleForm,
                     DocUploadForm, EmployerDocForm, EmployerForm,
@@ -39,12 +41,15 @@ from .formset import (EmployerHouseholdFormSet, EmployerHouseholdFormSetHelper,
                       MaidInventoryFormSet, MaidInventoryFormSetHelper)
 from .helper_functions import (is_applicant_joint_applicant,
                                is_applicant_sponsor)
-from .mixins import (AgencyAccessToEmployerDocAppMixin, EmployerDocAccessMixin,
-                     OwnerAccessToEmployerDocAppMixin, PdfHtmlViewMixin)
+from .mixins import (AgencyAccessToEmployerDocAppMixin, CaseBundleViewMixin,
+                     EmployerDocAccessMixin, OwnerAccessToEmployerDocAppMixin,
+                     PdfHtmlViewMixin)
 from .models import (CaseSignature, CaseStatus, DocSafetyAgreement,
                      DocServAgmtEmpCtr, DocServiceFeeSchedule, DocUpload,
                      Employer, EmployerDoc, EmployerIncome,
-                     EmployerJointApplicant, EmployerSponsor)
+                     EmployerJointApplicant, EmployerSponsor, PdfRenderJob)
+from .pdf_cache import get_pdf_cache_storage
+from .pdf_jobs import get_pdf_render_job_payload
 
 # Detail Views
 
@@ -1157,20 +1162,6 @@ class HtmlToRenderPdfAgencyView(
     model = EmployerDoc
     pk_url_kwarg = 'level_1_pk'
 
-    def get(self, request: req, *args: str, **kwargs: Any) -> res:
-        self.object = self.get_object()
-        context = self.get_context_data()
-
-        if self.use_repayment_table:
-            context.update({
-                'repayment_table': self.calc_repayment_schedule()
-            })
-
-        context.update({
-            'url_name': request.resolver_match.url_name
-        })
-        return self.generate_pdf_response(request, context)
-
 
 class HtmlToRenderPdfEmployerView(
     EmployerDocAccessMixin,
@@ -1181,20 +1172,6 @@ class HtmlToRenderPdfEmployerView(
     model = EmployerDoc
     pk_url_kwarg = 'level_1_pk'
 
-    def get(self, request: req, *args: str, **kwargs: Any) -> res:
-        self.object = self.get_object()
-        context = self.get_context_data()
-
-        if self.use_repayment_table:
-            context.update({
-                'repayment_table': self.calc_repayment_schedule()
-            })
-
-        context.update({
-            'url_name': request.resolver_match.url_name
-        })
-        return self.generate_pdf_response(request, context)
-
 
 class UploadedPdfAgencyView(
     AgencyAccessToEmployerDocAppMixin,
@@ -1230,6 +1207,60 @@ class UploadedPdfAgencyView(
             )
 
 
+class CaseBundleAgencyView(
+    AgencyAccessToEmployerDocAppMixin,
+    GetAuthorityMixin,
+    CaseBundleViewMixin,
+    DetailView
+):
+    model = EmployerDoc
+    pk_url_kwarg = 'level_1_pk'
+
+
+class CaseBundleEmployerView(
+    EmployerDocAccessMixin,
+    GetAuthorityMixin,
+    CaseBundleViewMixin,
+    DetailView
+):
+    model = EmployerDoc
+    pk_url_kwarg = 'level_1_pk'
+
+
+class PdfRenderJobStatusView(LoginRequiredMixin, View):
+    http_method_names = ['get']
+
+    def get(self, request: req, *args: str, **kwargs: Any) -> res:
+        job = get_object_or_404(
+            PdfRenderJob,
+            pk=self.kwargs.get('pk'),
+            user=request.user
+        )
+        return JsonResponse(get_pdf_render_job_payload(job))
+
+
+class PdfRenderJobDownloadView(LoginRequiredMixin, View):
+    http_method_names = ['get']
+
+    def get(self, request: req, *args: str, **kwargs: Any) -> res:
+        job = get_object_or_404(
+            PdfRenderJob,
+            pk=self.kwargs.get('pk'),
+            user=request.user,
+            status=PdfRenderJobStatusChoices.DONE
+        )
+        storage = get_pdf_cache_storage()
+        # A cached PDF is deleted once a newer version is rendered
+        if not storage.exists(job.path):
+            raise Http404
+        response = FileResponse(
+            storage.open(job.path),
+            content_type='application/pdf'
+        )
+        response['Content-Disposition'] = job.content_disposition
+        return response
+
+
 # Form Views
 
 
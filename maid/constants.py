@@ -113,6 +113,15 @@ class MaidCreatedOnChoices(models.IntegerChoices):
     FIFTEEN_DAYS = 15, _('Last 15 days')
 
 
+MAID_AGE_FACET_BUCKETS = [
+    (21, 25),
+    (26, 30),
+    (31, 35),
+    (36, 40),
+    (41, 50)
+]
+
+
 class MaidLoanDescriptionChoices(models.TextChoices):
     INITIAL_LOAN = 'IML', _('Initial Maid Loan')
     TRANSFER_FEE = 'ATF', _('Add Transfer Fee')
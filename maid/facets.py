@@ -0,0 +1,184 @@
+import hashlib
+import json
+from datetime import timedelta
+
+from django.conf import settings
+from django.db.models import Count, Q
+from django.utils import timezone
+from onlinemaid.cache import cache_ns
+from onlinemaid.constants import MaritalStatusChoices
+from onlinemaid.search import get_search_filter, is_postgres
+
+from .constants import (MAID_AGE_FACET_BUCKETS, MaidCountryOfOrigin,
+                        MaidCreatedOnChoices, MaidLanguageChoices,
+                        MaidResponsibilityChoices, MaidStatusChoices,
+                        TypeOfMaidChoices)
+from .helper_functions import get_bitmask, get_date_of_birth_range
+from .models import MaidSearchIndex
+
+facet_cache = cache_ns('maid_facets')
+
+
+def invalidate_maid_facets():
+    facet_cache.bump()
+
+
+def get_facet_params(data):
+    # Normalises the cleaned data of a MaidFilter form so that equivalent
+    # searches share a cache entry
+    params = {}
+    if data.get('name'):
+        params['name'] = data['name'].strip().lower()
+    for key in [
+        'country_of_origin',
+        'maid_type',
+        'marital_status',
+        'created_on',
+        'agency'
+    ]:
+        value = data.get(key)
+        if value:
+            params[key] = str(getattr(value, 'pk', value))
+    if data.get('languages'):
+        params['languages'] = get_bitmask(
+            MaidLanguageChoices,
+            [i.language for i in data['languages']]
+        )
+    if data.get('responsibilities'):
+        params['responsibilities'] = get_bitmask(
+            MaidResponsibilityChoices,
+            [i.name for i in data['responsibilities']]
+        )
+    age = data.get('age')
+    if age and age.start is not None and age.stop is not None:
+        params['age'] = [int(age.start), int(age.stop)]
+    return params
+
+
+def get_facet_filters(params):
+    time_now = timezone.now()
+    filters = {}
+    for key in ['country_of_origin', 'maid_type', 'marital_status']:
+        if key in params:
+            filters[key] = Q(**{key: params[key]})
+    if 'agency' in params:
+        filters['agency'] = Q(agency_id=params['agency'])
+    if 'languages' in params:
+        filters['languages'] = Q(language_mask__bitany=params['languages'])
+    if 'responsibilities' in params:
+        filters['responsibilities'] = Q(
+            responsibility_mask__bitany=params['responsibilities']
+        )
+    if 'age' in params:
+        filters['age'] = Q(
+            date_of_birth__range=get_date_of_birth_range(*params['age'])
+        )
+    if 'created_on' in params:
+        days = int(params['created_on'])
+        filters['created_on'] = Q(
+            created_on__gt=time_now - timedelta(days=days)
+        )
+    return filters
+
+
+def get_facet_aggregates(filters):
+    """
+    Builds one conditional count per facet value. Each facet is counted
+    with every active filter except its own, so the counts show how many
+    maids picking that value instead would return.
+    """
+    def others(facet):
+        q = Q()
+        for key, value in filters.items():
+            if key != facet:
+                q &= value
+        return q
+
+    time_now = timezone.now()
+    aggregates = {}
+    for value in MaidCountryOfOrigin.values:
+        aggregates[f'country_of_origin__{value}'] = Q(country_of_origin=value)
+    for value in TypeOfMaidChoices.values:
+        aggregates[f'maid_type__{value}'] = Q(maid_type=value)
+    for value in MaritalStatusChoices.values:
+        aggregates[f'marital_status__{value}'] = Q(marital_status=value)
+    for value in MaidLanguageChoices.values:
+        aggregates[f'languages__{value}'] = Q(
+            language_mask__bitany=get_bitmask(MaidLanguageChoices, [value])
+        )
+    for value in MaidResponsibilityChoices.values:
+        aggregates[f'responsibilities__{value}'] = Q(
+            responsibility_mask__bitany=get_bitmask(
+                MaidResponsibilityChoices,
+                [value]
+            )
+        )
+    for min_age, max_age in MAID_AGE_FACET_BUCKETS:
+        aggregates[f'age__{min_age}-{max_age}'] = Q(
+            date_of_birth__range=get_date_of_birth_range(min_age, max_age)
+        )
+    for value in MaidCreatedOnChoices.values:
+        aggregates[f'created_on__{value}'] = Q(
+            created_on__gt=time_now - timedelta(days=value)
+        )
+
+    return {
+        key: Count('pk', filter=q & others(key.split('__', 1)[0]))
+        for key, q in aggregates.items()
+    }
+
+
+def compute_maid_facets(params):
+    queryset = MaidSearchIndex.objects.filter(
+        status=MaidStatusChoices.PUBLISHED
+    )
+    if 'name' in params:
+        if is_postgres():
+            queryset = queryset.filter(
+                get_search_filter(params['name'], 'search_vector', 'name')
+            )
+        else:
+            queryset = queryset.filter(name__icontains=params['name'])
+
+    counts = queryset.aggregate(
+        **get_facet_aggregates(get_facet_filters(params))
+    )
+    facets = {}
+    for key, count in counts.items():
+        facet, value = key.split('__', 1)
+        facets.setdefault(facet, {})[value] = count
+    return facets
+
+
+def get_maid_facets(data):
+    params = get_facet_params(data)
+    digest = hashlib.md5(
+        json.dumps(params, sort_keys=True).encode()
+    ).hexdigest()
+    facets = facet_cache.get(digest)
+    if facets is None:
+        facets = compute_maid_facets(params)
+        facet_cache.set(digest, facets, settings.MAID_FACET_CACHE_TIMEOUT)
+    return facets
+
+
+def apply_facet_labels(form, facets):
+    # Appends the facet counts to the choice labels of the filter form
+    for name in [
+        'country_of_origin',
+        'maid_type',
+        'marital_status',
+        'created_on'
+    ]:
+        field = form.fields[name]
+        field.choices = [
+            (value, f'{label} ({facets[name].get(str(value), 0)})')
+            if value != '' else (value, label)
+            for value, label in field.choices
+        ]
+    form.fields['languages'].label_from_instance = lambda obj: (
+        f'{obj} ({facets["languages"].get(obj.language, 0)})'
+    )
+    form.fields['responsibilities'].label_from_instance = lambda obj: (
+        f'{obj} ({facets["responsibilities"].get(obj.name, 0)})'
+    )
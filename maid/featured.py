@@ -0,0 +1,71 @@
+import random
+
+from django.conf import settings
+from onlinemaid.cache import cache_ns
+
+from .constants import MaidCountryOfOrigin, MaidStatusChoices
+from .models import Maid
+
+FEED_ALL_NATIONALITIES = 'ANY'
+
+feed_cache = cache_ns('featured_maid_feed')
+
+
+def get_maid_card_payload(maid):
+    return {
+        'pk': maid.pk,
+        'photo_url': maid.get_photo_url(),
+        'name': maid.name,
+        'country_of_origin': maid.get_country_of_origin_display(),
+        'age': maid.age,
+        'marital_status': maid.get_marital_status_display(),
+        'type': maid.get_maid_type_display()
+    }
+
+
+def build_featured_feed(nationality):
+    featured_maids = Maid.objects.filter(
+        status=MaidStatusChoices.FEATURED
+    ).only(
+        'pk',
+        'photo',
+        'photo_variants',
+        'name',
+        'country_of_origin',
+        'date_of_birth',
+        'marital_status',
+        'maid_type'
+    )
+    if nationality != FEED_ALL_NATIONALITIES:
+        featured_maids = featured_maids.filter(
+            country_of_origin=nationality
+        )
+    return [get_maid_card_payload(maid) for maid in featured_maids]
+
+
+def get_featured_feed(nationality):
+    feed = feed_cache.get(nationality)
+    if feed is None:
+        feed = build_featured_feed(nationality)
+        feed_cache.set(
+            nationality,
+            feed,
+            settings.FEATURED_MAID_FEED_TIMEOUT
+        )
+    return feed
+
+
+def get_featured_sample(nationality, size=None):
+    # A fresh random selection of the cached feed on every call
+    if nationality not in [
+        FEED_ALL_NATIONALITIES,
+        *MaidCountryOfOrigin.values
+    ]:
+        return []
+    size = size or settings.FEATURED_MAID_FEED_SIZE
+    feed = get_featured_feed(nationality)
+    return random.sample(feed, min(size, len(feed)))
+
+
+def invalidate_featured_feed():
+    feed_cache.bump()
@@ -8,9 +8,12 @@ from django_filters import (CharFilter, ChoiceFilter, FilterSet,
                             ModelChoiceFilter, ModelMultipleChoiceFilter,
                             RangeFilter)
 from onlinemaid.constants import MaritalStatusChoices
+from onlinemaid.search import is_postgres, ranked_search
 
 from .constants import (MaidCountryOfOrigin, MaidCreatedOnChoices,
+                        MaidLanguageChoices, MaidResponsibilityChoices,
                         TypeOfMaidChoices)
+from .helper_functions import get_bitmask, get_date_of_birth_range
 from .models import Maid, MaidLanguage, MaidResponsibility
 from .widgets import CustomRangeWidget
 
@@ -42,37 +45,38 @@ class MiniMaidFilter(FilterSet):
 
 
 class MaidFilter(FilterSet):
+    # Every filter reads from the denormalised MaidSearchIndex row so that a
+    # search is a single indexed scan instead of joins through the M2Ms
     def filter_age_between(self, queryset, name, value):
         # gt and min value and lt max value
         print(value)
         return queryset
 
     name = CharFilter(
-        field_name='name',
-        lookup_expr='icontains',
-        label=_('Search by Maid Name')
+        label=_('Search by Maid Name'),
+        method='name_filter'
     )
     languages = ModelMultipleChoiceFilter(
-        field_name='languages',
-        lookup_expr='exact',
         queryset=MaidLanguage.objects.all(),
         widget=forms.CheckboxSelectMultiple(),
-        label=_('Language Spoken')
+        label=_('Language Spoken'),
+        method='languages_filter'
     )
     country_of_origin = ChoiceFilter(
-        field_name='country_of_origin',
+        field_name='search_index__country_of_origin',
         lookup_expr='exact',
         label=_('Country of Origin'),
         choices=MaidCountryOfOrigin.choices,
         empty_label=_('No Preference')
     )
     maid_type = ChoiceFilter(
+        field_name='search_index__maid_type',
         label=_('Type of Maid'),
         choices=TypeOfMaidChoices.choices,
         empty_label=_('No Preference')
     )
     marital_status = ChoiceFilter(
-        field_name='marital_status',
+        field_name='search_index__marital_status',
         lookup_expr='exact',
         label=_('Marital Status'),
         choices=MaritalStatusChoices.choices,
@@ -81,7 +85,8 @@ class MaidFilter(FilterSet):
     responsibilities = ModelMultipleChoiceFilter(
         queryset=MaidResponsibility.objects.all(),
         widget=forms.CheckboxSelectMultiple(),
-        label=_('Maid Responsibilites')
+        label=_('Maid Responsibilites'),
+        method='responsibilities_filter'
     )
     age = RangeFilter(
         label=_('Age'),
@@ -100,6 +105,7 @@ class MaidFilter(FilterSet):
         method='created_on_filter'
     )
     agency = ModelChoiceFilter(
+        field_name='search_index__agency',
         label=_('Agency'),
         queryset=Agency.objects.all(),
         empty_label=_('No Preference')
@@ -118,18 +124,43 @@ class MaidFilter(FilterSet):
             'created_on'
         ]
 
+    def name_filter(self, queryset, name, value):
+        if not value:
+            return queryset
+        if is_postgres():
+            return ranked_search(
+                queryset,
+                value,
+                'search_index__search_vector',
+                'search_index__name'
+            )
+        return queryset.filter(search_index__name__icontains=value)
+
+    def languages_filter(self, queryset, name, value):
+        if value:
+            queryset = queryset.filter(
+                search_index__language_mask__bitany=get_bitmask(
+                    MaidLanguageChoices,
+                    [i.language for i in value]
+                )
+            )
+        return queryset
+
+    def responsibilities_filter(self, queryset, name, value):
+        if value:
+            queryset = queryset.filter(
+                search_index__responsibility_mask__bitany=get_bitmask(
+                    MaidResponsibilityChoices,
+                    [i.name for i in value]
+                )
+            )
+        return queryset
+
     def custom_age_filter(self, queryset, name, value):
-        time_now = timezone.now()
-        start_date = time_now - timedelta(
-            365 * int(value.stop + 1) + int(value.stop // 4)
-        )
-        end_date = time_now - timedelta(
-            365 * int(value.start) + int(value.start // 4)
-        )
         return queryset.filter(
-            date_of_birth__range=(
-                start_date,
-                end_date
+            search_index__date_of_birth__range=get_date_of_birth_range(
+                value.start,
+                value.stop
             )
         )
 
@@ -137,6 +168,8 @@ class MaidFilter(FilterSet):
         if value:
             time_now = timezone.now()
             queryset = queryset.filter(
-                created_on__gt=time_now - timedelta(days=int(value))
+                search_index__created_on__gt=time_now - timedelta(
+                    days=int(value)
+                )
             )
         return queryset
@@ -27,6 +27,7 @@ from .models import (Maid, MaidCooking, MaidDietaryRestriction,
                      MaidFoodHandlingPreference, MaidGeneralHousework,
                      MaidInfantChildCare, MaidLanguageProficiency,
                      MaidLoanTransaction)
+from .responsibilities import apply_main_responsibility
 # from .widgets import CustomDateInput
 
 
@@ -1218,6 +1219,14 @@ class MaidExperienceForm(forms.Form):
             }
         )
 
+        apply_main_responsibility(maid, {
+            'infant_child_care': cfi_assessment,
+            'elderly_care': cfe_assessment,
+            'disabled_care': cfd_assessment,
+            'general_housework': geh_assessment,
+            'cooking': cok_assessment
+        })
+
         return maid
 
 
@@ -1282,3 +1291,72 @@ class MaidAboutFDWForm(forms.Form):
         maid.about_me = about_me
         maid.save()
         return maid
+
+
+class MaidImportRowForm(MaidForm):
+    # Validates a single row of a bulk biodata import. Photos are uploaded
+    # afterwards, so imported maids always start unpublished.
+    class Meta(MaidForm.Meta):
+        exclude = MaidForm.Meta.exclude + ['photo', 'status', 'fdw_account']
+
+    def clean_reference_number(self):
+        # Duplicates are checked for the whole file at once by the importer
+        return self.cleaned_data.get('reference_number')
+
+    def clean_passport_number(self):
+        cleaned_field = self.cleaned_data.get('passport_number')
+        if is_not_null(cleaned_field):
+            validate_passport("FDW", cleaned_field)
+        return cleaned_field
+
+    def clean_fin_number(self):
+        cleaned_field = self.cleaned_data.get('fin_number')
+        if cleaned_field:
+            validate_fin('FDW', cleaned_field)
+        return cleaned_field
+
+    def clean(self) -> Dict[str, Any]:
+        cleaned_data = super().clean()
+        # The plaintext is kept off the instance and encrypted together with
+        # the rest of the batch
+        self.plaintext = {
+            'passport_number': cleaned_data.pop('passport_number', None),
+            'fin_number': cleaned_data.pop('fin_number', None)
+        }
+        return cleaned_data
+
+
+class MaidImportForm(forms.Form):
+    file = forms.FileField(
+        label=_('Biodata file (CSV or JSON)')
+    )
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.helper = FormHelper()
+        self.helper.layout = Layout(
+            Row(
+                Column(
+                    'file',
+                    css_class='form-group col-24'
+                ),
+                Column(
+                    Submit(
+                        'submit',
+                        'Import',
+                        css_class="btn btn-xs-lg btn-primary w-xs-40 w-25 mx-2"
+                    ),
+                    css_class='form-group col-24 text-center'
+                ),
+                css_class='form-row'
+            )
+        )
+
+    def clean_file(self):
+        uploaded_file = self.cleaned_data.get('file')
+        extension = uploaded_file.name.rsplit('.', 1)[-1].lower()
+        if extension not in ['csv', 'json']:
+            raise ValidationError(_('Only CSV and JSON files can be imported'))
+        if uploaded_file.size > settings.MAID_IMPORT_MAX_FILE_SIZE:
+            raise ValidationError(_('File too large'))
+        return uploaded_file
@@ -0,0 +1,76 @@
+from django.conf import settings
+from django.core.cache import cache
+from django.db.models import prefetch_related_objects
+from django.template.loader import render_to_string
+from django.utils import timezone
+from onlinemaid.cache import bump_namespaces
+
+from .models import Maid
+
+CARD_TEMPLATE = 'components/maid-card-fragment.html'
+
+# Everything read by the maid card and its popover
+CARD_RELATED_LOOKUPS = [
+    'language_proficiency',
+    'employment_history'
+]
+
+
+def get_card_cache_key(maid):
+    # updated_on is bumped whenever the maid or a row shown on the card
+    # changes. The date is part of the key because the card shows the age.
+    return 'maid_card:{}:{}:{}'.format(
+        maid.pk,
+        maid.updated_on.timestamp(),
+        timezone.now().date().isoformat()
+    )
+
+
+def render_maid_card(maid):
+    return render_to_string(CARD_TEMPLATE, {'maid': maid})
+
+
+def get_maid_card(maid):
+    if hasattr(maid, '_card_html'):
+        return maid._card_html
+    key = get_card_cache_key(maid)
+    html = cache.get(key)
+    if html is None:
+        html = render_maid_card(maid)
+        cache.set(key, html, settings.MAID_CARD_CACHE_TIMEOUT)
+    maid._card_html = html
+    return html
+
+
+def attach_maid_cards(maids):
+    """
+    Reads the cached cards of a page of maids with a single get_many and
+    renders only the missing ones, loading their related rows in bulk.
+    """
+    maids = list(maids)
+    keys = {maid.pk: get_card_cache_key(maid) for maid in maids}
+    cached = cache.get_many(keys.values())
+
+    misses = [maid for maid in maids if keys[maid.pk] not in cached]
+    if misses:
+        prefetch_related_objects(misses, *CARD_RELATED_LOOKUPS)
+        rendered = {keys[maid.pk]: render_maid_card(maid) for maid in misses}
+        cache.set_many(rendered, settings.MAID_CARD_CACHE_TIMEOUT)
+        cached.update(rendered)
+
+    for maid in maids:
+        maid._card_html = cached[keys[maid.pk]]
+    return maids
+
+
+def touch_maid(maid_id):
+    # Bumps updated_on without running the maid save signals, so the caches
+    # holding the maid's card are bumped here
+    Maid.objects.filter(pk=maid_id).update(updated_on=timezone.now())
+    bump_namespaces(
+        'maid',
+        Maid.objects.filter(pk=maid_id).values_list(
+            'agency_id',
+            flat=True
+        ).first()
+    )
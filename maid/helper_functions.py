@@ -1,3 +1,7 @@
+from datetime import timedelta
+
+from django.utils import timezone
+
 from .constants import MaidLanguageProficiencyChoices, TypeOfMaidChoices
 
 
@@ -11,3 +15,26 @@ def is_able_to_speak(LanguageProficiency):
 
 def is_not_able_to_speak(LanguageProficiency):
     return not is_able_to_speak(LanguageProficiency)
+
+
+def get_bitmask(choices, values):
+    # Bit positions follow the declaration order of the choices class, so
+    # appending new choices keeps existing masks valid
+    positions = {value: i for i, value in enumerate(choices.values)}
+    mask = 0
+    for value in values:
+        if value in positions:
+            mask |= 1 << positions[value]
+    return mask
+
+
+def get_date_of_birth_range(min_age, max_age):
+    # Earliest and latest dates of birth of maids aged min_age to max_age
+    today = timezone.now().date()
+    start_date = today - timedelta(
+        365 * int(max_age + 1) + int(max_age // 4)
+    )
+    end_date = today - timedelta(
+        365 * int(min_age) + int(min_age // 4)
+    )
+    return start_date, end_date
@@ -0,0 +1,231 @@
+import csv
+import io
+import json
+
+from agency.counters import apply_counter_deltas
+from agency.models import Agency
+from django.conf import settings
+from django.core.exceptions import FieldDoesNotExist
+from django.db import transaction
+from django.forms import modelform_factory
+from onlinemaid.cache import bump_namespaces
+from onlinemaid.helper_functions import encrypt_strings
+from onlinemaid.registry import maid_languages, maid_responsibilities
+
+from .forms import MaidImportRowForm
+from .models import (Maid, MaidCooking, MaidDisabledCare, MaidElderlyCare,
+                     MaidGeneralHousework, MaidInfantChildCare,
+                     MaidLanguageProficiency)
+from .responsibilities import (CARE_RESPONSIBILITY_MAP,
+                               derive_main_responsibility)
+
+# Columns of the related rows are prefixed with the relation name, e.g.
+# cooking-assessment or language_proficiency-english
+RELATED_MODELS = {
+    'language_proficiency': MaidLanguageProficiency,
+    'infant_child_care': MaidInfantChildCare,
+    'elderly_care': MaidElderlyCare,
+    'disabled_care': MaidDisabledCare,
+    'general_housework': MaidGeneralHousework,
+    'cooking': MaidCooking
+}
+
+ENCRYPTED_FIELDS = ['passport_number', 'fin_number']
+
+
+def get_related_form_class(model):
+    form_class = modelform_factory(model, exclude=['maid'])
+    for name, field in form_class.base_fields.items():
+        if model._meta.get_field(name).null:
+            field.required = False
+    return form_class
+
+
+def get_form_data(form_class, row, prefix=None):
+    # Columns which are missing or empty fall back to the model default
+    model = form_class._meta.model
+    data = {}
+    for name in form_class.base_fields:
+        key = f'{prefix}-{name}' if prefix else name
+        value = row.get(key)
+        if value is not None and value != '':
+            data[key] = value
+            continue
+        try:
+            field = model._meta.get_field(name)
+        except FieldDoesNotExist:
+            continue
+        if field.has_default():
+            data[key] = field.get_default()
+    return data
+
+
+def read_rows(uploaded_file, file_format):
+    content = uploaded_file.read()
+    if isinstance(content, bytes):
+        content = content.decode('utf-8-sig')
+    if file_format == 'json':
+        rows = json.loads(content)
+        if not isinstance(rows, list):
+            raise ValueError('The JSON file must contain a list of maids')
+        return [
+            {k: '' if v is None else str(v) for k, v in row.items()}
+            for row in rows
+        ]
+    return list(csv.DictReader(io.StringIO(content)))
+
+
+class MaidImporter:
+    """
+    Imports maid biodata for an agency. Rows are validated with the same
+    form validators as the dashboard, then each chunk is encrypted and
+    written with bulk_create inside its own transaction. The maid save
+    signals are bypassed, so the agency's biodata count is incremented once
+    per chunk instead of after every maid.
+    """
+
+    def __init__(self, agency_id, batch_size=None, progress=None):
+        self.agency = Agency.objects.get(pk=agency_id)
+        self.batch_size = batch_size or settings.MAID_IMPORT_BATCH_SIZE
+        self.progress = progress
+        self.form_classes = {
+            prefix: get_related_form_class(model)
+            for prefix, model in RELATED_MODELS.items()
+        }
+        self.reference_numbers = set(
+            Maid.objects.filter(
+                agency=self.agency
+            ).values_list('reference_number', flat=True)
+        )
+
+    def validate_row(self, row):
+        maid_form = MaidImportRowForm(
+            data=get_form_data(MaidImportRowForm, row),
+            agency_id=self.agency.pk,
+            form_type='create'
+        )
+        related_forms = {
+            prefix: form_class(
+                data=get_form_data(form_class, row, prefix),
+                prefix=prefix
+            )
+            for prefix, form_class in self.form_classes.items()
+        }
+
+        errors = {}
+        if not maid_form.is_valid():
+            errors.update(maid_form.errors.get_json_data())
+        for prefix, form in related_forms.items():
+            if not form.is_valid():
+                for field, messages in form.errors.get_json_data().items():
+                    errors[f'{prefix}-{field}'] = messages
+
+        reference_number = row.get('reference_number')
+        if reference_number and reference_number in self.reference_numbers:
+            errors.setdefault('reference_number', []).append({
+                'message': 'A maid with this reference number already exists',
+                'code': 'unique'
+            })
+
+        if errors:
+            return None, errors
+        self.reference_numbers.add(reference_number)
+        return (maid_form, related_forms), None
+
+    def encrypt(self, maid_forms):
+        for field in ENCRYPTED_FIELDS:
+            forms = [i for i in maid_forms if i.plaintext[field]]
+            encrypted = encrypt_strings(
+                [i.plaintext[field] for i in forms],
+                settings.ENCRYPTION_KEY
+            )
+            for form, (ciphertext, nonce, tag) in zip(forms, encrypted):
+                setattr(form.instance, field, ciphertext)
+                setattr(form.instance, f'{field}_nonce', nonce)
+                setattr(form.instance, f'{field}_tag', tag)
+
+    def create(self, valid_rows):
+        maid_forms = [maid_form for maid_form, _ in valid_rows]
+        self.encrypt(maid_forms)
+
+        maids = []
+        for maid_form in maid_forms:
+            maid_form.instance.agency = self.agency
+            maids.append(maid_form.instance)
+        Maid.objects.bulk_create(maids)
+        if maids and maids[0].pk is None:
+            # Backends which cannot return the new primary keys from a bulk
+            # insert, reference numbers are unique within the agency
+            pks = dict(
+                Maid.objects.filter(
+                    agency=self.agency,
+                    reference_number__in=[i.reference_number for i in maids]
+                ).values_list('reference_number', 'pk')
+            )
+            for maid in maids:
+                maid.pk = pks[maid.reference_number]
+
+        for prefix, model in RELATED_MODELS.items():
+            instances = []
+            for maid, (_, related_forms) in zip(maids, valid_rows):
+                instance = related_forms[prefix].instance
+                instance.maid = maid
+                instances.append(instance)
+            model.objects.bulk_create(instances)
+
+        languages = []
+        responsibilities = []
+        for maid, (_, related_forms) in zip(maids, valid_rows):
+            for code in maid.get_language_choices():
+                languages.append(
+                    Maid.languages.through(
+                        maid=maid,
+                        maidlanguage_id=maid_languages.pk(code)
+                    )
+                )
+            main = derive_main_responsibility({
+                relation: related_forms[relation].instance.assessment
+                for relation in CARE_RESPONSIBILITY_MAP
+            })
+            if main:
+                responsibilities.append(
+                    Maid.responsibilities.through(
+                        maid=maid,
+                        maidresponsibility_id=maid_responsibilities.pk(main)
+                    )
+                )
+        Maid.languages.through.objects.bulk_create(languages)
+        Maid.responsibilities.through.objects.bulk_create(responsibilities)
+        apply_counter_deltas(self.agency.pk, amount_of_biodata=len(maids))
+        bump_namespaces('maid', self.agency.pk)
+        return len(maids)
+
+    def run(self, rows):
+        report = {
+            'total': len(rows),
+            'created': 0,
+            'errors': []
+        }
+        for start in range(0, len(rows), self.batch_size):
+            valid_rows = []
+            for number, row in enumerate(
+                rows[start:start + self.batch_size],
+                start=start + 1
+            ):
+                valid_row, errors = self.validate_row(row)
+                if errors:
+                    report['errors'].append({
+                        'row': number,
+                        'reference_number': row.get('reference_number'),
+                        'errors': errors
+                    })
+                else:
+                    valid_rows.append(valid_row)
+
+            if valid_rows:
+                with transaction.atomic():
+                    report['created'] += self.create(valid_rows)
+            if self.progress:
+                self.progress(min(start + self.batch_size, len(rows)), report)
+
+        return report
@@ -0,0 +1,20 @@
+from django.core.management.base import BaseCommand
+
+from maid.recommendations import build_recommendations
+
+
+class Command(BaseCommand):
+    help = 'Precomputes the similar maid recommendations of published maids'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--neighbours',
+            type=int,
+            help='Number of similar maids stored for every maid'
+        )
+
+    def handle(self, *args, **options):
+        count = build_recommendations(k=options['neighbours'])
+        self.stdout.write(
+            self.style.SUCCESS(f'Stored {count} maid similarities')
+        )
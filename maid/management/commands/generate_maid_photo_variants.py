@@ -0,0 +1,71 @@
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+from django.core.management.base import BaseCommand
+from django.db import close_old_connections
+
+from maid.featured import invalidate_featured_feed
+from maid.models import Maid
+from maid.photos import generate_photo_variants
+
+
+def process_maid(maid):
+    try:
+        generate_photo_variants(maid)
+    finally:
+        close_old_connections()
+
+
+class Command(BaseCommand):
+    help = 'Generates the resized photo variants of existing maids'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--agency',
+            type=int,
+            help='Only process the maids belonging to this agency'
+        )
+        parser.add_argument(
+            '--workers',
+            type=int,
+            default=4
+        )
+        parser.add_argument(
+            '--force',
+            action='store_true',
+            help='Regenerate variants which already exist'
+        )
+
+    def handle(self, *args, **options):
+        queryset = Maid.objects.exclude(
+            photo=''
+        ).exclude(
+            photo__isnull=True
+        ).only('pk', 'photo', 'photo_variants')
+        if options['agency']:
+            queryset = queryset.filter(agency__pk=options['agency'])
+        if not options['force']:
+            queryset = queryset.filter(photo_variants={})
+
+        processed = failed = 0
+        with ThreadPoolExecutor(max_workers=options['workers']) as executor:
+            futures = {
+                executor.submit(process_maid, maid): maid
+                for maid in queryset.iterator()
+            }
+            for future in as_completed(futures):
+                try:
+                    future.result()
+                except OSError as e:
+                    failed += 1
+                    self.stderr.write(
+                        f'Maid {futures[future].pk}: {e}'
+                    )
+                else:
+                    processed += 1
+
+        invalidate_featured_feed()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Processed {processed} photos, {failed} failed'
+            )
+        )
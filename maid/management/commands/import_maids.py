@@ -0,0 +1,73 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+
+from agency.models import Agency
+from maid.importer import MaidImporter, read_rows
+
+
+class Command(BaseCommand):
+    help = 'Imports maid biodata for an agency from a CSV or JSON file'
+
+    def add_arguments(self, parser):
+        parser.add_argument('path')
+        parser.add_argument(
+            '--agency',
+            type=int,
+            required=True
+        )
+        parser.add_argument(
+            '--format',
+            choices=['csv', 'json'],
+            help='Defaults to the file extension'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int
+        )
+        parser.add_argument(
+            '--report',
+            help='Write the full error report to this JSON file'
+        )
+
+    def handle(self, *args, **options):
+        path = options['path']
+        file_format = options['format'] or path.rsplit('.', 1)[-1].lower()
+        if file_format not in ['csv', 'json']:
+            raise CommandError('Unknown file format, use --format')
+        with open(path, 'rb') as f:
+            try:
+                rows = read_rows(f, file_format)
+            except ValueError as e:
+                raise CommandError(f'Could not read {path}: {e}')
+
+        def progress(done, report):
+            self.stdout.write(
+                f'{done}/{report["total"]} rows, {report["created"]} '
+                f'created, {len(report["errors"])} errors'
+            )
+
+        try:
+            importer = MaidImporter(
+                options['agency'],
+                batch_size=options['batch_size'],
+                progress=progress
+            )
+        except Agency.DoesNotExist:
+            raise CommandError(f'Agency {options["agency"]} does not exist')
+        report = importer.run(rows)
+
+        for error in report['errors']:
+            for field, messages in error['errors'].items():
+                self.stderr.write(
+                    f'Row {error["row"]} {field}: '
+                    + ' '.join(i['message'] for i in messages)
+                )
+        if options['report']:
+            with open(options['report'], 'w') as f:
+                json.dump(report, f, indent=2)
+        self.stdout.write(
+            self.style.SUCCESS(
+                f'Imported {report["created"]} of {report["total"]} maids'
+            )
+        )
@@ -0,0 +1,33 @@
+from django.core.management.base import BaseCommand
+
+from maid.facets import invalidate_maid_facets
+from maid.models import Maid, MaidSearchIndex
+
+
+class Command(BaseCommand):
+    help = 'Rebuilds the denormalised maid search index'
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            '--agency',
+            type=int,
+            help='Only rebuild the rows of maids belonging to this agency'
+        )
+        parser.add_argument(
+            '--batch-size',
+            type=int,
+            default=500
+        )
+
+    def handle(self, *args, **options):
+        queryset = Maid.objects.all()
+        if options['agency']:
+            queryset = queryset.filter(agency__pk=options['agency'])
+        count = MaidSearchIndex.objects.rebuild(
+            queryset=queryset,
+            batch_size=options['batch_size']
+        )
+        invalidate_maid_facets()
+        self.stdout.write(
+            self.style.SUCCESS(f'Indexed {count} maids')
+        )
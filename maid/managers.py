@@ -0,0 +1,119 @@
+from django.db import models, transaction
+from onlinemaid.search import get_search_vector, is_postgres
+
+from .constants import (MaidLanguageChoices, MaidResponsibilityChoices,
+                        MaidStatusChoices)
+from .helper_functions import get_bitmask
+
+INDEXED_STATUSES = [
+    MaidStatusChoices.PUBLISHED,
+    MaidStatusChoices.FEATURED
+]
+
+
+class MaidQuerySet(models.QuerySet):
+    def with_card_data(self):
+        # Everything read by the maid card and its popover
+        return self.select_related(
+            'language_proficiency'
+        ).prefetch_related(
+            'responsibilities',
+            'employment_history'
+        )
+
+    def with_detail_data(self):
+        # Everything read by the maid detail page, biodata PDF and API
+        return self.select_related(
+            'agency',
+            'language_proficiency',
+            'infant_child_care',
+            'elderly_care',
+            'disabled_care',
+            'general_housework',
+            'cooking'
+        ).prefetch_related(
+            'languages',
+            'responsibilities',
+            'employment_history',
+            'food_handling_preferences',
+            'dietary_restrictions',
+            'loan_transactions'
+        )
+
+
+class MaidSearchIndexManager(models.Manager):
+    """
+    Keeps the denormalised maid search rows in step with the live maid
+    tables. Only published and featured maids have a row.
+    """
+
+    def get_row_values(self, maid):
+        return {
+            'agency_id': maid.agency_id,
+            # Stored in lower case for the trigram search, see ranked_search
+            'name': maid.name.lower() if maid.name else maid.name,
+            'status': maid.status,
+            'country_of_origin': maid.country_of_origin,
+            'maid_type': maid.maid_type,
+            'marital_status': maid.marital_status,
+            'date_of_birth': maid.date_of_birth,
+            'language_mask': get_bitmask(
+                MaidLanguageChoices,
+                [i.language for i in maid.languages.all()]
+            ),
+            'responsibility_mask': get_bitmask(
+                MaidResponsibilityChoices,
+                [i.name for i in maid.responsibilities.all()]
+            ),
+            'created_on': maid.created_on
+        }
+
+    def sync(self, maid):
+        # Returns whether the row was added, removed or changed, as search
+        # results and facet counts stay the same otherwise
+        if maid.status not in INDEXED_STATUSES:
+            deleted, _ = self.filter(maid=maid).delete()
+            return bool(deleted)
+
+        values = self.get_row_values(maid)
+        if self.filter(maid=maid).values(*values).first() == values:
+            return False
+        self.update_or_create(maid=maid, defaults=values)
+        self.update_search_vectors(self.filter(maid=maid))
+        return True
+
+    def rebuild(self, queryset=None, batch_size=500):
+        maid_model = self.model._meta.get_field('maid').related_model
+        if queryset is None:
+            queryset = maid_model.objects.all()
+
+        # Prefetching is ignored by iterator() on this Django version, so the
+        # maids are walked in primary key ordered batches instead
+        maids = queryset.filter(
+            status__in=INDEXED_STATUSES
+        ).prefetch_related(
+            'languages',
+            'responsibilities'
+        ).order_by('pk')
+        rows = []
+        last_pk = None
+        while True:
+            batch = maids if last_pk is None else maids.filter(pk__gt=last_pk)
+            batch = list(batch[:batch_size])
+            if not batch:
+                break
+            rows += [
+                self.model(maid_id=maid.pk, **self.get_row_values(maid))
+                for maid in batch
+            ]
+            last_pk = batch[-1].pk
+
+        with transaction.atomic():
+            self.filter(maid__in=queryset).delete()
+            self.bulk_create(rows, batch_size=batch_size)
+            self.update_search_vectors(self.filter(maid__in=queryset))
+        return len(rows)
+
+    def update_search_vectors(self, queryset):
+        if is_postgres():
+            queryset.update(search_vector=get_search_vector('name'))
@@ -2,6 +2,8 @@
 from accounts.models import FDWAccount
 from agency.models import Agency
 from django.conf import settings
+from django.contrib.postgres.indexes import GinIndex
+from django.contrib.postgres.search import SearchVectorField
 from django.core.validators import (MaxValueValidator, MinValueValidator,
                                     RegexValidator)
 from django.db import models
@@ -9,8 +11,10 @@ from django.utils import timezone
 from django.utils.translation import ugettext_lazy as _
 # Imports from project
 from onlinemaid.constants import MaritalStatusChoices, TrueFalseChoices
-from onlinemaid.fields import CustomBinaryField, NullableEmailField
+from onlinemaid.fields import (BitmaskField, CustomBinaryField,
+                               NullableEmailField)
 from onlinemaid.helper_functions import decrypt_string, humanise_time_duration
+from onlinemaid.registry import maid_languages
 from onlinemaid.storage_backends import PublicMediaStorage
 
 
@@ -27,6 +31,7 @@ from .constants import (CookingRemarksChoices, DisabledCareRemarksChoices,
                         MaidResponsibilityChoices, MaidStatusChoices,
                         TypeOfMaidChoices)
 from .helper_functions import is_able_to_speak
+from .managers import MaidQuerySet, MaidSearchIndexManager
 
 
 class MaidResponsibility(models.Model):
@@ -100,6 +105,13 @@ class Maid(models.Model):
         storage=PublicMediaStorage() if settings.USE_S3 else None
     )
 
+    photo_variants = models.JSONField(
+        verbose_name=_('Maid Photo Variants'),
+        default=dict,
+        blank=True,
+        editable=False
+    )
+
     maid_type = models.CharField(
         verbose_name=_('Maid Type'),
         max_length=6,
@@ -284,6 +296,8 @@ class Maid(models.Model):
 
     fin_number_tag = CustomBinaryField()
 
+    objects = MaidQuerySet.as_manager()
+
     class Meta:
         verbose_name = _("Maid")
         verbose_name_plural = _("Maids")
@@ -355,6 +369,24 @@ class Maid(models.Model):
         else:
             return plaintext[-4:] if plaintext else ''
 
+    def get_photo_url(self, variant='card', image_format='jpg'):
+        # Falls back to the original until the variants have been generated
+        if not self.photo:
+            return ''
+        name = self.photo_variants.get(variant, {}).get(image_format)
+        if name:
+            return self.photo.storage.url(name)
+        return self.photo.url
+
+    def get_photo_srcset(self, image_format='webp'):
+        return ', '.join(
+            f"{self.photo.storage.url(v[image_format])} {v['width']}w"
+            for v in sorted(
+                self.photo_variants.values(),
+                key=lambda v: v['width']
+            ) if v.get(image_format)
+        )
+
     def toggle_published(self):
         if self.status == MaidStatusChoices.PUBLISHED:
             self.status = MaidStatusChoices.UNPUBLISHED
@@ -400,7 +432,7 @@ class Maid(models.Model):
         if languages_string:
             return languages_string
 
-    def set_languages(self):
+    def get_language_choices(self):
         lang_model_map = {
             'English': MaidLanguageChoices.ENGLISH,
             'Malay': MaidLanguageChoices.MALAY,
@@ -409,60 +441,63 @@ class Maid(models.Model):
             'Hindi': MaidLanguageChoices.HINDI_TAMIL,
             'Tamil': MaidLanguageChoices.HINDI_TAMIL
         }
+        return list(dict.fromkeys(
+            lang_model_map[lang] for lang in self.get_language_list()
+        ))
+
+    def set_languages(self):
         if hasattr(self, 'language_proficiency'):
             if self.languages:
                 self.languages.clear()
-            for lang in self.get_language_list():
-                self.languages.add(
-                    MaidLanguage.objects.get(
-                        language=lang_model_map[lang]
-                    )
-                )
+            self.languages.add(
+                *maid_languages.pks(self.get_language_choices())
+            )
+
+    def has_food_handling_preference(self, preference):
+        # Iterating all() reads the prefetched rows when they are present
+        return any(
+            i.preference == preference
+            for i in self.food_handling_preferences.all()
+        )
+
+    def has_dietary_restriction(self, restriction):
+        return any(
+            i.restriction == restriction
+            for i in self.dietary_restrictions.all()
+        )
 
     def get_food_handling_pork(self):
-        if self.food_handling_preferences.filter(
-            preference=MaidFoodPreferenceChoices.PORK
-        ):
+        if self.has_food_handling_preference(MaidFoodPreferenceChoices.PORK):
             return 'Yes'
         else:
             return 'No'
 
     def get_food_handling_beef(self):
-        if self.food_handling_preferences.filter(
-            preference=MaidFoodPreferenceChoices.BEEF
-        ):
+        if self.has_food_handling_preference(MaidFoodPreferenceChoices.BEEF):
             return 'Yes'
         else:
             return 'No'
 
     def get_food_handling_veg(self):
-        if self.food_handling_preferences.filter(
-            preference=MaidFoodPreferenceChoices.VEG
-        ):
+        if self.has_food_handling_preference(MaidFoodPreferenceChoices.VEG):
             return 'Yes'
         else:
             return 'No'
 
     def get_dietary_restriction_pork(self):
-        if self.food_handling_preferences.filter(
-            preference=MaidDietaryRestrictionChoices.PORK
-        ):
+        if self.has_dietary_restriction(MaidDietaryRestrictionChoices.PORK):
             return 'Yes'
         else:
             return 'No'
 
     def get_dietary_restriction_beef(self):
-        if self.food_handling_preferences.filter(
-            preference=MaidDietaryRestrictionChoices.PORK
-        ):
+        if self.has_dietary_restriction(MaidDietaryRestrictionChoices.BEEF):
             return 'Yes'
         else:
             return 'No'
 
     def get_dietary_restriction_veg(self):
-        if self.food_handling_preferences.filter(
-            preference=MaidDietaryRestrictionChoices.PORK
-        ):
+        if self.has_dietary_restriction(MaidDietaryRestrictionChoices.VEG):
             return 'Yes'
         else:
             return 'No'
@@ -925,3 +960,127 @@ class MaidLanguageProficiency(models.Model):
     class Meta:
         verbose_name = _("Maid Language Proficiency")
         verbose_name_plural = _("Maid Language Proficiencies")
+
+
+class MaidSearchIndex(models.Model):
+    maid = models.OneToOneField(
+        Maid,
+        on_delete=models.CASCADE,
+        primary_key=True,
+        related_name='search_index'
+    )
+
+    agency = models.ForeignKey(
+        Agency,
+        on_delete=models.CASCADE,
+        related_name='maid_search_index'
+    )
+
+    name = models.CharField(
+        verbose_name=_('Name'),
+        max_length=255,
+        null=True
+    )
+
+    status = models.CharField(
+        verbose_name=_('Status'),
+        max_length=6,
+        choices=MaidStatusChoices.choices
+    )
+
+    country_of_origin = models.CharField(
+        verbose_name=_('Nationality'),
+        max_length=3,
+        null=True,
+        choices=MaidNationalityChoices.choices
+    )
+
+    maid_type = models.CharField(
+        verbose_name=_('Maid Type'),
+        max_length=6,
+        choices=TypeOfMaidChoices.choices
+    )
+
+    marital_status = models.CharField(
+        verbose_name=_('Marital Status'),
+        max_length=9,
+        choices=MaritalStatusChoices.choices
+    )
+
+    date_of_birth = models.DateField(
+        verbose_name=_('Date of Birth'),
+        null=True
+    )
+
+    language_mask = BitmaskField(
+        verbose_name=_('Languages')
+    )
+
+    responsibility_mask = BitmaskField(
+        verbose_name=_('Responsibilities')
+    )
+
+    created_on = models.DateTimeField(
+        verbose_name=_('Created On')
+    )
+
+    search_vector = SearchVectorField(
+        null=True,
+        editable=False
+    )
+
+    objects = MaidSearchIndexManager()
+
+    class Meta:
+        verbose_name = _("Maid Search Index")
+        verbose_name_plural = _("Maid Search Index")
+        indexes = [
+            models.Index(fields=['status', 'country_of_origin']),
+            models.Index(fields=['status', 'maid_type']),
+            models.Index(fields=['status', 'date_of_birth']),
+            models.Index(fields=['status', 'created_on']),
+            models.Index(fields=['agency', 'status']),
+            GinIndex(fields=['search_vector']),
+            GinIndex(
+                name='maid_search_name_trgm',
+                fields=['name'],
+                opclasses=['gin_trgm_ops']
+            )
+        ]
+
+    def __str__(self) -> str:
+        return f'{self.maid_id} - {self.name}'
+
+
+class MaidSimilarity(models.Model):
+    maid = models.ForeignKey(
+        Maid,
+        on_delete=models.CASCADE,
+        related_name='similar_maid_links'
+    )
+
+    similar_maid = models.ForeignKey(
+        Maid,
+        on_delete=models.CASCADE,
+        related_name='similar_to_links'
+    )
+
+    rank = models.PositiveSmallIntegerField(
+        verbose_name=_('Rank')
+    )
+
+    score = models.FloatField(
+        verbose_name=_('Similarity score')
+    )
+
+    same_agency = models.BooleanField(
+        verbose_name=_('Neighbour within the same agency'),
+        default=False
+    )
+
+    class Meta:
+        verbose_name = _("Maid Similarity")
+        verbose_name_plural = _("Maid Similarities")
+        indexes = [
+            models.Index(fields=['maid', 'same_agency', 'rank'])
+        ]
@@ -0,0 +1,84 @@
+import os
+from io import BytesIO
+
+from django.conf import settings
+from django.core.files.base import ContentFile
+from django.utils import timezone
+from PIL import Image, ImageOps
+
+from .models import Maid
+
+# Bounding boxes of the resized copies kept next to each original photo
+PHOTO_VARIANTS = {
+    'card': (360, 480),
+    'pdf': (480, 640),
+    'detail': (720, 960)
+}
+
+# WebP for browsers which support it and JPEG for everything else,
+# including WeasyPrint
+PHOTO_FORMATS = {
+    'webp': 'WEBP',
+    'jpg': 'JPEG'
+}
+
+
+def open_photo(photo):
+    with photo.open('rb') as f:
+        image = Image.open(f)
+        image.load()
+    # Phone photos are often stored sideways with an EXIF rotation
+    image = ImageOps.exif_transpose(image)
+    if image.mode != 'RGB':
+        image = image.convert('RGB')
+    return image
+
+
+def encode_image(image, image_format):
+    buffer = BytesIO()
+    image.save(
+        buffer,
+        format=PHOTO_FORMATS[image_format],
+        quality=settings.MAID_PHOTO_QUALITY,
+        optimize=True
+    )
+    return ContentFile(buffer.getvalue())
+
+
+def delete_photo_variants(storage, variants):
+    for variant in variants.values():
+        for image_format in PHOTO_FORMATS:
+            if variant.get(image_format):
+                storage.delete(variant[image_format])
+
+
+def generate_photo_variants(maid):
+    """
+    Saves a resized WebP and JPEG copy of the maid's photo for every entry
+    in PHOTO_VARIANTS and records their names in photo_variants. The
+    update skips the maid save signals but still bumps updated_on so that
+    cached cards pick up the new images.
+    """
+    storage = maid.photo.storage
+    old_variants = maid.photo_variants or {}
+    variants = {}
+    if maid.photo:
+        image = open_photo(maid.photo)
+        root = os.path.splitext(maid.photo.name)[0]
+        for name, size in PHOTO_VARIANTS.items():
+            resized = image.copy()
+            resized.thumbnail(size, Image.LANCZOS)
+            variants[name] = {'width': resized.width}
+            for image_format in PHOTO_FORMATS:
+                variants[name][image_format] = storage.save(
+                    f'{root}_{name}.{image_format}',
+                    encode_image(resized, image_format)
+                )
+
+    Maid.objects.filter(pk=maid.pk).update(
+        photo_variants=variants,
+        updated_on=timezone.now()
+    )
+    maid.photo_variants = variants
+    delete_photo_variants(storage, old_variants)
+    return variants
@@ -0,0 +1,182 @@
+import random
+
+import numpy as np
+from django.conf import settings
+from django.db import transaction
+from django.utils import timezone
+from sklearn.neighbors import NearestNeighbors
+
+from .constants import (MaidCountryOfOrigin, MaidLanguageChoices,
+                        MaidStatusChoices, TypeOfMaidChoices)
+from .models import Maid, MaidSimilarity
+
+CARE_ASSESSMENT_FIELDS = [
+    'infant_child_care__assessment',
+    'elderly_care__assessment',
+    'disabled_care__assessment',
+    'general_housework__assessment',
+    'cooking__assessment'
+]
+
+# Relative importance of each feature group in the distance between maids
+FEATURE_WEIGHTS = {
+    'country_of_origin': 2.0,
+    'maid_type': 1.0,
+    'age': 1.5,
+    'languages': 1.0,
+    'care': 1.0,
+    'salary': 0.5,
+    'days_off': 0.5
+}
+
+
+def get_feature_rows():
+    return list(
+        Maid.objects.filter(
+            search_index__status=MaidStatusChoices.PUBLISHED
+        ).order_by('pk').values(
+            'pk',
+            'agency_id',
+            'country_of_origin',
+            'maid_type',
+            'date_of_birth',
+            'expected_salary',
+            'expected_days_off',
+            'search_index__language_mask',
+            *CARE_ASSESSMENT_FIELDS
+        )
+    )
+
+
+def get_feature_matrix(rows):
+    """
+    Encodes each maid as a vector of one hot nationality and maid type,
+    language bits, care assessments and scaled age, salary and days off.
+    """
+    today = timezone.now().date()
+    countries = {v: i for i, v in enumerate(MaidCountryOfOrigin.values)}
+    maid_types = {v: i for i, v in enumerate(TypeOfMaidChoices.values)}
+    n_languages = len(MaidLanguageChoices.values)
+
+    n = len(rows)
+    country = np.zeros((n, len(countries)))
+    maid_type = np.zeros((n, len(maid_types)))
+    languages = np.zeros((n, n_languages))
+    care = np.zeros((n, len(CARE_ASSESSMENT_FIELDS)))
+    scalars = np.zeros((n, 3))
+
+    for i, row in enumerate(rows):
+        if row['country_of_origin'] in countries:
+            country[i, countries[row['country_of_origin']]] = 1
+        if row['maid_type'] in maid_types:
+            maid_type[i, maid_types[row['maid_type']]] = 1
+        mask = row['search_index__language_mask'] or 0
+        languages[i] = [(mask >> bit) & 1 for bit in range(n_languages)]
+        # Missing assessments are treated as average
+        care[i] = [row[field] or 3 for field in CARE_ASSESSMENT_FIELDS]
+        dob = row['date_of_birth']
+        scalars[i] = [
+            (today - dob).days / 365.25 if dob else 35,
+            row['expected_salary'] or 0,
+            row['expected_days_off'] or 0
+        ]
+
+    return np.hstack([
+        country * FEATURE_WEIGHTS['country_of_origin'],
+        maid_type * FEATURE_WEIGHTS['maid_type'],
+        languages * FEATURE_WEIGHTS['languages'],
+        (care - 1) / 4 * FEATURE_WEIGHTS['care'],
+        scalars[:, :1] / 10 * FEATURE_WEIGHTS['age'],
+        np.clip(scalars[:, 1:2], 0, 2000) / 500 * FEATURE_WEIGHTS['salary'],
+        scalars[:, 2:] / 4 * FEATURE_WEIGHTS['days_off']
+    ])
+
+
+def get_neighbour_links(rows, matrix, k, same_agency):
+    if len(rows) < 2:
+        return []
+    n_neighbors = min(k + 1, len(rows))
+    distances, indices = NearestNeighbors(
+        n_neighbors=n_neighbors
+    ).fit(matrix).kneighbors(matrix)
+
+    links = []
+    for i, row in enumerate(rows):
+        rank = 0
+        for distance, j in zip(distances[i], indices[i]):
+            if j == i:
+                continue
+            rank += 1
+            links.append(
+                MaidSimilarity(
+                    maid_id=row['pk'],
+                    similar_maid_id=rows[j]['pk'],
+                    rank=rank,
+                    score=float(1 / (1 + distance)),
+                    same_agency=same_agency
+                )
+            )
+            if rank == k:
+                break
+    return links
+
+
+def build_recommendations(k=None, batch_size=1000):
+    # Recomputes the nearest published neighbours of every published maid,
+    # both across the catalogue and within each maid's own agency
+    k = k or settings.MAID_RECOMMENDATION_NEIGHBOURS
+    rows = get_feature_rows()
+    links = []
+    if rows:
+        matrix = get_feature_matrix(rows)
+        links += get_neighbour_links(rows, matrix, k, False)
+
+        agencies = {}
+        for i, row in enumerate(rows):
+            agencies.setdefault(row['agency_id'], []).append(i)
+        for positions in agencies.values():
+            links += get_neighbour_links(
+                [rows[i] for i in positions],
+                matrix[positions],
+                k,
+                True
+            )
+
+    with transaction.atomic():
+        MaidSimilarity.objects.all().delete()
+        MaidSimilarity.objects.bulk_create(links, batch_size=batch_size)
+    return len(links)
+
+
+def get_similar_maids(maid, same_agency=False, limit=None, queryset=None):
+    """
+    Returns up to limit published maids similar to the given maid, sampled
+    from its precomputed neighbours. Maids published after the last batch
+    run fall back to a bounded query on nationality.
+    """
+    limit = limit or settings.MAID_SIMILAR_MAIDS_SHOWN
+    if queryset is None:
+        queryset = Maid.objects.all()
+    queryset = queryset.filter(
+        search_index__status=MaidStatusChoices.PUBLISHED
+    ).exclude(
+        pk=maid.pk
+    )
+    if same_agency:
+        queryset = queryset.filter(agency_id=maid.agency_id)
+
+    neighbours = list(
+        queryset.filter(
+            similar_to_links__maid=maid,
+            similar_to_links__same_agency=same_agency
+        ).order_by(
+            'similar_to_links__rank'
+        )
+    )
+    if not neighbours:
+        neighbours = list(
+            queryset.filter(
+                country_of_origin=maid.country_of_origin
+            ).order_by('-created_on')[:limit]
+        )
+    return random.sample(neighbours, min(limit, len(neighbours)))
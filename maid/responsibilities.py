@@ -0,0 +1,81 @@
+from onlinemaid.registry import maid_responsibilities
+
+from .constants import MaidResponsibilityChoices
+from .models import Maid
+
+# Care relations in order of precedence when assessments are tied
+CARE_RESPONSIBILITY_MAP = {
+    'infant_child_care': (
+        MaidResponsibilityChoices.MAID_RESP_CARE_FOR_INFANTS_CHILDREN
+    ),
+    'elderly_care': MaidResponsibilityChoices.MAID_RESP_CARE_FOR_ELDERLY,
+    'disabled_care': MaidResponsibilityChoices.MAID_RESP_CARE_FOR_DISABLED,
+    'general_housework': (
+        MaidResponsibilityChoices.MAID_RESP_GENERAL_HOUSEWORK
+    ),
+    'cooking': MaidResponsibilityChoices.MAID_RESP_COOKING
+}
+
+def get_care_assessments(maid):
+    """
+    Returns the assessment of each care relation of the maid, read from
+    the related objects when they are already loaded and otherwise with a
+    single joined query.
+    """
+    if all(maid._state.fields_cache.get(i) for i in CARE_RESPONSIBILITY_MAP):
+        return {
+            relation: getattr(maid, relation).assessment
+            for relation in CARE_RESPONSIBILITY_MAP
+        }
+    row = Maid.objects.filter(pk=maid.pk).values(*[
+        f'{relation}__assessment' for relation in CARE_RESPONSIBILITY_MAP
+    ]).first() or {}
+    return {
+        relation: row.get(f'{relation}__assessment')
+        for relation in CARE_RESPONSIBILITY_MAP
+    }
+
+
+def derive_main_responsibility(assessments, current=()):
+    # The highest assessed care relation wins. Ties keep a responsibility
+    # the maid already has, otherwise the first in CARE_RESPONSIBILITY_MAP.
+    assessed = {
+        k: int(v) for k, v in assessments.items() if v not in [None, '']
+    }
+    if not assessed:
+        return None
+    best = max(assessed.values())
+    tied = [
+        CARE_RESPONSIBILITY_MAP[relation]
+        for relation in CARE_RESPONSIBILITY_MAP
+        if assessed.get(relation) == best
+    ]
+    for responsibility in tied:
+        if responsibility in current:
+            return responsibility
+    return tied[0]
+
+
+def apply_main_responsibility(maid, assessments=None):
+    """
+    Makes the maid's main responsibility the only one in its
+    responsibilities, removing and adding rows in at most one statement
+    each. Returns the main responsibility.
+    """
+    if assessments is None:
+        assessments = get_care_assessments(maid)
+    current = set(
+        maid.responsibilities.through.objects.filter(
+            maid=maid
+        ).values_list('maidresponsibility__name', flat=True)
+    )
+    main = derive_main_responsibility(assessments, current)
+    if main is None:
+        return None
+
+    stale = [maid_responsibilities.pk(i) for i in current if i != main]
+    if stale:
+        maid.responsibilities.remove(*stale)
+    if main not in current:
+        maid.responsibilities.add(maid_responsibilities.pk(main))
+    return main
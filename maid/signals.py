@@ -1,85 +1,135 @@
-import random
+import logging
 
-from django.db.models.signals import post_save
+from agency.counters import apply_counter_deltas, get_maid_deltas
+from agency.managers import PUBLISHED_MAID_STATUSES
+from django.db.models.signals import (m2m_changed, post_delete, post_init,
+                                      post_save)
 from django.dispatch import receiver
+from onlinemaid.cache import bump_namespaces
+from website.sitemaps import invalidate_sitemap
 
+from .constants import MaidStatusChoices
+from .facets import invalidate_maid_facets
+from .featured import invalidate_featured_feed
+from .fragments import touch_maid
 from .models import (Maid, MaidCooking, MaidDisabledCare, MaidElderlyCare,
-                     MaidGeneralHousework, MaidInfantChildCare,
-                     MaidResponsibility)
-
-
-def maid_main_responsibility(maid):
-    care_model_list = [
-        MaidInfantChildCare,
-        MaidElderlyCare,
-        MaidDisabledCare,
-        MaidGeneralHousework,
-        MaidCooking
-    ]
-
-    responsibility_transmap = {
-        'MaidInfantChildCare': 'CFI',
-        'MaidElderlyCare': 'CFE',
-        'MaidDisabledCare': 'CFD',
-        'MaidGeneralHousework': 'GEH',
-        'MaidCooking': 'COK'
-    }
-
-    responsibility_dict = {}
-
-    for i in care_model_list:
-        for k, v in i.objects.get(maid=maid).__dict__.items():
-            if k == 'assessment':
-                responsibility_dict[i.__name__] = v
-
-    main_responsibility_value = max(responsibility_dict.values())
-    main_responsibilities = []
-    db_responsibilities = [
-        i.get_db_value() for i in maid.responsibilities.all()
-    ]
-    responsibilities_tbd = []
-
-    for k, v in responsibility_dict.items():
-        if v == main_responsibility_value:
-            main_responsibilities.append(
-                responsibility_transmap[k]
-            )
-
-    for i in main_responsibilities:
-        if i in db_responsibilities:
-            main_responsibilities = [i]
-        elif len(main_responsibilities) > 1:
-            main_responsibilities = [random.choice(main_responsibilities)]
-
-    for i in db_responsibilities:
-        if i not in main_responsibilities:
-            responsibilities_tbd.append(i)
-        else:
-            main_responsibilities.remove(i)
-
-    for i in responsibilities_tbd:
-        maid.responsibilities.remove(
-            MaidResponsibility.objects.get(
-                name=i
-            )
-        )
+                     MaidEmploymentHistory, MaidGeneralHousework,
+                     MaidInfantChildCare, MaidLanguageProficiency,
+                     MaidSearchIndex)
+from .photos import generate_photo_variants
+
+logger = logging.getLogger(__name__)
+
+
+def sync_maid_search_index(maid):
+    if MaidSearchIndex.objects.sync(maid):
+        invalidate_maid_facets()
+
+
+@receiver(post_save, sender=Maid)
+def maid_search_index_sync(sender, instance, **kwargs):
+    sync_maid_search_index(instance)
+
+
+@receiver(post_init, sender=Maid)
+def maid_original_values(sender, instance, **kwargs):
+    # Read from __dict__ so that deferred fields are not fetched
+    instance._original_status = instance.__dict__.get('status')
+    instance._original_photo = str(instance.__dict__.get('photo') or '')
+
+
+@receiver(post_save, sender=Maid)
+def maid_photo_variants_update(sender, instance, **kwargs):
+    photo = str(instance.photo or '')
+    if photo == instance._original_photo:
+        return
+    instance._original_photo = photo
+    try:
+        generate_photo_variants(instance)
+    except Exception:
+        # The maid is already saved, so unreadable or oversized images and
+        # storage errors only leave the photo served from the original
+        # upload
+        logger.exception('Photo variants of maid %s not generated',
+                         instance.pk)
 
-    for i in main_responsibilities:
-        maid.responsibilities.add(
-            MaidResponsibility.objects.get(
-                name=i
-            )
+
+@receiver(post_save, sender=Maid)
+def maid_status_update(sender, instance, created, **kwargs):
+    apply_counter_deltas(
+        instance.agency_id,
+        **get_maid_deltas(
+            instance.status,
+            instance._original_status,
+            created=created
+        )
+    )
+    if MaidStatusChoices.FEATURED in [
+        instance.status,
+        instance._original_status
+    ]:
+        invalidate_featured_feed()
+    published = instance.status in PUBLISHED_MAID_STATUSES
+    was_published = instance._original_status in PUBLISHED_MAID_STATUSES
+    if published or was_published:
+        invalidate_sitemap(
+            'maids',
+            instance.pk,
+            pages_changed=published != was_published
         )
+    instance._original_status = instance.status
+
+
+@receiver(post_delete, sender=Maid)
+def maid_status_delete(sender, instance, **kwargs):
+    apply_counter_deltas(
+        instance.agency_id,
+        **get_maid_deltas(instance.status, deleted=True)
+    )
+    if instance.status == MaidStatusChoices.FEATURED:
+        invalidate_featured_feed()
+    if instance.status in PUBLISHED_MAID_STATUSES:
+        invalidate_sitemap('maids', instance.pk, pages_changed=True)
+        invalidate_maid_facets()
+
+
+@receiver(m2m_changed, sender=Maid.languages.through)
+@receiver(m2m_changed, sender=Maid.responsibilities.through)
+def maid_search_index_m2m_sync(sender, instance, action, reverse, pk_set,
+                               **kwargs):
+    if action not in ['post_add', 'post_remove', 'post_clear']:
+        return
+    if not reverse:
+        sync_maid_search_index(instance)
+    elif pk_set:
+        for maid in Maid.objects.filter(pk__in=pk_set):
+            sync_maid_search_index(maid)
+
+
+@receiver(post_save, sender=MaidLanguageProficiency)
+@receiver(post_save, sender=MaidInfantChildCare)
+@receiver(post_save, sender=MaidElderlyCare)
+@receiver(post_save, sender=MaidDisabledCare)
+@receiver(post_save, sender=MaidGeneralHousework)
+@receiver(post_save, sender=MaidCooking)
+def maid_search_index_related_sync(sender, instance, **kwargs):
+    sync_maid_search_index(instance.maid)
+
+
+@receiver(post_save, sender=MaidEmploymentHistory)
+@receiver(post_delete, sender=MaidEmploymentHistory)
+@receiver(post_save, sender=MaidLanguageProficiency)
+@receiver(post_save, sender=MaidInfantChildCare)
+@receiver(post_save, sender=MaidElderlyCare)
+@receiver(post_save, sender=MaidDisabledCare)
+@receiver(post_save, sender=MaidGeneralHousework)
+@receiver(post_save, sender=MaidCooking)
+def maid_card_version_update(sender, instance, **kwargs):
+    # Moves the maid on to a new cached card, see get_card_cache_key
+    touch_maid(instance.maid_id)
 
 
 @receiver(post_save, sender=Maid)
-def maid_counter(sender, instance, created, **kwargs):
-    agency = instance.agency
-    agency.amount_of_biodata = Maid.objects.filter(
-        agency=agency
-    ).count()
-    agency.amount_of_featured_biodata = Maid.objects.filter(
-        agency=agency,
-        status='FEAT'
-    ).count()
-    agency.save()
+@receiver(post_delete, sender=Maid)
+def maid_cache_namespace_update(sender, instance, **kwargs):
+    bump_namespaces('maid', instance.agency_id)
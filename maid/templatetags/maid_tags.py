@@ -0,0 +1,21 @@
+from django import template
+from django.utils.safestring import mark_safe
+
+from ..fragments import get_maid_card
+
+register = template.Library()
+
+
+@register.simple_tag
+def maid_card(maid):
+    return mark_safe(get_maid_card(maid))
+
+
+@register.simple_tag
+def maid_photo_url(maid, variant='card', image_format='jpg'):
+    return maid.get_photo_url(variant, image_format)
+
+
+@register.simple_tag
+def maid_photo_srcset(maid, image_format='webp'):
+    return maid.get_photo_srcset(image_format)
@@ -1,5 +1,4 @@
 import json
-from random import shuffle
 from typing import Any, Dict, Optional
 
 from agency.mixins import GetAuthorityMixin
@@ -9,22 +8,27 @@ from django.contrib.auth.mixins import LoginRequiredMixin
 from django.db.models.query import QuerySet as QS
 from django.http import JsonResponse
 from django.http.request import HttpRequest as req
-from django.http.response import HttpResponse as res
 from django.http.response import HttpResponseBase as RESBASE
 from django.shortcuts import get_object_or_404
 from django.urls import reverse_lazy
+from django.utils import timezone
 from django.views.generic import ListView, View
 from django.views.generic.base import RedirectView
 from django.views.generic.detail import DetailView
 from django.views.generic.edit import DeleteView, UpdateView
 from employer_documentation.mixins import PdfHtmlViewMixin
 from onlinemaid.mixins import ListFilteredMixin, SuccessMessageMixin
+from onlinemaid.pagination import CursorPaginationMixin
 from onlinemaid.types import T
 
 from .constants import MaidStatusChoices
+from .facets import apply_facet_labels, get_maid_facets
+from .featured import get_featured_sample
 from .filters import MaidFilter
+from .fragments import attach_maid_cards
 from .forms import MaidLoanTransactionForm
 from .models import Maid, MaidLoanTransaction
+from .recommendations import get_similar_maids
 
 
 class BaseMaidRedirectView(RedirectView):
@@ -70,35 +74,45 @@ class MaidToggleFeatured(BaseMaidRedirectView):
 
 
 class MaidList(LoginRequiredMixin, GetAuthorityMixin, ListFilteredMixin,
-               ListView):
+               CursorPaginationMixin, ListView):
     context_object_name = 'maids'
     http_method_names = ['get']
     model = Maid
-    queryset = Maid.objects.filter(status=MaidStatusChoices.PUBLISHED)
+    queryset = Maid.objects.filter(
+        search_index__status=MaidStatusChoices.PUBLISHED
+    )
     template_name = 'list/maid-list.html'
     filter_set = MaidFilter
     paginate_by = settings.MAID_PAGINATE_BY
+    cursor_ordering = ['-created_on', '-pk']
+
+    def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
+        kwargs = super().get_context_data(**kwargs)
+        maid_filter = kwargs['filter']
+        facets = get_maid_facets(
+            maid_filter.form.cleaned_data if maid_filter.is_valid() else {}
+        )
+        apply_facet_labels(maid_filter.form, facets)
+        attach_maid_cards(kwargs['object_list'])
+        kwargs.update({
+            'facets': facets
+        })
+        return kwargs
 
 
 class MaidDetail(LoginRequiredMixin, DetailView):
     context_object_name = 'maid'
     http_method_names = ['get']
     model = Maid
+    queryset = Maid.objects.with_detail_data()
     template_name = 'detail/maid-detail.html'
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         kwargs = super().get_context_data()
-        country_of_origin = self.object.country_of_origin
-        languages = self.object.languages.all()
-        similar_maids = Maid.objects.filter(
-            country_of_origin=country_of_origin,
-            responsibilities=self.object.get_main_responsibility(),
-            languages__in=languages
-        ).exclude(
-            pk=self.object.pk
-        ).distinct()
         kwargs.update({
-            'similar_maids': similar_maids
+            'similar_maids': attach_maid_cards(
+                get_similar_maids(self.object)
+            )
         })
         return kwargs
 
@@ -182,26 +196,7 @@ class FeaturedMaidListView(View):
     def post(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
         request_data = json.loads(request.body.decode('utf-8'))
         nationality = request_data.get('nationality')
-        featured_maids = Maid.objects.filter(
-            status='FEAT'
-        )
-        if nationality != 'ANY':
-            featured_maids = featured_maids.filter(
-                country_of_origin=nationality
-            )
-
-        shuffle(list(featured_maids))
-        featured_maids = [
-            {
-                'pk': maid.pk,
-                'photo_url': maid.photo.url,
-                'name': maid.name,
-                'country_of_origin': maid.get_country_of_origin_display(),
-                'age': maid.age,
-                'marital_status': maid.get_marital_status_display(),
-                'type': maid.get_maid_type_display()
-            } for maid in featured_maids
-        ]
+        featured_maids = get_featured_sample(nationality)
         data = {
             'featured_maids': featured_maids,
             'count': len(featured_maids),
@@ -212,14 +207,26 @@ class FeaturedMaidListView(View):
 
 class PdfMaidBiodataView(LoginRequiredMixin, PdfHtmlViewMixin, DetailView):
     model = Maid
+    queryset = Maid.objects.with_detail_data()
     template_name = 'detail/pdf-biodata-detail.html'
 
-    def get(self, request: req, *args: str, **kwargs: Any) -> res:
-        self.object = self.get_object()
+    def get_pdf_cache_key_parts(self):
+        # The biodata shows the maid's age, her agency's name and the
+        # employee downloading it
+        agency_employee = getattr(self.request.user, 'agency_employee', None)
+        return [
+            self.object.updated_on.timestamp(),
+            timezone.now().date().isoformat(),
+            self.object.agency.name,
+            getattr(agency_employee, 'name', ''),
+            getattr(agency_employee, 'contact_number', '')
+        ]
+
+    def get_pdf_context(self, request):
         context = self.get_context_data()
 
         if hasattr(request.user, 'agency_employee'):
             context['agency_employee'] = request.user.agency_employee
 
         context['employment_history'] = self.object.employment_history.all()
-        return self.generate_pdf_response(request, context)
+        return context
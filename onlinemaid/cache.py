@@ -0,0 +1,199 @@
+import pickle
+import threading
+import time
+from collections import OrderedDict
+
+from django.core.cache import cache, caches
+from django.core.cache.backends.base import DEFAULT_TIMEOUT, BaseCache
+from django.utils.functional import cached_property
+
+_MISSING = object()
+
+
+class TwoLevelCache(BaseCache):
+    """
+    Cache backend which keeps a small in-process LRU in front of a shared
+    cache. Values are written through to the shared cache and kept locally
+    for at most LOCAL_TIMEOUT seconds, so another process may read a stale
+    value for that long after a change.
+
+    OPTIONS:
+        SHARED: alias of the shared cache in CACHES
+        LOCAL_TIMEOUT: seconds a value is kept in process
+        LOCAL_MAX_ENTRIES: values kept in process before the least recently
+            used are dropped
+    """
+
+    def __init__(self, location, params):
+        super().__init__(params)
+        options = params.get('OPTIONS', {})
+        self.shared_alias = options.get('SHARED', 'shared')
+        self.local_timeout = options.get('LOCAL_TIMEOUT', 5)
+        self.local_max_entries = options.get('LOCAL_MAX_ENTRIES', 1000)
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+
+    @cached_property
+    def shared(self):
+        return caches[self.shared_alias]
+
+    def get_local_timeout(self, timeout):
+        if timeout is DEFAULT_TIMEOUT or timeout is None:
+            return self.local_timeout
+        return min(timeout, self.local_timeout)
+
+    def local_get(self, key):
+        with self._lock:
+            entry = self._local.get(key)
+            if entry is None:
+                return _MISSING
+            expiry, pickled = entry
+            if expiry <= time.monotonic():
+                del self._local[key]
+                return _MISSING
+            self._local.move_to_end(key)
+        return pickle.loads(pickled)
+
+    def local_set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        timeout = self.get_local_timeout(timeout)
+        if timeout <= 0:
+            self.local_delete(key)
+            return
+        # Pickled like LocMemCache so that callers cannot mutate the entry
+        pickled = pickle.dumps(value, pickle.HIGHEST_PROTOCOL)
+        with self._lock:
+            self._local[key] = (time.monotonic() + timeout, pickled)
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_entries:
+                self._local.popitem(last=False)
+
+    def local_delete(self, key):
+        with self._lock:
+            self._local.pop(key, None)
+
+    def local_key(self, key, version=None):
+        key = self.make_key(key, version=version)
+        self.validate_key(key)
+        return key
+
+    def get(self, key, default=None, version=None):
+        local_key = self.local_key(key, version)
+        value = self.local_get(local_key)
+        if value is _MISSING:
+            value = self.shared.get(key, _MISSING, version=version)
+            if value is _MISSING:
+                return default
+            self.local_set(local_key, value)
+        return value
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        self.shared.set(key, value, timeout, version=version)
+        self.local_set(self.local_key(key, version), value, timeout)
+
+    def add(self, key, value, timeout=DEFAULT_TIMEOUT, version=None):
+        added = self.shared.add(key, value, timeout, version=version)
+        if added:
+            self.local_set(self.local_key(key, version), value, timeout)
+        return added
+
+    def touch(self, key, timeout=DEFAULT_TIMEOUT, version=None):
+        return self.shared.touch(key, timeout, version=version)
+
+    def delete(self, key, version=None):
+        self.local_delete(self.local_key(key, version))
+        return self.shared.delete(key, version=version)
+
+    def has_key(self, key, version=None):
+        if self.local_get(self.local_key(key, version)) is not _MISSING:
+            return True
+        return self.shared.has_key(key, version=version)
+
+    def incr(self, key, delta=1, version=None):
+        self.local_delete(self.local_key(key, version))
+        return self.shared.incr(key, delta, version=version)
+
+    def get_many(self, keys, version=None):
+        values = {}
+        missing = []
+        for key in keys:
+            value = self.local_get(self.local_key(key, version))
+            if value is _MISSING:
+                missing.append(key)
+            else:
+                values[key] = value
+        if missing:
+            found = self.shared.get_many(missing, version=version)
+            for key, value in found.items():
+                self.local_set(self.local_key(key, version), value)
+            values.update(found)
+        return values
+
+    def set_many(self, data, timeout=DEFAULT_TIMEOUT, version=None):
+        failed = self.shared.set_many(data, timeout, version=version)
+        for key, value in data.items():
+            if key not in failed:
+                self.local_set(self.local_key(key, version), value, timeout)
+        return failed
+
+    def delete_many(self, keys, version=None):
+        keys = list(keys)
+        for key in keys:
+            self.local_delete(self.local_key(key, version))
+        self.shared.delete_many(keys, version=version)
+
+    def clear(self):
+        with self._lock:
+            self._local.clear()
+        self.shared.clear()
+
+    def close(self, **kwargs):
+        self.shared.close(**kwargs)
+
+
+class CacheNamespace:
+    """
+    A group of cache entries which are invalidated together by bumping the
+    namespace's version, e.g. cache_ns('maid', agency_id).bump(). Every key
+    made by the namespace contains its current version, so entries of an
+    older version are never read again and simply expire.
+    """
+
+    def __init__(self, name, scope=None):
+        self.name = name if scope is None else f'{name}:{scope}'
+        self.version_key = f'cache_ns:{self.name}'
+
+    def get_version(self):
+        # Versions start from the clock so that a version key which was
+        # evicted never comes back with a value used before
+        return cache.get_or_set(self.version_key, time.time_ns(), None)
+
+    def bump(self):
+        try:
+            cache.incr(self.version_key)
+        except ValueError:
+            cache.set(self.version_key, time.time_ns(), None)
+
+    def make_key(self, *parts):
+        return ':'.join([self.name, str(self.get_version()), *map(str, parts)])
+
+    def get(self, key, default=None):
+        return cache.get(self.make_key(key), default)
+
+    def set(self, key, value, timeout=DEFAULT_TIMEOUT):
+        cache.set(self.make_key(key), value, timeout)
+
+    def get_or_set(self, key, default, timeout=DEFAULT_TIMEOUT):
+        return cache.get_or_set(self.make_key(key), default, timeout)
+
+
+def cache_ns(name, scope=None):
+    return CacheNamespace(name, scope)
+
+
+def bump_namespaces(name, *scopes):
+    # Bumps the namespace as a whole and the given scopes of it, e.g. the
+    # public maid listings and the dashboard of the maid's agency
+    cache_ns(name).bump()
+    for scope in scopes:
+        if scope is not None:
+            cache_ns(name, scope).bump()
@@ -1,22 +1,27 @@
+from .constants import (AG_ADMINS, AG_MANAGERS, AG_OWNERS, AG_SALES, EMPLOYERS,
+                        FDW)
+
 # Start of Context Processors
 
 
 def authority(request):
+    from agency.authority import get_request_authority
+
+    # The templates have always been given the last of these groups, which
+    # differs from the order of AUTHORITY_GROUPS used by the views
     authority = None
     authority_groups = [
-        'Employers',
-        'Agency Owners',
-        'Agency Administrators',
-        'Agency Managers',
-        'Agency Sales Staff',
-        'Foreign Domestic Workers'
+        EMPLOYERS,
+        AG_OWNERS,
+        AG_ADMINS,
+        AG_MANAGERS,
+        AG_SALES,
+        FDW
     ]
-    if not request.user.is_anonymous:
-        for authority_name in authority_groups:
-            if request.user.groups.filter(
-                name=authority_name
-            ).exists():
-                authority = authority_name
+    groups = get_request_authority(request)['groups']
+    for authority_name in authority_groups:
+        if authority_name in groups:
+            authority = authority_name
 
     return {
         'authority': authority
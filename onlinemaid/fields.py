@@ -107,3 +107,36 @@ class NullableEmailField(models.EmailField):
             'null': True
         })
         super().__init__(*args, **kwargs)
+
+
+class BitmaskField(models.PositiveIntegerField):
+    def __init__(self, *args, **kwargs) -> None:
+        kwargs.update({
+            'default': 0
+        })
+        super().__init__(*args, **kwargs)
+
+
+@BitmaskField.register_lookup
+class BitmaskAnyLookup(models.Lookup):
+    # Matches rows sharing at least one set bit with the given mask
+    lookup_name = 'bitany'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return f'({lhs} & {rhs}) <> 0', lhs_params + rhs_params
+
+
+@BitmaskField.register_lookup
+class BitmaskAllLookup(models.Lookup):
+    # Matches rows which have every bit of the given mask set
+    lookup_name = 'bitall'
+
+    def as_sql(self, compiler, connection):
+        lhs, lhs_params = self.process_lhs(compiler, connection)
+        rhs, rhs_params = self.process_rhs(compiler, connection)
+        return (
+            f'({lhs} & {rhs}) = {rhs}',
+            lhs_params + rhs_params + rhs_params
+        )
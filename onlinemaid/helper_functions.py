@@ -72,9 +72,10 @@ def create_test_user():
 
 
 def encrypt_string(plaintext, encryption_key):
-    # Data to be encrypted formatted as bytes literal
-    bytes_literal = plaintext.upper().encode('ascii')
+    return encrypt_strings([plaintext], encryption_key)[0]
 
+
+def encrypt_strings(plaintexts, encryption_key):
     # Secret encryption key set in environment variables, does not change
     '''
     E.g. to generate 32 byte (256 bit) key, run following command in bash
@@ -90,16 +91,23 @@ def encrypt_string(plaintext, encryption_key):
     key = bytes.fromhex(encryption_key)
     # key = encryption_key.encode('ascii')
 
-    # New nonce everytime
-    nonce = get_random_bytes(32)
+    # The key is only parsed once for a whole batch of values
+    results = []
+    for plaintext in plaintexts:
+        # Data to be encrypted formatted as bytes literal
+        bytes_literal = plaintext.upper().encode('ascii')
+
+        # New nonce everytime
+        nonce = get_random_bytes(32)
 
-    # Create cipher object
-    cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
+        # Create cipher object
+        cipher = AES.new(key, AES.MODE_GCM, nonce=nonce)
 
-    # Generate encrypted ciphertext
-    ciphertext, tag = cipher.encrypt_and_digest(bytes_literal)
+        # Generate encrypted ciphertext
+        ciphertext, tag = cipher.encrypt_and_digest(bytes_literal)
+        results.append((ciphertext, nonce, tag))
 
-    return ciphertext, nonce, tag
+    return results
 
 
 def decrypt_string(ciphertext, encryption_key, nonce, tag):
@@ -4,6 +4,7 @@ import re
 from typing import Any, Dict
 
 import six
+from agency.authority import get_request_authority
 from django.conf import settings
 from django.contrib import messages
 from django.contrib.auth import REDIRECT_FIELD_NAME
@@ -17,6 +18,8 @@ from django.http.response import HttpResponse as res
 from django.http.response import HttpResponseBase as RESBASE
 from django.shortcuts import resolve_url
 
+from onlinemaid.cache import cache_ns
+from onlinemaid.page_cache import get_cached_page, is_cacheable_request
 from onlinemaid.types import T
 
 try:
@@ -401,7 +404,7 @@ class GroupRequiredMixin(AccessMixin):
         """ Check required group(s) """
         if self.request.user.is_superuser:
             return True
-        user_groups = self.request.user.groups.values_list("name", flat=True)
+        user_groups = get_request_authority(self.request)['groups']
         return set(groups).intersection(set(user_groups))
 
     def dispatch(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
@@ -516,3 +519,33 @@ class RecentLoginRequiredMixin(LoginRequiredMixin):
             else:
                 return resp
         return resp
+
+
+class AnonymousPageCacheMixin:
+    """
+    Serves anonymous GET requests from the page cache, with ETag and
+    Last-Modified validators. The page is rendered again whenever one of
+    page_cache_namespaces is bumped.
+    """
+    page_cache_namespaces = []
+
+    def get_page_cache_namespaces(self):
+        return [cache_ns(name) for name in self.page_cache_namespaces]
+
+    def dispatch(self, request: req, *args: Any, **kwargs: Any) -> RESBASE:
+        if not is_cacheable_request(request):
+            return super().dispatch(request, *args, **kwargs)
+
+        def render():
+            response = super(AnonymousPageCacheMixin, self).dispatch(
+                request, *args, **kwargs
+            )
+            if hasattr(response, 'render') and not response.is_rendered:
+                response.render()
+            return response
+
+        return get_cached_page(
+            request,
+            self.get_page_cache_namespaces(),
+            render
+        )
@@ -0,0 +1,111 @@
+import gzip
+import hashlib
+import time
+
+from django.conf import settings
+from django.contrib.messages import get_messages
+from django.core.cache import cache
+from django.db.models.signals import post_migrate
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response, patch_vary_headers
+from django.utils.http import http_date
+
+from .cache import cache_ns
+
+# Bumped after migrations so that a deploy does not serve old markup
+page_cache = cache_ns('page')
+
+
+def is_cacheable_request(request):
+    # Anything which renders differently per visitor is never cached, i.e.
+    # signed in users and pending messages
+    return (
+        request.method in ['GET', 'HEAD']
+        and not request.user.is_authenticated
+        and not len(get_messages(request))
+    )
+
+
+def is_cacheable_response(request, response):
+    # A response which used the CSRF token or sets cookies belongs to the
+    # visitor it was rendered for
+    return (
+        response.status_code == 200
+        and not response.streaming
+        and not response.cookies
+        and not request.META.get('CSRF_COOKIE_USED')
+    )
+
+
+def get_page_cache_key(request, namespaces):
+    versions = [
+        str(namespace.get_version())
+        for namespace in [page_cache, *namespaces]
+    ]
+    digest = hashlib.md5(request.get_full_path().encode()).hexdigest()
+    return f'page:{":".join(versions)}:{digest}'
+
+
+def build_entry(response):
+    return {
+        'content': gzip.compress(response.content),
+        'content_type': response['Content-Type'],
+        'etag': '"%s"' % hashlib.md5(response.content).hexdigest(),
+        'last_modified': int(time.time())
+    }
+
+
+def build_response(request, entry):
+    response = HttpResponse(content_type=entry['content_type'])
+    if 'gzip' in request.META.get('HTTP_ACCEPT_ENCODING', ''):
+        response.content = entry['content']
+        response['Content-Encoding'] = 'gzip'
+    else:
+        response.content = gzip.decompress(entry['content'])
+    return response
+
+
+def set_validators(response, entry):
+    response['ETag'] = entry['etag']
+    response['Last-Modified'] = http_date(entry['last_modified'])
+    # Shared caches must not hand the anonymous page to signed in users
+    patch_vary_headers(response, ['Cookie', 'Accept-Encoding'])
+    return response
+
+
+def get_cached_page(request, namespaces, render):
+    """
+    Returns the page for an anonymous request from the page cache, or a 304
+    when the visitor's copy is still current. render() is only called on a
+    miss, and must return a rendered response.
+    """
+    key = get_page_cache_key(request, namespaces)
+    entry = cache.get(key)
+    response = None
+    if entry is None:
+        response = render()
+        if not is_cacheable_response(request, response):
+            return response
+        entry = build_entry(response)
+        cache.set(key, entry, settings.PAGE_CACHE_TIMEOUT)
+
+    conditional = get_conditional_response(
+        request,
+        etag=entry['etag'],
+        last_modified=entry['last_modified']
+    )
+    if conditional is not None:
+        response = conditional
+    elif response is None:
+        response = build_response(request, entry)
+    return set_validators(response, entry)
+
+
+def invalidate_page_cache(**kwargs):
+    page_cache.bump()
+
+
+post_migrate.connect(
+    invalidate_page_cache,
+    dispatch_uid='invalidate_page_cache'
+)
@@ -0,0 +1,234 @@
+import base64
+import binascii
+import datetime
+import json
+from typing import Any, List, Optional, Tuple
+
+from django.core.paginator import InvalidPage
+from django.core.serializers.json import DjangoJSONEncoder
+from django.db import connections
+from django.db.models import F, Q
+from django.db.models.query import QuerySet as QS
+from django.http import Http404
+from django.utils.translation import ugettext_lazy as _
+
+
+class InvalidCursor(InvalidPage):
+    pass
+
+
+class CursorEncoder(DjangoJSONEncoder):
+    def default(self, o):
+        # DjangoJSONEncoder drops microseconds, which would make cursors on
+        # timestamp columns skip or repeat rows
+        if isinstance(o, datetime.datetime):
+            return o.isoformat()
+        return super().default(o)
+
+
+def get_approximate_total(queryset: QS) -> int:
+    # On PostgreSQL the planner's row estimate is used so that no page ever
+    # has to count the whole result set
+    connection = connections[queryset.db]
+    if connection.vendor != 'postgresql':
+        return queryset.count()
+
+    sql, params = queryset.order_by().query.sql_with_params()
+    with connection.cursor() as cursor:
+        cursor.execute('EXPLAIN (FORMAT JSON) ' + sql, params)
+        plan = cursor.fetchone()[0]
+    if isinstance(plan, str):
+        plan = json.loads(plan)
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+class CursorPage:
+    is_cursor_page = True
+
+    def __init__(self, object_list, paginator, next_cursor=None,
+                 previous_cursor=None):
+        self.object_list = object_list
+        self.paginator = paginator
+        self.next_cursor = next_cursor
+        self.previous_cursor = previous_cursor
+
+    def __len__(self):
+        return len(self.object_list)
+
+    def __iter__(self):
+        return iter(self.object_list)
+
+    def __getitem__(self, index):
+        return self.object_list[index]
+
+    def has_next(self) -> bool:
+        return self.next_cursor is not None
+
+    def has_previous(self) -> bool:
+        return self.previous_cursor is not None
+
+    def has_other_pages(self) -> bool:
+        return self.has_next() or self.has_previous()
+
+    @property
+    def approximate_total(self) -> Optional[int]:
+        return self.paginator.approximate_total
+
+
+class CursorPaginator:
+    """
+    Keyset paginator which walks a queryset in a stable order instead of
+    using OFFSET, so every page costs the same no matter how deep it is.
+
+    The ordering is a list of field names (optionally prefixed with '-') and
+    must end with a unique field. Null values always sort after non null
+    values. Cursors are opaque url safe strings holding the ordering values
+    of the row the next or previous page starts after, so annotations in the
+    ordering must have an exact type such as numeric, see ranked_search.
+    """
+
+    def __init__(self, queryset: QS, per_page: int, ordering: List[str],
+                 with_total: bool = False) -> None:
+        self.queryset = queryset
+        self.per_page = int(per_page)
+        self.ordering = [
+            (i[1:], True) if i.startswith('-') else (i, False)
+            for i in ordering
+        ]
+        self.with_total = with_total
+        self._approximate_total = None
+
+    @property
+    def approximate_total(self) -> Optional[int]:
+        if self.with_total and self._approximate_total is None:
+            self._approximate_total = get_approximate_total(self.queryset)
+        return self._approximate_total
+
+    def encode_cursor(self, position: List[Any], reverse: bool) -> str:
+        data = json.dumps(
+            {'p': position, 'r': int(reverse)},
+            cls=CursorEncoder,
+            separators=(',', ':')
+        )
+        return base64.urlsafe_b64encode(data.encode()).decode().rstrip('=')
+
+    def decode_cursor(self, cursor: str) -> Tuple[List[Any], bool]:
+        try:
+            padding = '=' * (-len(cursor) % 4)
+            data = json.loads(base64.urlsafe_b64decode(cursor + padding))
+            position = data['p']
+            reverse = bool(data['r'])
+        except (binascii.Error, ValueError, TypeError, KeyError):
+            raise InvalidCursor(_('Invalid cursor'))
+        if not isinstance(position, list) or (
+            len(position) != len(self.ordering)
+        ):
+            raise InvalidCursor(_('Invalid cursor'))
+        return position, reverse
+
+    def get_position(self, obj) -> List[Any]:
+        position = []
+        for field, _desc in self.ordering:
+            value = obj
+            for attr in field.split('__'):
+                value = getattr(value, attr) if value is not None else None
+            position.append(value)
+        return position
+
+    def get_order_by(self, reverse: bool) -> list:
+        order_by = []
+        for field, desc in self.ordering:
+            # Walking backwards flips both the direction and the null order
+            if desc != reverse:
+                order_by.append(F(field).desc(nulls_last=not reverse,
+                                              nulls_first=reverse))
+            else:
+                order_by.append(F(field).asc(nulls_last=not reverse,
+                                             nulls_first=reverse))
+        return order_by
+
+    def get_keyset_filter(self, position: List[Any], reverse: bool) -> Q:
+        keyset_filter = Q(pk__in=[])
+        equal_filter = Q()
+        for (field, desc), value in zip(self.ordering, position):
+            lookup = 'lt' if desc != reverse else 'gt'
+            if value is None:
+                # Nulls sort last, so only walking backwards can move past
+                # a null value
+                beyond = Q(**{f'{field}__isnull': False}) if reverse else None
+                equal = Q(**{f'{field}__isnull': True})
+            else:
+                beyond = Q(**{f'{field}__{lookup}': value})
+                if not reverse:
+                    beyond |= Q(**{f'{field}__isnull': True})
+                equal = Q(**{field: value})
+            if beyond is not None:
+                keyset_filter |= equal_filter & beyond
+            equal_filter &= equal
+        return keyset_filter
+
+    def page(self, cursor: Optional[str] = None) -> CursorPage:
+        position, reverse = (
+            self.decode_cursor(cursor) if cursor else (None, False)
+        )
+        queryset = self.queryset.order_by(*self.get_order_by(reverse))
+        if position is not None:
+            queryset = queryset.filter(
+                self.get_keyset_filter(position, reverse)
+            )
+
+        object_list = list(queryset[:self.per_page + 1])
+        has_more = len(object_list) > self.per_page
+        object_list = object_list[:self.per_page]
+        if reverse:
+            object_list.reverse()
+
+        next_cursor = previous_cursor = None
+        if object_list:
+            if has_more or reverse:
+                next_cursor = self.encode_cursor(
+                    self.get_position(object_list[-1]),
+                    False
+                )
+            if has_more if reverse else position is not None:
+                previous_cursor = self.encode_cursor(
+                    self.get_position(object_list[0]),
+                    True
+                )
+        return CursorPage(object_list, self, next_cursor, previous_cursor)
+
+
+class CursorPaginationMixin:
+    """
+    Replaces the page number pagination of a ListView with a cursor
+    paginator. The queryset's own ordering is kept when it has one,
+    otherwise cursor_ordering is used, and the primary key is appended so
+    that the order is always unique.
+    """
+
+    cursor_ordering = ['-pk']
+    cursor_query_param = 'cursor'
+    cursor_with_total = False
+
+    def get_cursor_ordering(self, queryset: QS) -> List[str]:
+        ordering = [
+            i for i in queryset.query.order_by if isinstance(i, str)
+        ] or list(self.cursor_ordering)
+        if ordering[-1].lstrip('-') not in ['pk', 'id']:
+            ordering.append('-pk' if ordering[-1].startswith('-') else 'pk')
+        return ordering
+
+    def paginate_queryset(self, queryset: QS, page_size: int):
+        paginator = CursorPaginator(
+            queryset,
+            page_size,
+            self.get_cursor_ordering(queryset),
+            with_total=self.cursor_with_total
+        )
+        try:
+            page = paginator.page(
+                self.request.GET.get(self.cursor_query_param)
+            )
+        except InvalidCursor as e:
+            raise Http404(str(e))
+        return (paginator, page, page.object_list, page.has_other_pages())
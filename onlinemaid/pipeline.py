@@ -1,11 +1,11 @@
 from urllib.parse import quote_plus
 
 from accounts.models import PotentialEmployer
-from django.contrib.auth.models import Group
 from django.http import HttpResponseRedirect
 from django.urls import reverse
 
 from onlinemaid.constants import EMPLOYERS
+from onlinemaid.registry import groups
 # Start of Pipeline
 
 
@@ -53,8 +53,6 @@ def create_employer(backend, user, response, *args, **kwargs):
     employer = PotentialEmployer.objects.filter(user=user).first()
     if employer is None:
         potential_employer_obj = PotentialEmployer.objects.create(user=user)
-        potential_employer_grp = Group.objects.get(
-            name=EMPLOYERS
-        )
+        potential_employer_grp = groups.get(EMPLOYERS)
         potential_employer_grp.user_set.add(user)
         potential_employer_obj.set_employer_relation()
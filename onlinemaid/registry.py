@@ -0,0 +1,111 @@
+import threading
+import time
+
+from django.apps import apps
+from django.conf import settings
+from django.db.models.signals import post_delete, post_migrate, post_save
+
+from .cache import cache_ns
+
+
+class LookupRegistry:
+    """
+    Process wide cache of a small, rarely changing lookup table, keyed on
+    one of its columns. Rows are loaded on first use and reloaded when a
+    key is missing, after migrations, and when another process changes the
+    table. Changes are announced through a version number in the shared
+    cache, which each process checks at most every
+    LOOKUP_REGISTRY_CHECK_INTERVAL seconds.
+    """
+
+    def __init__(self, model_label, key_field):
+        self.model_label = model_label
+        self.key_field = key_field
+        self.namespace = cache_ns('lookup_registry', model_label.lower())
+        self._rows = None
+        self._version = None
+        self._checked_at = 0
+        self._lock = threading.Lock()
+        for signal in [post_save, post_delete]:
+            signal.connect(
+                self.changed,
+                sender=model_label,
+                weak=False,
+                dispatch_uid=self.namespace.version_key
+            )
+
+    @property
+    def model(self):
+        return apps.get_model(self.model_label)
+
+    def get_version(self):
+        return self.namespace.get_version()
+
+    def load(self):
+        with self._lock:
+            version = self.get_version()
+            self._rows = {
+                getattr(row, self.key_field): row
+                for row in self.model.objects.all()
+            }
+            self._version = version
+            self._checked_at = time.monotonic()
+        return self._rows
+
+    def get_rows(self):
+        if self._rows is None:
+            return self.load()
+        if (
+            time.monotonic() - self._checked_at
+            > settings.LOOKUP_REGISTRY_CHECK_INTERVAL
+        ):
+            self._checked_at = time.monotonic()
+            if self.get_version() != self._version:
+                return self.load()
+        return self._rows
+
+    def get(self, key):
+        rows = self.get_rows()
+        if key not in rows:
+            rows = self.load()
+        try:
+            return rows[key]
+        except KeyError:
+            raise self.model.DoesNotExist(
+                f'{self.model_label} matching {self.key_field}={key!r} does '
+                'not exist'
+            )
+
+    def get_many(self, keys):
+        return [self.get(key) for key in keys]
+
+    def pk(self, key):
+        return self.get(key).pk
+
+    def pks(self, keys):
+        return [self.pk(key) for key in keys]
+
+    def invalidate(self):
+        self.namespace.bump()
+        self._rows = None
+
+    def changed(self, sender, **kwargs):
+        self.invalidate()
+
+
+maid_languages = LookupRegistry('maid.MaidLanguage', 'language')
+maid_responsibilities = LookupRegistry('maid.MaidResponsibility', 'name')
+groups = LookupRegistry('auth.Group', 'name')
+
+REGISTRIES = [maid_languages, maid_responsibilities, groups]
+
+
+def invalidate_registries(**kwargs):
+    for registry in REGISTRIES:
+        registry.invalidate()
+
+
+post_migrate.connect(
+    invalidate_registries,
+    dispatch_uid='invalidate_lookup_registries'
+)
@@ -0,0 +1,57 @@
+from django.contrib.postgres.search import (SearchQuery, SearchRank,
+                                            SearchVector, TrigramSimilarity)
+from django.db import connection
+from django.db.models import DecimalField, F, FloatField, Q, Value
+from django.db.models.functions import Cast, Coalesce
+from django.db.models.query import QuerySet as QS
+
+# Names, addresses and phone numbers are not natural language, so no stemming
+# or stop words are applied to them
+SEARCH_CONFIG = 'simple'
+
+
+def is_postgres() -> bool:
+    return connection.vendor == 'postgresql'
+
+
+def get_search_vector(*fields) -> SearchVector:
+    return SearchVector(*fields, config=SEARCH_CONFIG)
+
+
+def get_search_filter(value: str, vector_field: str,
+                      document_field: str) -> Q:
+    value = value.lower()
+    return (
+        Q(**{vector_field: SearchQuery(value, config=SEARCH_CONFIG)})
+        | Q(**{f'{document_field}__trigram_similar': value})
+        | Q(**{f'{document_field}__contains': value})
+    )
+
+
+def ranked_search(queryset: QS, value: str, vector_field: str,
+                  document_field: str) -> QS:
+    """
+    Matches rows whose stored search vector matches the search terms, or
+    whose document is similar to or contains them, ordered by relevance.
+    The document column is stored in lower case so that the similarity and
+    the case sensitive contains lookups can both use its trigram GIN index.
+    Rows whose vector or document was not built yet rank as no match
+    instead of NULL, which PostgreSQL would sort first.
+
+    The rank is rounded to a fixed precision numeric so that the cursor
+    paginator can compare it exactly with the rank stored in a cursor. The
+    4 byte real PostgreSQL computes does not survive the round trip through
+    JSON as a double.
+    """
+    value = value.lower()
+    query = SearchQuery(value, config=SEARCH_CONFIG)
+    no_match = Value(0.0, output_field=FloatField())
+    return queryset.annotate(
+        search_rank=Cast(
+            Coalesce(SearchRank(F(vector_field), query), no_match)
+            + Coalesce(TrigramSimilarity(document_field, value), no_match),
+            DecimalField(max_digits=12, decimal_places=6)
+        )
+    ).filter(
+        get_search_filter(value, vector_field, document_field)
+    ).order_by('-search_rank')
@@ -57,6 +57,7 @@ INSTALLED_APPS = [
     'django.contrib.messages',
     'django.contrib.staticfiles',
     'django.contrib.sites',
+    'django.contrib.sitemaps',
     'django.contrib.humanize',
     'django.contrib.postgres',
 
@@ -150,6 +151,49 @@ else:
     }
 
 
+# Cache
+# https://docs.djangoproject.com/en/3.1/topics/cache/
+
+# The default cache keeps a few seconds of values in process in front of
+# the shared cache. Set SHARED_CACHE_BACKEND to Redis or Memcached when more
+# than one host serves the site: the file based stand-in is only shared
+# between processes on the same host, so every cache namespace version
+# (cards, pages, sitemaps, profiles, facets, registries) is per host with it.
+SHARED_CACHE_BACKEND = os.environ.get(
+    'SHARED_CACHE_BACKEND',
+    'django.core.cache.backends.filebased.FileBasedCache'
+)
+SHARED_CACHE_LOCATION = os.environ.get(
+    'SHARED_CACHE_LOCATION',
+    os.path.join(BASE_DIR, '.cache')
+)
+SHARED_CACHE_OPTIONS = {}
+if SHARED_CACHE_BACKEND.endswith('FileBasedCache'):
+    # Culling deletes a random share of the files, namespace versions
+    # included, which discards whole namespaces. Django's default of 300
+    # entries is far below the cards and pages kept here.
+    SHARED_CACHE_OPTIONS['MAX_ENTRIES'] = int(
+        os.environ.get('SHARED_CACHE_MAX_ENTRIES', '50000')
+    )
+
+CACHES = {
+    'default': {
+        'BACKEND': 'onlinemaid.cache.TwoLevelCache',
+        'OPTIONS': {
+            'SHARED': 'shared',
+            'LOCAL_TIMEOUT': 5,
+            'LOCAL_MAX_ENTRIES': 1000
+        }
+    },
+    'shared': {
+        'BACKEND': SHARED_CACHE_BACKEND,
+        'LOCATION': SHARED_CACHE_LOCATION,
+        'TIMEOUT': 60 * 5,
+        'OPTIONS': SHARED_CACHE_OPTIONS
+    }
+}
+
+
 # Password validation
 # https://docs.djangoproject.com/en/3.1/ref/settings/#auth-password-validators
 
@@ -324,6 +368,52 @@ if not DEBUG:
 MAID_PAGINATE_BY = 12
 AGENCY_PAGINATE_BY = 12
 DASHBOARD_PAGINATE_BY = 10
+API_PAGINATE_BY = 24
+API_MAX_PAGINATE_BY = 100
+
+# Lookup Registry Settings
+LOOKUP_REGISTRY_CHECK_INTERVAL = 60
+
+# PDF Render Settings
+PDF_RENDER_WORKERS = 2
+PDF_RENDER_POLL_INTERVAL = 1
+PDF_RENDER_JOB_RETENTION = 60 * 60 * 24
+# Running jobs are requeued after this long, as their worker was killed
+PDF_RENDER_JOB_TIMEOUT = 60 * 10
+PDF_RENDER_MAX_ATTEMPTS = 3
+PDF_ASSET_CACHE_SIZE = 256
+# Bump to re-render every cached PDF, e.g. after upgrading WeasyPrint
+PDF_CACHE_VERSION = 1
+
+# Repayment Schedule Settings
+REPAYMENT_SCHEDULE_CACHE_TIMEOUT = 60 * 60 * 24
+REPAYMENT_FORECAST_MONTHS = 12
+
+# Agency Profile Settings
+AGENCY_PROFILE_CACHE_TIMEOUT = 60 * 60
+
+# Page Cache Settings
+PAGE_CACHE_TIMEOUT = 60 * 10
+
+# Sitemap Settings
+SITEMAP_LIMIT = 50000
+SITEMAP_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Authority Settings
+# Sessions are shared by every host, so authorities are only kept in them
+# when group changes are announced through a shared cache
+AUTHORITY_SESSION_CACHE = 'SHARED_CACHE_BACKEND' in os.environ
+
+# Maid Search Settings
+MAID_FACET_CACHE_TIMEOUT = 60 * 5
+MAID_RECOMMENDATION_NEIGHBOURS = 12
+MAID_SIMILAR_MAIDS_SHOWN = 4
+FEATURED_MAID_FEED_SIZE = 12
+FEATURED_MAID_FEED_TIMEOUT = 60 * 60
+MAID_CARD_CACHE_TIMEOUT = 60 * 60 * 24
+MAID_PHOTO_QUALITY = 80
+MAID_IMPORT_BATCH_SIZE = 200
+MAID_IMPORT_MAX_FILE_SIZE = 10 * 1024 * 1024
 
 # Django Recaptcha Settings
 RECAPTCHA_PUBLIC_KEY = os.environ.get('RECAPTCHA_PUBLIC_KEY')
@@ -0,0 +1,49 @@
+from unittest import skipUnless
+
+from django.contrib.auth.models import Group
+from django.test import TestCase
+
+from .pagination import CursorPaginator
+from .search import get_search_vector, is_postgres, ranked_search
+
+
+@skipUnless(is_postgres(), 'Ranked search needs PostgreSQL')
+class RankedSearchCursorPaginationTest(TestCase):
+    def setUp(self):
+        # Every name matches the search terms equally well, so all the
+        # rows have the same rank
+        Group.objects.bulk_create([
+            Group(name=f'maid {i:02}') for i in range(25)
+        ])
+        self.paginator = CursorPaginator(
+            ranked_search(
+                Group.objects.annotate(
+                    search_vector=get_search_vector('name')
+                ),
+                'maid',
+                'search_vector',
+                'name'
+            ),
+            10,
+            ['-search_rank', '-pk']
+        )
+
+    def test_tied_ranks_are_all_paged_once(self):
+        pages = [self.paginator.page()]
+        while pages[-1].has_next():
+            pages.append(self.paginator.page(pages[-1].next_cursor))
+
+        names = [group.name for page in pages for group in page]
+        self.assertEqual(len(set(i.search_rank for page in pages
+                                 for i in page)), 1)
+        self.assertEqual([len(page) for page in pages], [10, 10, 5])
+        self.assertCountEqual(
+            names,
+            Group.objects.values_list('name', flat=True)
+        )
+
+    def test_tied_ranks_page_backwards(self):
+        first_page = self.paginator.page()
+        second_page = self.paginator.page(first_page.next_cursor)
+        previous_page = self.paginator.page(second_page.previous_cursor)
+        self.assertEqual(list(previous_page), list(first_page))
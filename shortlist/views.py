@@ -95,7 +95,7 @@ class ViewShortlist(CreateView):
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
         context = super().get_context_data(**kwargs)
         context.update({
-            'shortlist': Maid.objects.filter(
+            'shortlist': Maid.objects.with_card_data().filter(
                 pk__in=self.current_shortlist
             )
         })
@@ -0,0 +1,15 @@
+from django.contrib.postgres.operations import TrigramExtension
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+    # The agency and maid search trigram GIN indexes need pg_trgm, so it is
+    # created before their app's first migration
+    run_before = [
+        ('agency', '0001_initial'),
+        ('maid', '0001_initial'),
+    ]
+
+    operations = [
+        TrigramExtension(),
+    ]
@@ -0,0 +1,166 @@
+from agency.managers import PUBLISHED_MAID_STATUSES
+from agency.models import Agency
+from django.conf import settings
+from django.contrib.sitemaps import Sitemap
+from django.contrib.sites.shortcuts import get_current_site
+from django.db.models import F
+from django.template.loader import render_to_string
+from django.urls import reverse
+from maid.models import Maid
+from onlinemaid.cache import cache_ns
+
+
+class StaticSitemap(Sitemap):
+    changefreq = 'monthly'
+    priority = 0.8
+
+    def items(self):
+        return [
+            'home',
+            'about_us',
+            'how_it_works',
+            'faq',
+            'agency_list',
+            'contact_us',
+            'useful_links',
+            'terms_and_conditions_agency',
+            'terms_and_conditions_user',
+            'privacy_policy'
+        ]
+
+    def location(self, item):
+        return reverse(item)
+
+
+class AgencySitemap(Sitemap):
+    changefreq = 'weekly'
+    priority = 0.7
+
+    def items(self):
+        return Agency.objects.filter(
+            active=True,
+            name_url__isnull=False
+        ).only('pk', 'name_url').order_by('pk')
+
+    def location(self, item):
+        return reverse('agency_detail', args=[item.name_url])
+
+
+class MaidSitemap(Sitemap):
+    changefreq = 'daily'
+    priority = 0.6
+
+    def items(self):
+        return Maid.objects.filter(
+            status__in=PUBLISHED_MAID_STATUSES
+        ).only('pk', 'updated_on').order_by('pk')
+
+    def location(self, item):
+        return reverse('maid_detail', args=[item.pk])
+
+    def lastmod(self, item):
+        return item.updated_on
+
+
+SITEMAPS = {
+    'static': StaticSitemap,
+    'agencies': AgencySitemap,
+    'maids': MaidSitemap
+}
+
+# Sections backed by a queryset are split into pages by primary key range,
+# so that a change only regenerates the page holding the changed row
+sitemap_index_cache = cache_ns('sitemap_index')
+
+
+def get_page_cache(section, page):
+    return cache_ns('sitemap', f'{section}:{page}')
+
+
+def get_page_number(pk):
+    return pk // settings.SITEMAP_LIMIT
+
+
+def get_section_pages(section):
+    items = SITEMAPS[section]().items()
+    if isinstance(items, list):
+        return [0]
+    return list(
+        items.annotate(
+            sitemap_page=F('pk') / settings.SITEMAP_LIMIT
+        ).order_by('sitemap_page').values_list(
+            'sitemap_page',
+            flat=True
+        ).distinct()
+    )
+
+
+def get_page_items(section, page):
+    sitemap = SITEMAPS[section]()
+    items = sitemap.items()
+    if isinstance(items, list):
+        return items
+    # Read through a server side cursor rather than holding every row
+    return items.filter(
+        pk__gte=page * settings.SITEMAP_LIMIT,
+        pk__lt=(page + 1) * settings.SITEMAP_LIMIT
+    ).iterator(chunk_size=2000)
+
+
+def get_attribute(sitemap, name, item):
+    # Sitemap attributes are either values or methods taking the item
+    attribute = getattr(sitemap, name, None)
+    return attribute(item) if callable(attribute) else attribute
+
+
+def get_urlset(base_url, section, page):
+    sitemap = SITEMAPS[section]()
+    for item in get_page_items(section, page):
+        yield {
+            'location': base_url + sitemap.location(item),
+            'lastmod': get_attribute(sitemap, 'lastmod', item),
+            'changefreq': get_attribute(sitemap, 'changefreq', item),
+            'priority': get_attribute(sitemap, 'priority', item)
+        }
+
+
+def get_base_url(request):
+    return f'{request.scheme}://{get_current_site(request).domain}'
+
+
+def render_sitemap_index(base_url):
+    content = sitemap_index_cache.get(base_url)
+    if content is None:
+        content = render_to_string('sitemap_index.xml', {
+            'sitemaps': [
+                base_url + reverse(
+                    'sitemap_section',
+                    kwargs={'section': section, 'page': page}
+                )
+                for section in SITEMAPS
+                for page in get_section_pages(section)
+            ]
+        })
+        sitemap_index_cache.set(
+            base_url,
+            content,
+            settings.SITEMAP_CACHE_TIMEOUT
+        )
+    return content
+
+
+def render_sitemap_page(base_url, section, page):
+    page_cache = get_page_cache(section, page)
+    content = page_cache.get(base_url)
+    if content is None:
+        content = render_to_string('sitemap.xml', {
+            'urlset': get_urlset(base_url, section, page)
+        })
+        page_cache.set(base_url, content, settings.SITEMAP_CACHE_TIMEOUT)
+    return content
+
+
+def invalidate_sitemap(section, pk, pages_changed=False):
+    get_page_cache(section, get_page_number(pk)).bump()
+    if pages_changed:
+        sitemap_index_cache.bump()
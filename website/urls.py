@@ -5,7 +5,8 @@ from .views import (AboutUsView, AdminPanelEnquiryListView, AdminPanelView,
                     ContactUsView, DataDeletionView, Error403View,
                     Error404View, Error500View, FakeAdminPanel, FAQView,
                     HomeView, HowItWorksView, LoaderIOView, PrivacyPolicyView,
-                    RobotsTxt, SitemapView, TermsAndConditionsAgencyView,
+                    RobotsTxt, SitemapIndexView, SitemapSectionView,
+                    TermsAndConditionsAgencyView,
                     TermsAndConditionsUserView, UsefulLinksView)
 
 urlpatterns = [
@@ -111,9 +112,14 @@ urlpatterns = [
     ),
     path(
         'sitemap.xml',
-        SitemapView.as_view(),
+        SitemapIndexView.as_view(),
         name="site_map"
     ),
+    path(
+        'sitemap-<slug:section>-<int:page>.xml',
+        SitemapSectionView.as_view(),
+        name='sitemap_section'
+    ),
     path(
         'loaderio-03efabeaabfb72e90f648bd86d913ad9/',
         LoaderIOView.as_view(),
@@ -4,18 +4,29 @@ from typing import Any, Dict
 
 from agency.mixins import OMStaffRequiredMixin
 from agency.models import Agency
-from django.views.generic.base import RedirectView, TemplateView
+from django.http import Http404, HttpResponse
+from django.http.request import HttpRequest as req
+from django.http.response import HttpResponse as res
+from django.views.generic.base import RedirectView, TemplateView, View
 from django.views.generic.list import ListView
 from enquiry.models import GeneralEnquiry, ShortlistedEnquiry
 from maid.filters import MiniMaidFilter
+from onlinemaid.mixins import AnonymousPageCacheMixin
 from sentry_sdk import last_event_id
 
+from .sitemaps import (SITEMAPS, get_base_url, render_sitemap_index,
+                       render_sitemap_page)
+
 
 class BaseTemplateView(TemplateView):
     http_method_names = ['get']
 
 
-class HomeView(BaseTemplateView):
+class CachedTemplateView(AnonymousPageCacheMixin, BaseTemplateView):
+    pass
+
+
+class HomeView(CachedTemplateView):
     template_name = 'home.html'
 
     def get_context_data(self, **kwargs: Any) -> Dict[str, Any]:
@@ -26,7 +37,7 @@ class HomeView(BaseTemplateView):
         return kwargs
 
 
-class AboutUsView(BaseTemplateView):
+class AboutUsView(CachedTemplateView):
     template_name = 'about-us.html'
 
 
@@ -34,15 +45,15 @@ class ContactUsView(BaseTemplateView):
     template_name = 'contact-us.html'
 
 
-class TermsAndConditionsAgencyView(BaseTemplateView):
+class TermsAndConditionsAgencyView(CachedTemplateView):
     template_name = 'terms-and-conditions-agency.html'
 
 
-class TermsAndConditionsUserView(BaseTemplateView):
+class TermsAndConditionsUserView(CachedTemplateView):
     template_name = 'terms-and-conditions-user.html'
 
 
-class PrivacyPolicyView(BaseTemplateView):
+class PrivacyPolicyView(CachedTemplateView):
     template_name = 'privacy-policy.html'
 
 
@@ -50,11 +61,11 @@ class DataDeletionView(BaseTemplateView):
     template_name = 'data-deletion.html'
 
 
-class HowItWorksView(BaseTemplateView):
+class HowItWorksView(CachedTemplateView):
     template_name = 'how-it-works.html'
 
 
-class FAQView(BaseTemplateView):
+class FAQView(CachedTemplateView):
     template_name = 'faq.html'
 
 
@@ -81,13 +92,33 @@ class Error500View(BaseTemplateView):
         return kwargs
 
 
-class RobotsTxt(BaseTemplateView):
+class RobotsTxt(CachedTemplateView):
     template_name = 'robots.txt'
     content_type = 'text/plain'
 
 
-class SitemapView(BaseTemplateView):
-    template_name = 'sitemap.xml'
+class SitemapIndexView(View):
+    http_method_names = ['get']
+
+    def get(self, request: req, *args: Any, **kwargs: Any) -> res:
+        return HttpResponse(
+            render_sitemap_index(get_base_url(request)),
+            content_type='application/xml'
+        )
+
+
+class SitemapSectionView(View):
+    http_method_names = ['get']
+
+    def get(self, request: req, *args: Any, **kwargs: Any) -> res:
+        section = kwargs.get('section')
+        page = kwargs.get('page')
+        if section not in SITEMAPS:
+            raise Http404
+        return HttpResponse(
+            render_sitemap_page(get_base_url(request), section, page),
+            content_type='application/xml'
+        )
 
 
 class LoaderIOView(BaseTemplateView):
@@ -97,7 +128,7 @@ class LoaderIOView(BaseTemplateView):
 class AdminPanelView(OMStaffRequiredMixin, ListView):
     http_method_names = ['get']
     template_name = 'admin-panel.html'
-    model = Agency
+    queryset = Agency.objects.with_stats()
     paginate_by = 50
     context_object_name = 'agencies'
     ordering = ['name']